@@ -5,9 +5,9 @@ import numpy as np
 import torch
 import torch.nn as nn
 from ray.rllib import SampleBatch
-from ray.rllib.evaluation.postprocessing import compute_advantages
 from ray.rllib.evaluation.postprocessing import Postprocessing
 from ray.rllib.utils import override
+from torch.nn.utils import parameters_to_vector
 
 import raylab.utils.dictionaries as dutil
 from raylab.agents.trpo.policy import LINESEARCH_DEFAULTS
@@ -16,10 +16,13 @@ from raylab.options import option
 from raylab.policy import learner_stats
 from raylab.policy import TorchPolicy
 from raylab.policy.action_dist import WrapStochasticPolicy
+from raylab.policy.postprocessing import compute_advantages
 from raylab.torch.nn.distributions import Normal
 from raylab.torch.optim import build_optimizer
-from raylab.torch.optim.hessian_free import line_search
+from raylab.torch.optim.hessian_free import batched_line_search
 from raylab.torch.optim.kfac import KFACMixin
+from raylab.torch.utils import batched_module_call
+from raylab.torch.utils import vmap_available
 from raylab.utils.explained_variance import explained_variance
 
 
@@ -35,6 +38,8 @@ DEFAULT_OPTIM_CONFIG = {
         "kl_clip": 1e-2,
         "eta": 1.0,
         "lr": 1.0,
+        # Whether to compute inverses in a background thread
+        "amortize": False,
     },
     "critic": {
         # Can choose different optimizer
@@ -47,6 +52,8 @@ DEFAULT_OPTIM_CONFIG = {
         "kl_clip": 1e-2,
         "eta": 1.0,
         "lr": 1.0,
+        # Whether to compute inverses in a background thread
+        "amortize": False,
     },
 }
 
@@ -112,35 +119,17 @@ class ACKTRTorchPolicy(TorchPolicy):
     def compile(self):
         warnings.warn(f"{type(self).__name__} is incompatible with TorchScript")
 
-    @torch.no_grad()
+    @learner_stats
     @override(TorchPolicy)
-    def postprocess_trajectory(
-        self, sample_batch, other_agent_batches=None, episode=None
-    ):
-        sample_batch = super().postprocess_trajectory(
-            sample_batch, other_agent_batches=other_agent_batches, episode=episode
-        )
-
-        last_obs = self.convert_to_tensor(sample_batch[SampleBatch.NEXT_OBS][-1])
-        last_r = self.module.critic(last_obs).squeeze(-1).numpy()
-
-        cur_obs = self.convert_to_tensor(sample_batch[SampleBatch.CUR_OBS])
-        sample_batch[SampleBatch.VF_PREDS] = (
-            self.module.critic(cur_obs).squeeze(-1).numpy()
-        )
-        sample_batch = compute_advantages(
-            sample_batch,
-            last_r,
+    def learn_on_batch(self, samples):
+        batch_tensors = self.lazy_tensor_dict(samples)
+        compute_advantages(
+            batch_tensors,
+            self.module.critic,
             gamma=self.config["gamma"],
             lambda_=self.config["lambda"],
             use_gae=self.config["use_gae"],
         )
-        return sample_batch
-
-    @learner_stats
-    @override(TorchPolicy)
-    def learn_on_batch(self, samples):
-        batch_tensors = self.lazy_tensor_dict(samples)
         info = {}
 
         info.update(self._update_actor(batch_tensors))
@@ -196,23 +185,27 @@ class ACKTRTorchPolicy(TorchPolicy):
             Postprocessing.ADVANTAGES,
         )
 
+        params = list(self.module.actor.parameters())
+        flat_params = parameters_to_vector(params)
+        flat_step = parameters_to_vector([p.grad for p in params])
+
         @torch.no_grad()
-        def f_barrier(scale):
-            for par in self.module.actor.parameters():
-                par.data.add_(par.grad.data, alpha=scale)
-            new_logp = self.module.actor.log_prob(cur_obs, actions)
-            for par in self.module.actor.parameters():
-                par.data.sub_(par.grad.data, alpha=scale)
+        def f_barrier(scales):
+            candidates = flat_params + scales.unsqueeze(-1) * flat_step
+            new_logp = batched_module_call(
+                self.module.actor, candidates, "log_prob", cur_obs, actions
+            )
             surr_loss = self._compute_surr_loss(old_logp, new_logp, advantages)
-            avg_kl = torch.mean(old_logp - new_logp)
-            return surr_loss.item() if avg_kl < kl_clip else np.inf
+            avg_kl = torch.mean(old_logp - new_logp, dim=-1)
+            return surr_loss.where(avg_kl < kl_clip, torch.full_like(surr_loss, np.inf))
 
-        scale, expected_improvement, improvement = line_search(
+        scale, expected_improvement, improvement = batched_line_search(
             f_barrier,
-            1,
-            1,
+            flat_params.new_ones([]),
+            flat_params.new_ones([]),
             expected_improvement,
             y_0=surr_loss.item(),
+            chunk_size=None if vmap_available() else 1,
             **self.config["line_search_options"],
         )
         improvement_ratio = (
@@ -223,13 +216,13 @@ class ACKTRTorchPolicy(TorchPolicy):
             "actual_improvement": improvement,
             "improvement_ratio": improvement_ratio,
         }
-        for par in self.module.actor.parameters():
-            par.data.add_(par.grad.data, alpha=scale)
+        for par in params:
+            par.data.add_(par.grad.data, alpha=float(scale))
         return info
 
     @staticmethod
     def _compute_surr_loss(old_logp, new_logp, advantages):
-        return -torch.mean(torch.exp(new_logp - old_logp) * advantages)
+        return -torch.mean(torch.exp(new_logp - old_logp) * advantages, dim=-1)
 
     def _update_critic(self, batch_tensors):
         cur_obs, value_targets = dutil.get_keys(
@@ -113,8 +113,7 @@ class MBPOTorchPolicy(MBPolicyMixin, EnvFnMixin, ModelSamplingMixin, SACTorchPol
         self.timers["augmentation"] = TimerStat()
 
     @learner_stats
-    def learn_on_batch(self, samples: SampleBatch) -> dict:
-        self.add_to_buffer(samples)
+    def learn_on_replay(self) -> dict:
         self._learn_calls += 1
 
         info = {}
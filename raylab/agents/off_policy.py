@@ -1,6 +1,7 @@
 # pylint:disable=missing-module-docstring
 from typing import Callable
 from typing import Iterable
+from typing import Optional
 
 from ray.rllib.evaluation.worker_set import WorkerSet
 from ray.rllib.execution.metric_ops import StandardMetricsReporting
@@ -10,11 +11,21 @@ from ray.rllib.utils.types import ResultDict
 from ray.rllib.utils.types import TrainerConfigDict
 
 from raylab.execution import LearningStarts
+from raylab.execution import StoreToLearnerThread
+from raylab.execution import StoreToPolicyReplay
+from raylab.execution import TrainAtReplayRatio
+from raylab.execution import UpdateWorkerWeights
 from raylab.options import option
 
 
 def off_policy_execution_plan(workers: WorkerSet, config: TrainerConfigDict):
-    """RLlib's default execution plan with an added warmup phase."""
+    """RLlib's default execution plan with an added warmup phase.
+
+    Uses :func:`async_off_policy_execution_plan` if there are remote workers.
+    """
+    if workers.remote_workers():
+        return async_off_policy_execution_plan(workers, config)
+
     # Collects experiences in parallel from multiple RolloutWorker actors.
     rollouts = ParallelRollouts(workers, mode="bulk_sync")
     # On the first iteration, combine experience batches until we hit `learning_starts`
@@ -30,23 +41,118 @@ def off_policy_execution_plan(workers: WorkerSet, config: TrainerConfigDict):
     return StandardMetricsReporting(train_op, workers, config)
 
 
+def async_off_policy_execution_plan(workers: WorkerSet, config: TrainerConfigDict):
+    """Execution plan with asynchronous sampling from remote workers.
+
+    Remote workers stream sample fragments into the local policy's replay buffer
+    while the local policy learns from its replay buffer at a target replay
+    ratio. Each worker gets the learner's weights once it samples at least
+    `weight_sync_interval` timesteps since its last update.
+    """
+    # Collects experiences asynchronously from remote RolloutWorker actors.
+    rollouts = ParallelRollouts(workers, mode="async")
+    # Then, store the experiences in the local policy's replay buffer.
+    store_op = rollouts.zip_with_source_actor().for_each(StoreToPolicyReplay(workers))
+
+    replay_ratio = config["replay_ratio"] or _default_replay_ratio(workers, config)
+    # Train the local policy, throttling sampling or learning as needed.
+    train_op = store_op.for_each(
+        TrainAtReplayRatio(
+            workers,
+            replay_ratio=replay_ratio,
+            learning_starts=config["learning_starts"],
+        )
+    )
+    # Finally, broadcast the learner's weights to the source worker if needed.
+    train_op = train_op.for_each(
+        UpdateWorkerWeights(workers, sync_interval=config["weight_sync_interval"])
+    )
+
+    return StandardMetricsReporting(train_op, workers, config)
+
+
+def _default_replay_ratio(workers: WorkerSet, config: TrainerConfigDict) -> float:
+    # Same ratio as in the synchronous execution plan
+    policy_config = workers.local_worker().get_policy().config
+    return policy_config["improvement_steps"] / config["rollout_fragment_length"]
+
+
+def threaded_off_policy_execution_plan(
+    workers: WorkerSet, config: TrainerConfigDict, learner_feed: StoreToLearnerThread
+):
+    """Execution plan with local sampling and learning in separate threads.
+
+    The local worker samples in the main thread, while a copy of its policy
+    learns from a shared replay buffer in a background thread at a target
+    replay ratio. Sampling may run at most one fragment ahead of the learner.
+    """
+    # Collects experiences from the local RolloutWorker in the main thread.
+    rollouts = ParallelRollouts(workers, mode="bulk_sync")
+    # Feed them to the learner thread, which trains in the background.
+    train_op = rollouts.for_each(learner_feed)
+
+    return StandardMetricsReporting(train_op, workers, config)
+
+
 class OffPolicyMixin:
     """Mixin for off-policy agents."""
 
+    _learner_feed: Optional[StoreToLearnerThread] = None
+
     # pylint:disable=missing-function-docstring
     def validate_config(self, config: dict):
         super().validate_config(config)
-        assert config["num_workers"] == 0, "No point in using additional workers."
         assert (
             config["rollout_fragment_length"] >= 1
         ), "At least one sample must be collected."
+        assert (
+            config["replay_ratio"] is None or config["replay_ratio"] > 0
+        ), "Replay ratio must be positive."
+        assert (
+            config["weight_sync_interval"] >= 1
+        ), "Weight sync interval must be at least one timestep."
 
     @property
     def execution_plan(
         self,
     ) -> Callable[[WorkerSet, TrainerConfigDict], Iterable[ResultDict]]:
+        if self.config["threaded_learner"] and self.config["num_workers"] == 0:
+            return self._threaded_execution_plan
         return off_policy_execution_plan
 
+    def _threaded_execution_plan(
+        self, workers: WorkerSet, config: TrainerConfigDict
+    ) -> Iterable[ResultDict]:
+        replay_ratio = config["replay_ratio"] or _default_replay_ratio(workers, config)
+        policy_config = workers.local_worker().get_policy().config
+        improvement_steps = policy_config["improvement_steps"]
+        # Let sampling run at most one fragment ahead of the learner
+        max_lag = config["rollout_fragment_length"] * replay_ratio / improvement_steps
+        self._learner_feed = StoreToLearnerThread(
+            workers,
+            replay_ratio=replay_ratio,
+            learning_starts=config["learning_starts"],
+            sync_interval=config["weight_sync_interval"],
+            max_lag=max(1, max_lag),
+        )
+        return threaded_off_policy_execution_plan(workers, config, self._learner_feed)
+
+    def __getstate__(self) -> dict:
+        if self._learner_feed is not None:
+            # Save the learner's latest weights
+            self._learner_feed.sync_weights()
+        return super().__getstate__()
+
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)
+        if self._learner_feed is not None:
+            self._learner_feed.restore_learner()
+
+    def cleanup(self):
+        if self._learner_feed is not None:
+            self._learner_feed.stop()
+        super().cleanup()
+
     @staticmethod
     def add_options(trainer_cls: type) -> type:
         cls = trainer_cls
@@ -56,6 +162,45 @@ class OffPolicyMixin:
                 default=0,
                 help="Hold this number of timesteps before first training operation.",
             ),
+            option(
+                "replay_ratio",
+                default=None,
+                help="""Target number of gradient steps per sampled timestep.
+
+                Only used with remote workers ('num_workers' > 0), which sample
+                asynchronously into the local policy's replay buffer, or with
+                'threaded_learner'. The learner policy trains whenever the ratio
+                allows for another call to its `learn_on_replay` method (which
+                performs 'policy/improvement_steps' gradient steps). Sampling is
+                throttled while the learner catches up.
+
+                If None, uses the same ratio as with local sampling, i.e.,
+                'policy/improvement_steps' / 'rollout_fragment_length'.
+                """,
+            ),
+            option(
+                "weight_sync_interval",
+                default=100,
+                help="""Minimum timesteps sampled by a worker between weight updates.
+
+                Only used with remote workers ('num_workers' > 0) or with
+                'threaded_learner'. A worker receives the learner's weights once
+                it has sampled at least this many timesteps since its last update.
+                """,
+            ),
+            option(
+                "threaded_learner",
+                default=False,
+                help="""Whether to learn in a background thread while sampling locally.
+
+                Only used without remote workers ('num_workers' == 0). A copy of
+                the local policy learns from a shared replay buffer in a separate
+                thread, at the rate given by 'replay_ratio'. Sampling may run at
+                most one fragment ahead of the learner. Since both threads spend
+                most of their time in NumPy and PyTorch ops, which release the
+                GIL, sampling and learning can use different cores.
+                """,
+            ),
             option("rollout_fragment_length", default=1, override=True),
             option("num_workers", default=0, override=True),
             option("evaluation_config/explore", False, override=True),
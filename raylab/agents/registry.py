@@ -1,5 +1,8 @@
 """Registry of agents as trainables for Tune."""
+from ray.tune.registry import _global_registry
 from ray.tune.registry import get_trainable_cls
+from ray.tune.registry import register_trainable
+from ray.tune.registry import TRAINABLE_CLASS
 
 
 def _import_naf():
@@ -86,7 +89,11 @@ AGENTS = {
 def get_agent_cls(agent_name):
     """Retrieve agent class from global registry.
 
-    The user must have called `raylab.register_all_agents()` beforehand to
-    have access to Raylab's agents.
+    Raylab's agents are imported and registered in Tune on first lookup, so
+    there is no need to call `raylab.register_all_agents()` beforehand.
     """
+    if agent_name in AGENTS and not _global_registry.contains(
+        TRAINABLE_CLASS, agent_name
+    ):
+        register_trainable(agent_name, AGENTS[agent_name]())
     return get_trainable_cls(agent_name)
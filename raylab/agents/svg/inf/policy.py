@@ -13,6 +13,7 @@ from raylab.policy import learner_stats
 from raylab.policy.losses import TrajectorySVG
 from raylab.policy.off_policy import off_policy_options
 from raylab.policy.off_policy import OffPolicyMixin
+from raylab.policy.postprocessing import time_major_episodes
 from raylab.torch.optim import build_optimizer
 from raylab.utils.replay_buffer import ReplayField
 from raylab.utils.types import TensorDict
@@ -117,7 +118,8 @@ class SVGInfTorchPolicy(OffPolicyMixin, AdaptiveKLCoeffMixin, SVGTorchPolicy):
     def _learn_on_policy(self, samples: SampleBatch) -> dict:
         """Update on-policy components."""
         batch = self.lazy_tensor_dict(samples)
-        episodes = [self.lazy_tensor_dict(s) for s in samples.split_by_episode()]
+        episodes, mask = time_major_episodes(batch, self.loss_actor.batch_keys[:-1])
+        episodes[self.loss_actor.MASK] = mask
 
         with self.optimizers.optimize("on_policy"):
             loss, info = self.loss_actor(episodes)
@@ -1,6 +1,7 @@
 """SVG(1) policy class using PyTorch."""
 import contextlib
 import warnings
+from typing import Optional
 
 import torch
 import torch.nn as nn
@@ -50,6 +51,7 @@ class SVGOneTorchPolicy(OffPolicyMixin, AdaptiveKLCoeffMixin, SVGTorchPolicy):
     """Stochastic Value Gradients policy for off-policy learning."""
 
     # pylint:disable=too-many-ancestors
+    _last_samples: Optional[SampleBatch] = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -96,12 +98,19 @@ class SVGOneTorchPolicy(OffPolicyMixin, AdaptiveKLCoeffMixin, SVGTorchPolicy):
         optimizers["all"] = cls(param_groups)
         return optimizers
 
+    @override(OffPolicyMixin)
+    def add_to_buffer(self, samples: SampleBatch):
+        super().add_to_buffer(samples)
+        # Most recent on-policy data, to adapt the KL coefficient after learning
+        self._last_samples = samples
+
     @learner_stats
     @override(OffPolicyMixin)
-    def learn_on_batch(self, samples: SampleBatch) -> dict:
+    def learn_on_replay(self) -> dict:
         self.update_old_policy()
-        info = super().learn_on_batch(samples)
-        info.update(self.update_kl_coeff(samples))
+        info = super().learn_on_replay()
+        if self._last_samples is not None:
+            info.update(self.update_kl_coeff(self._last_samples))
         return info
 
     def update_old_policy(self):
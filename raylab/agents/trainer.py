@@ -22,6 +22,7 @@ from ray.rllib.utils.types import TrainerConfigDict
 from ray.tune.resources import Resources
 from ray.tune.trainable import Trainable
 
+from raylab.envs import has_env_creator
 from raylab.options import configure
 from raylab.options import option
 from raylab.options import TrainerOptions
@@ -87,6 +88,9 @@ class Trainer(RLlibTrainer, metaclass=ABCMeta):
     def setup(self, config: PartialTrainerConfigDict):
         if self._env_id:
             config["env"] = self._env_id
+        if isinstance(config.get("env"), str):
+            # Registers Raylab and Gym environments in Tune on first lookup
+            has_env_creator(config["env"])
         self._true_config = self.options.merge_defaults_with(config)
         super().setup(self.options.rllib_subconfig(self._true_config))
 
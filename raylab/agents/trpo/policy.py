@@ -3,7 +3,6 @@ import numpy as np
 import torch
 import torch.nn as nn
 from ray.rllib import SampleBatch
-from ray.rllib.evaluation.postprocessing import compute_advantages
 from ray.rllib.evaluation.postprocessing import Postprocessing
 from ray.rllib.utils import override
 from torch.nn.utils import parameters_to_vector
@@ -14,11 +13,15 @@ from raylab.options import option
 from raylab.policy import learner_stats
 from raylab.policy import TorchPolicy
 from raylab.policy.action_dist import WrapStochasticPolicy
+from raylab.policy.postprocessing import compute_advantages
 from raylab.torch.optim import build_optimizer
+from raylab.torch.optim.hessian_free import batched_line_search
 from raylab.torch.optim.hessian_free import conjugate_gradient
+from raylab.torch.optim.hessian_free import fisher_vector_product
 from raylab.torch.optim.hessian_free import hessian_vector_product
-from raylab.torch.optim.hessian_free import line_search
+from raylab.torch.utils import batched_module_call
 from raylab.torch.utils import flat_grad
+from raylab.torch.utils import vmap_available
 from raylab.utils.dictionaries import get_keys
 from raylab.utils.explained_variance import explained_variance
 
@@ -38,6 +41,18 @@ LINESEARCH_DEFAULTS = {
     10,
     help="Number of actions to sample per state for Fisher vector-product calculation",
 )
+@option(
+    "analytic_fvp",
+    True,
+    help="Whether to compute Fisher vector-products with the closed-form Fisher"
+    " metric of the action distribution, when available, instead of sampling"
+    " actions",
+)
+@option(
+    "fvp_subsample_ratio",
+    1.0,
+    help="Fraction of the batch to compute Fisher vector-products with",
+)
 @option("lambda", 0.97, help=r"For GAE(\gamma, \lambda)")
 @option("val_iters", 80, help="Number of iterations to fit value function")
 @option("use_gae", True, help="Whether to use Generalized Advantage Estimation")
@@ -73,35 +88,17 @@ class TRPOTorchPolicy(TorchPolicy):
         )
         return optimizers
 
-    @torch.no_grad()
+    @learner_stats
     @override(TorchPolicy)
-    def postprocess_trajectory(
-        self, sample_batch, other_agent_batches=None, episode=None
-    ):
-        sample_batch = super().postprocess_trajectory(
-            sample_batch, other_agent_batches=other_agent_batches, episode=episode
-        )
-
-        last_obs = self.convert_to_tensor(sample_batch[SampleBatch.NEXT_OBS][-1])
-        last_r = self.module.critic(last_obs).squeeze(-1).numpy()
-
-        cur_obs = self.convert_to_tensor(sample_batch[SampleBatch.CUR_OBS])
-        sample_batch[SampleBatch.VF_PREDS] = (
-            self.module.critic(cur_obs).squeeze(-1).numpy()
-        )
-        sample_batch = compute_advantages(
-            sample_batch,
-            last_r,
+    def learn_on_batch(self, samples):
+        batch_tensors = self.lazy_tensor_dict(samples)
+        compute_advantages(
+            batch_tensors,
+            self.module.critic,
             gamma=self.config["gamma"],
             lambda_=self.config["lambda"],
             use_gae=self.config["use_gae"],
         )
-        return sample_batch
-
-    @learner_stats
-    @override(TorchPolicy)
-    def learn_on_batch(self, samples):
-        batch_tensors = self.lazy_tensor_dict(samples)
         info = {}
 
         info.update(self._update_actor(batch_tensors))
@@ -151,8 +148,9 @@ class TRPOTorchPolicy(TorchPolicy):
     def _compute_descent_step(self, pol_grad, obs):
         """Approximately compute the Natural gradient using samples.
 
-        This is based on the Fisher Matrix formulation as the hessian of the average
-        entropy. For more information, see:
+        Solves for the Natural gradient with Conjugate Gradient, using
+        Fisher-vector products evaluated on an optional random subset of the
+        observations. For more information on the Fisher matrix, see:
         https://en.wikipedia.org/wiki/Fisher_information#Matrix_form
 
         Args:
@@ -160,16 +158,12 @@ class TRPOTorchPolicy(TorchPolicy):
             obs (Tensor): The observations to evaluate the policy in.
         """
         config = self.config
-        params = list(self.module.actor.parameters())
-        with torch.no_grad():
-            ent_acts, _ = self.module.actor.sample(obs, (config["fvp_samples"],))
-
-        def entropy():
-            return self.module.actor.log_prob(obs, ent_acts).neg().mean()
-
-        def fvp(vec):
-            return hessian_vector_product(entropy(), params, vec)
+        ratio = config["fvp_subsample_ratio"]
+        if ratio < 1:
+            size = max(1, int(ratio * len(obs)))
+            obs = obs[torch.randperm(len(obs), device=obs.device)[:size]]
 
+        fvp = self._fisher_vector_product(obs)
         descent_direction, elapsed_iters, residual = conjugate_gradient(
             lambda x: fvp(x) + config["cg_damping"] * x,
             pol_grad,
@@ -183,6 +177,38 @@ class TRPOTorchPolicy(TorchPolicy):
         descent_direction = descent_direction * scale
         return descent_direction, {"cg_iters": elapsed_iters, "cg_residual": residual}
 
+    def _fisher_vector_product(self, obs):
+        """Build the Fisher-vector product function for the actor.
+
+        Uses the closed-form Fisher metric of the action distribution, if
+        available, so that each product only requires backward passes through
+        the distribution parameters computed once. Otherwise, computes the
+        Hessian of the average entropy of sampled actions.
+        """
+        actor = self.module.actor
+        params = list(actor.parameters())
+
+        if self.config["analytic_fvp"]:
+            dist_params = actor(obs)
+            with torch.no_grad():
+                metrics = actor.dist.fisher_metric(dist_params)
+            if metrics:
+                keys = sorted(metrics.keys())
+                return fisher_vector_product(
+                    [dist_params[k] for k in keys],
+                    [metrics[k] / len(obs) for k in keys],
+                    params,
+                )
+
+        with torch.no_grad():
+            ent_acts, _ = actor.sample(obs, (self.config["fvp_samples"],))
+
+        def fvp(vec):
+            entropy = actor.log_prob(obs, ent_acts).neg().mean()
+            return hessian_vector_product(entropy, params, vec)
+
+        return fvp
+
     def _perform_line_search(self, pol_grad, descent_step, surr_loss, batch_tensors):
         expected_improvement = pol_grad.dot(descent_step).item()
 
@@ -196,18 +222,24 @@ class TRPOTorchPolicy(TorchPolicy):
 
         @torch.no_grad()
         def f_barrier(params):
-            vector_to_parameters(params, self.module.actor.parameters())
-            new_logp = self.module.actor.log_prob(cur_obs, actions)
+            new_logp = batched_module_call(
+                self.module.actor, params, "log_prob", cur_obs, actions
+            )
             surr_loss = self._compute_surr_loss(old_logp, new_logp, advantages)
-            avg_kl = torch.mean(old_logp - new_logp)
-            return surr_loss.item() if avg_kl < self.config["delta"] else np.inf
+            avg_kl = torch.mean(old_logp - new_logp, dim=-1)
+            return surr_loss.where(
+                avg_kl < self.config["delta"], torch.full_like(surr_loss, np.inf)
+            )
 
-        new_params, expected_improvement, improvement = line_search(
+        new_params, expected_improvement, improvement = batched_line_search(
             f_barrier,
             parameters_to_vector(self.module.actor.parameters()),
             descent_step,
             expected_improvement,
             y_0=surr_loss.item(),
+            # Without torch.func, candidates are evaluated one at a time, so
+            # stop at the first accepted one
+            chunk_size=None if vmap_available() else 1,
             **self.config["line_search_options"],
         )
         improvement_ratio = (
@@ -222,7 +254,7 @@ class TRPOTorchPolicy(TorchPolicy):
 
     @staticmethod
     def _compute_surr_loss(old_logp, new_logp, advantages):
-        return -torch.mean(torch.exp(new_logp - old_logp) * advantages)
+        return -torch.mean(torch.exp(new_logp - old_logp) * advantages, dim=-1)
 
     def _update_critic(self, batch_tensors):
         info = {}
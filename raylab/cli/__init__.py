@@ -1,10 +1,13 @@
 """CLI utilities for RayLab."""
 import click
 
+from .bench_envs import bench_envs
 from .best_checkpoint import find_best
 from .evaluate_checkpoint import rollout
 from .experiment import experiment
 from .info import info_cli
+from .serving import export
+from .serving import serve
 
 
 @click.group()
@@ -57,3 +60,6 @@ raylab.add_command(experiment)
 raylab.add_command(find_best)
 raylab.add_command(rollout)
 raylab.add_command(info_cli)
+raylab.add_command(export)
+raylab.add_command(serve)
+raylab.add_command(bench_envs)
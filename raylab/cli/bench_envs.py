@@ -0,0 +1,93 @@
+"""CLI for profiling registered environments."""
+import json
+
+import click
+
+
+@click.command("bench-envs")
+@click.argument("env_ids", nargs=-1, required=True)
+@click.option(
+    "--env-config",
+    type=str,
+    default="{}",
+    show_default=True,
+    help="JSON string with the base environment configuration.",
+)
+@click.option(
+    "--steps",
+    type=int,
+    default=1000,
+    show_default=True,
+    help="Number of environment steps per wrapper stage.",
+)
+@click.option(
+    "--horizon",
+    type=int,
+    default=200,
+    show_default=True,
+    help="Episode time limit used when profiling the TimeLimit wrapper.",
+)
+@click.option(
+    "--batch-size",
+    "batch_sizes",
+    type=int,
+    multiple=True,
+    default=(256,),
+    show_default=True,
+    help="Batch size for reward and termination functions. May be repeated.",
+)
+@click.option(
+    "--repeats",
+    type=int,
+    default=100,
+    show_default=True,
+    help="Number of timed calls of reward and termination functions.",
+)
+@click.option(
+    "--script/--no-script",
+    default=False,
+    show_default=True,
+    help="Whether to compile reward and termination functions with TorchScript.",
+)
+@click.option("--seed", type=int, default=None, help="Random seed.")
+@click.option(
+    "--out",
+    type=click.Path(file_okay=True, dir_okay=False, resolve_path=True),
+    default=None,
+    help="JSON file to write the report to. Echoes it if not provided.",
+)
+def bench_envs(env_ids, env_config, steps, horizon, batch_sizes, repeats, **kwargs):
+    """Measure step and reset rates, wrapper overheads, and reward/termination
+    function throughputs of registered environments."""
+    # pylint:disable=too-many-arguments
+    from raylab.envs.benchmark import profile_env
+    from raylab.envs.benchmark import system_info
+    from raylab.envs.registry import ENVS
+
+    unknown = [i for i in env_ids if i not in ENVS]
+    if unknown:
+        raise click.BadParameter(f"Unknown environment ids: {unknown}")
+
+    out = kwargs.pop("out")
+    env_config = json.loads(env_config)
+    results = []
+    for env_id in env_ids:
+        click.echo(f"Profiling {env_id}...", err=True)
+        results.append(
+            profile_env(
+                env_id,
+                env_config,
+                num_steps=steps,
+                horizon=horizon,
+                batch_sizes=batch_sizes,
+                repeats=repeats,
+                **kwargs,
+            )
+        )
+
+    report = {"system": system_info(), "env_config": env_config, "envs": results}
+    if out:
+        with open(out, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        click.echo(json.dumps(report, indent=2))
@@ -0,0 +1,96 @@
+"""CLI for exporting and serving trained policies."""
+import click
+
+from .utils import initialize_raylab
+
+
+@click.command("export")
+@click.argument(
+    "checkpoint",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, resolve_path=True),
+)
+@click.argument(
+    "export_dir",
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--agent", required=True, default=None, help="Name of the trainable class to run."
+)
+@click.option(
+    "--env",
+    default=None,
+    help="Name of the environment the agent was trained on. "
+    "Optional; can be inferred from config.",
+    show_default=True,
+)
+@initialize_raylab
+def export(checkpoint, export_dir, agent, env):
+    """Export a trained policy as a standalone TorchScript file."""
+    import ray
+    from raylab.utils.checkpoints import get_agent_from_checkpoint
+
+    ray.init()
+    agent = get_agent_from_checkpoint(
+        checkpoint, agent, env, config_overrides={"num_workers": 0}
+    )
+    agent.get_policy().export_model(export_dir)
+    click.echo(f"Exported policy to {export_dir}")
+
+
+@click.command("serve")
+@click.argument(
+    "path",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, resolve_path=True),
+)
+@click.option("--host", default="localhost", show_default=True)
+@click.option("--port", type=int, default=6000, show_default=True)
+@click.option(
+    "--max-batch-size",
+    type=int,
+    default=64,
+    show_default=True,
+    help="Maximum number of requests processed at once.",
+)
+@click.option(
+    "--max-wait-ms",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Maximum time to wait for new requests after the first one in a batch.",
+)
+@click.option("--device", default="cpu", show_default=True)
+@click.option(
+    "--authkey",
+    envvar="RAYLAB_SERVE_AUTHKEY",
+    default=None,
+    help="Authentication key clients must provide. Required unless HOST is a"
+    " loopback address. Can also be set with the RAYLAB_SERVE_AUTHKEY"
+    " environment variable.",
+)
+def serve(path, host, port, max_batch_size, max_wait_ms, device, authkey):
+    # pylint:disable=too-many-arguments
+    """Serve an exported policy, dynamically batching concurrent requests.
+
+    Clients connect with
+    `multiprocessing.connection.Client((host, port), authkey=authkey)` and
+    send `(obs, timestep)` tuples, receiving the corresponding actions.
+
+    Connections unpickle whatever clients send, so any process able to reach
+    the port could run code in the server without an authentication key.
+    """
+    from raylab.utils.serving import BatchedInferenceServer
+    from raylab.utils.serving import is_loopback
+    from raylab.utils.serving import serve as serve_forever
+
+    if authkey is None and not is_loopback(host):
+        raise click.BadParameter(
+            "required when serving on a non-loopback host", param_hint="--authkey"
+        )
+    authkey = authkey.encode() if authkey is not None else None
+
+    server = BatchedInferenceServer(
+        path, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, device=device
+    )
+    click.echo(f"Serving {path} on {host}:{port}")
+    with server:
+        serve_forever(server, (host, port), authkey=authkey)
@@ -8,13 +8,19 @@ import click
 
 
 def initialize_raylab(func):
-    """Wrap cli to register raylab's algorithms and environments."""
+    """Wrap cli to register raylab's custom environments.
+
+    Gym environments and raylab's algorithms are registered in Tune on first
+    lookup, so that short-lived commands don't pay for importing them all.
+    """
 
     @functools.wraps(func)
     def wrapped(*args, **kwargs):
-        import raylab
+        from ray.tune import register_env
+        from raylab.envs.registry import ENVS
 
-        raylab.register_all()
+        for name in ENVS.custom_ids():
+            register_env(name, ENVS[name])
 
         return func(*args, **kwargs)
 
@@ -45,8 +51,12 @@ def tune_experiment(func):
         import ray
         from ray import tune
         from ray.rllib.utils import merge_dicts
+        from raylab.agents.registry import AGENTS
+        from raylab.agents.registry import get_agent_cls
 
         trainable, config, tune_overrides = func(*args, **kwargs)
+        if isinstance(trainable, str) and trainable in AGENTS:
+            get_agent_cls(trainable)
         tune_kwargs = merge_dicts(tune_kwargs, tune_overrides)
         process_tune_kwargs(ctx, **tune_kwargs)
 
@@ -0,0 +1,249 @@
+"""Profiling utilities for registered environments.
+
+Measures the cost of creating, resetting and stepping environments from the
+registry, the overhead added by each wrapper applied by
+:func:`~raylab.envs.utils.wrap_if_needed`, and the throughput of environment
+reward and termination functions on batched tensors.
+"""
+import platform
+import time
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+import gym
+import numpy as np
+import torch
+
+from .registry import ENVS
+from .rewards import get_reward_fn
+from .rewards import has_reward_fn
+from .termination import get_termination_fn
+from .termination import has_termination_fn
+
+# Configurations applied cumulatively by `wrap_if_needed`, in wrapping order
+WRAPPER_STAGES = (
+    ("TimeLimit", lambda horizon: {"max_episode_steps": horizon}),
+    ("AddRelativeTimestep", lambda _: {"time_aware": True}),
+    ("SinglePrecision", lambda _: {"single_precision": True}),
+)
+
+
+def time_env(env: gym.Env, num_steps: int, seed: Optional[int] = None) -> dict:
+    """Measure reset and step rates of an environment under random actions.
+
+    Actions are sampled before timing so that only the environment's own
+    methods are measured.
+
+    Args:
+        env: The environment
+        num_steps: Number of calls to `step`
+        seed: Optional random seed for the environment and its action space
+
+    Returns:
+        A dictionary with the number of steps and resets, the total time spent
+        in each, and the resulting rates
+    """
+    env.seed(seed)
+    env.action_space.seed(seed)
+    actions = [env.action_space.sample() for _ in range(num_steps)]
+
+    start = time.perf_counter()
+    env.reset()
+    reset_time = time.perf_counter() - start
+    resets = 1
+
+    step_time = 0.0
+    for action in actions:
+        start = time.perf_counter()
+        _, _, done, _ = env.step(action)
+        step_time += time.perf_counter() - start
+        if done:
+            start = time.perf_counter()
+            env.reset()
+            reset_time += time.perf_counter() - start
+            resets += 1
+
+    return {
+        "steps": num_steps,
+        "step_time": step_time,
+        "steps_per_sec": num_steps / step_time,
+        "resets": resets,
+        "reset_time": reset_time,
+        "resets_per_sec": resets / reset_time,
+    }
+
+
+def time_batched_fn(
+    func: Callable, inputs: List[torch.Tensor], repeats: int, warmup: int = 1
+) -> dict:
+    """Measure the throughput of a reward or termination function.
+
+    Args:
+        func: Function of (state, action, next_state) tensors
+        inputs: Batched state, action and next state tensors
+        repeats: Number of timed calls
+        warmup: Number of untimed calls before timing
+
+    Returns:
+        A dictionary with the batch size, time per call and samples per second
+    """
+    with torch.no_grad():
+        for _ in range(warmup):
+            func(*inputs)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            func(*inputs)
+        elapsed = time.perf_counter() - start
+
+    batch_size = inputs[0].shape[0]
+    return {
+        "batch_size": batch_size,
+        "time_per_call": elapsed / repeats,
+        "samples_per_sec": batch_size * repeats / elapsed,
+    }
+
+
+def time_call(func: Callable[[], None], iterations: int, warmup: int = 10) -> tuple:
+    """Measure the latency percentiles of a function without arguments.
+
+    Args:
+        func: Function to time
+        iterations: Number of timed calls
+        warmup: Number of untimed calls before timing
+
+    Returns:
+        The median and 99th percentile latencies, in microseconds
+    """
+    for _ in range(warmup):
+        func()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    return p50, p99
+
+
+def forward_reward_fn(
+    state: torch.Tensor, action: torch.Tensor, next_state: torch.Tensor
+) -> torch.Tensor:
+    """Synthetic reward for progress along the first state coordinate.
+
+    Stands in for environment reward functions when timing model-based losses
+    on arbitrary spaces.
+    """
+    return next_state[..., 0] - state[..., 0] - action.norm(dim=-1)
+
+
+def threshold_termination_fn(state: torch.Tensor, *_) -> torch.Tensor:
+    """Synthetic termination when the first state coordinate exceeds 0.9."""
+    return state[..., 0] > 0.9
+
+
+def sample_transitions(env: gym.Env, batch_size: int) -> List[torch.Tensor]:
+    """Sample a batch of (state, action, next state) tensors from env spaces."""
+    obs_space, action_space = env.observation_space, env.action_space
+    obs, new_obs = (
+        np.stack([obs_space.sample() for _ in range(batch_size)]) for _ in range(2)
+    )
+    actions = np.stack([action_space.sample() for _ in range(batch_size)])
+    return [torch.as_tensor(x) for x in (obs, actions, new_obs)]
+
+
+def profile_env(
+    env_id: str,
+    env_config: Optional[dict] = None,
+    num_steps: int = 1000,
+    horizon: int = 200,
+    batch_sizes: Sequence[int] = (256,),
+    repeats: int = 100,
+    script: bool = False,
+    seed: Optional[int] = None,
+) -> dict:
+    """Profile an environment from the registry.
+
+    Creates and steps the environment once with the base configuration and
+    once more for each wrapper stage in :data:`WRAPPER_STAGES`, adding the
+    stage's settings on top of the previous one. The overhead of a wrapper is
+    the difference in time per step between its stage and the previous one.
+
+    Args:
+        env_id: The environment id in :data:`~raylab.envs.registry.ENVS`
+        env_config: Base environment configuration. Wrapper settings are
+            removed before profiling the base environment
+        num_steps: Number of environment steps per stage
+        horizon: Episode time limit for the `TimeLimit` stage
+        batch_sizes: Batch sizes for reward and termination functions
+        repeats: Number of timed calls of reward and termination functions
+        script: Whether to compile reward and termination functions with
+            TorchScript
+        seed: Optional random seed
+
+    Returns:
+        A dictionary with the time to create the base environment, its reset
+        and step rates, the per-step overhead of each wrapper stage, and
+        reward/termination function throughputs for each batch size
+    """
+    # pylint:disable=too-many-arguments,too-many-locals
+    config = {
+        k: v
+        for k, v in (env_config or {}).items()
+        if k not in ("max_episode_steps", "time_aware", "single_precision")
+    }
+    env_creator = ENVS[env_id]
+
+    start = time.perf_counter()
+    env = env_creator(config)
+    make_time = time.perf_counter() - start
+    # Warm up caches and lazy initialization so they don't count as overhead
+    time_env(env, num_steps, seed=seed)
+    base = time_env(env, num_steps, seed=seed)
+    report = {"env_id": env_id, "make_time": make_time, **base}
+
+    wrappers = []
+    prev_step_time = base["step_time"] / num_steps
+    for name, stage_config in WRAPPER_STAGES:
+        config = {**config, **stage_config(horizon)}
+        stats = time_env(env_creator(config), num_steps, seed=seed)
+        step_time = stats["step_time"] / num_steps
+        wrappers.append(
+            {
+                "wrapper": name,
+                "steps_per_sec": stats["steps_per_sec"],
+                "overhead_per_step": step_time - prev_step_time,
+            }
+        )
+        prev_step_time = step_time
+    report["wrappers"] = wrappers
+
+    fns = {}
+    if has_reward_fn(env_id):
+        fns["reward_fn"] = get_reward_fn(env_id, env_config, script=script)
+    if has_termination_fn(env_id):
+        fns["termination_fn"] = get_termination_fn(env_id, env_config, script=script)
+    env = env_creator(env_config or {})
+    for key, func in fns.items():
+        report[key] = [
+            time_batched_fn(func, sample_transitions(env, size), repeats)
+            for size in batch_sizes
+        ]
+
+    return report
+
+
+def system_info() -> dict:
+    """Return library versions and platform details for benchmark reports."""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "torch": torch.__version__,
+        "gym": gym.__version__,
+        "torch_num_threads": torch.get_num_threads(),
+    }
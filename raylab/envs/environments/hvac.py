@@ -1,7 +1,12 @@
 # pylint:disable=missing-docstring,invalid-name
+from typing import List
+from typing import Tuple
+
 import gym
 import numpy as np
 import torch
+import torch.nn as nn
+from torch import Tensor
 
 
 DEFAULT_CONFIG = {
@@ -30,7 +35,99 @@ DEFAULT_CONFIG = {
 }
 
 
+class HVACDynamics(nn.Module):
+    """Stateless HVAC transition dynamics.
+
+    Broadcasts over arbitrary batch dimensions of states and actions and over
+    the `sample_shape` of the hall and outside temperature samples. Constants
+    are precomputed once and registered as buffers.
+
+    Args:
+        config: HVAC domain configuration
+    """
+
+    # pylint:disable=too-many-instance-attributes
+
+    def __init__(self, config: dict):
+        super().__init__()
+
+        def tensor(key):
+            return torch.as_tensor(config[key], dtype=torch.float32)
+
+        adj = torch.as_tensor(config["ADJ"])
+        # Walls are shared between adjacent rooms
+        self.register_buffer("ADJ", (adj | adj.T).float())
+        self.register_buffer("ADJ_OUTSIDE", tensor("ADJ_OUTSIDE"))
+        self.register_buffer("ADJ_HALL", tensor("ADJ_HALL"))
+        self.register_buffer("R_OUTSIDE", tensor("R_OUTSIDE"))
+        self.register_buffer("R_HALL", tensor("R_HALL"))
+        self.register_buffer("R_WALL", tensor("R_WALL"))
+        self.register_buffer("IS_ROOM", tensor("IS_ROOM"))
+        self.register_buffer("CAP", tensor("CAP"))
+        self.register_buffer("AIR_MAX", tensor("AIR_MAX"))
+        self.register_buffer("TEMP_HALL_MEAN", tensor("TEMP_HALL_MEAN"))
+        self.register_buffer("TEMP_HALL_STD", tensor("TEMP_HALL_VARIANCE").sqrt())
+        self.register_buffer("TEMP_OUTSIDE_MEAN", tensor("TEMP_OUTSIDE_MEAN"))
+        self.register_buffer("TEMP_OUTSIDE_STD", tensor("TEMP_OUTSIDE_VARIANCE").sqrt())
+        self.CAP_AIR = float(config["CAP_AIR"])
+        self.TIME_DELTA = float(config["TIME_DELTA"])
+        self.TEMP_AIR = float(config["TEMP_AIR"])
+        self.horizon = config["horizon"]
+
+    def forward(
+        self, state: Tensor, action: Tensor, sample_shape: List[int] = ()
+    ) -> Tuple[Tensor, Tensor]:
+        # pylint:disable=arguments-differ
+        temp, time = state[..., :-1], state[..., -1:]
+        air = action * self.AIR_MAX
+
+        # Sample independent temperatures for each state in the batch
+        batch_shape = list(sample_shape) + list(temp.shape[:-1])
+        temp_hall, logp_temp_hall = self.temp_hall(batch_shape)
+        temp_outside, logp_temp_outside = self.temp_outside(batch_shape)
+
+        next_temp = self.temp(temp, air, temp_outside, temp_hall)
+        logp = logp_temp_hall + logp_temp_outside
+        time = self.step_time(time).expand_as(next_temp[..., -1:])
+        return torch.cat([next_temp, time], dim=-1), logp
+
+    def temp_hall(self, sample_shape: List[int] = ()) -> Tuple[Tensor, Tensor]:
+        """Sample hall temperatures and their log-probabilities."""
+        dist = torch.distributions.Normal(self.TEMP_HALL_MEAN, self.TEMP_HALL_STD)
+        sample = dist.rsample(sample_shape)
+        return sample, dist.log_prob(sample.detach())
+
+    def temp_outside(self, sample_shape: List[int] = ()) -> Tuple[Tensor, Tensor]:
+        """Sample outside temperatures and their log-probabilities."""
+        dist = torch.distributions.Normal(self.TEMP_OUTSIDE_MEAN, self.TEMP_OUTSIDE_STD)
+        sample = dist.rsample(sample_shape)
+        return sample, dist.log_prob(sample.detach())
+
+    def temp(
+        self, temp: Tensor, air: Tensor, temp_outside: Tensor, temp_hall: Tensor
+    ) -> Tensor:
+        """Compute next room temperatures."""
+        # Pairwise temperature differences: temp[..., j] - temp[..., i]
+        temp_diff = temp.unsqueeze(-2) - temp.unsqueeze(-1)
+        return temp + self.TIME_DELTA / self.CAP * (
+            air * self.CAP_AIR * (self.TEMP_AIR - temp) * self.IS_ROOM
+            + (self.ADJ * temp_diff / self.R_WALL).sum(dim=-1)
+            + self.ADJ_OUTSIDE * (temp_outside - temp) / self.R_OUTSIDE
+            + self.ADJ_HALL * (temp_hall - temp) / self.R_HALL
+        )
+
+    def step_time(self, time: Tensor) -> Tensor:
+        """Advance the relative timestep."""
+        timestep = torch.round(self.horizon * time)
+        return torch.clamp((timestep + 1) / self.horizon, 0, 1)
+
+
 class HVACEnv(gym.Env):
+    """HVAC domain.
+
+    Attributes:
+        dynamics: Batched transition dynamics module
+    """
 
     metadata = {"render.modes": ["human"]}
 
@@ -48,6 +145,7 @@ class HVACEnv(gym.Env):
             high=np.array([1.0] * self._num_rooms, dtype=np.float32),
         )
 
+        self.dynamics = HVACDynamics(self._config)
         self._horizon = self._config["horizon"]
         self._state = None
         self.reset()
@@ -56,11 +154,6 @@ class HVACEnv(gym.Env):
         self._state = np.array(self._config["init"]["temp"] + [0.0])
         return self._state
 
-    @property
-    def temp(self):
-        obs, _ = self._unpack_state(self._state)
-        return torch.as_tensor(obs, dtype=torch.float32)
-
     @torch.no_grad()
     def step(self, action):
         state, action = map(torch.as_tensor, (self._state, action))
@@ -71,74 +164,9 @@ class HVACEnv(gym.Env):
 
     def transition_fn(self, state, action, sample_shape=()):
         # pylint:disable=missing-docstring
-        state, time = self._unpack_state(state)
-
-        AIR_MAX = torch.as_tensor(self._config["AIR_MAX"])
-        action = torch.as_tensor(action) * AIR_MAX
-
-        temp_hall, logp_temp_hall = self._temp_hall(sample_shape)
-        temp_outside, logp_temp_outside = self._temp_outside(sample_shape)
-
-        next_state = self._temp(action, temp_outside, temp_hall)
-        logp = logp_temp_hall + logp_temp_outside
-        time = self._step_time(time)
-        time = time.expand_as(next_state[..., -1:])
-        return torch.cat([next_state, time], dim=-1), logp
-
-    def _temp_hall(self, sample_shape=()):
-        TEMP_HALL_MEAN = torch.as_tensor(self._config["TEMP_HALL_MEAN"])
-        TEMP_HALL_VARIANCE = torch.sqrt(
-            torch.as_tensor(self._config["TEMP_HALL_VARIANCE"])
-        )
-        dist = torch.distributions.Normal(TEMP_HALL_MEAN, TEMP_HALL_VARIANCE)
-        sample = dist.rsample(sample_shape)
-        logp = dist.log_prob(sample.detach())
-        return sample, logp
-
-    def _temp_outside(self, sample_shape=()):
-        TEMP_OUTSIDE_MEAN = torch.as_tensor(self._config["TEMP_OUTSIDE_MEAN"])
-        TEMP_OUTSIDE_VARIANCE = torch.sqrt(
-            torch.as_tensor(self._config["TEMP_OUTSIDE_VARIANCE"])
-        )
-        dist = torch.distributions.Normal(TEMP_OUTSIDE_MEAN, TEMP_OUTSIDE_VARIANCE)
-        sample = dist.rsample(sample_shape)
-        logp = dist.log_prob(sample.detach())
-        return sample, logp
-
-    def _temp(self, action, temp_outside, temp_hall):  # pylint:disable=too-many-locals
-        air = action
-
-        TIME_DELTA = torch.as_tensor(self._config["TIME_DELTA"])
-
-        CAP = torch.as_tensor(self._config["CAP"])
-        CAP_AIR = torch.as_tensor(self._config["CAP_AIR"])
-        TEMP_AIR = torch.as_tensor(self._config["TEMP_AIR"])
-
-        IS_ROOM = torch.as_tensor(self._config["IS_ROOM"])
-
-        ADJ = torch.as_tensor(self._config["ADJ"])
-        ADJ_OUTSIDE = torch.as_tensor(self._config["ADJ_OUTSIDE"])
-        ADJ_HALL = torch.as_tensor(self._config["ADJ_HALL"])
-
-        R_OUTSIDE = torch.as_tensor(self._config["R_OUTSIDE"])
-        R_HALL = torch.as_tensor(self._config["R_HALL"])
-        R_WALL = torch.as_tensor(self._config["R_WALL"])
-
-        temp = self.temp
-        temp_ = temp + TIME_DELTA / CAP * (
-            air * CAP_AIR * (TEMP_AIR - temp) * IS_ROOM
-            + ((ADJ | ADJ.T) * (temp[np.newaxis] - temp[np.newaxis].T) / R_WALL).sum(
-                dim=-1
-            )
-            + ADJ_OUTSIDE * (temp_outside - temp) / R_OUTSIDE
-            + ADJ_HALL * (temp_hall - temp) / R_HALL
-        )
-
-        return temp_
-
-    def _step_time(self, time):
-        timestep = torch.round(self._horizon * time)
-        return torch.clamp((timestep + 1) / self._horizon, 0, 1)
+        state = torch.as_tensor(state, dtype=torch.float32)
+        action = torch.as_tensor(action, dtype=torch.float32)
+        return self.dynamics(state, action, sample_shape)
 
     def reward_fn(self, state, action, next_state):
         # pylint:disable=unused-argument,missing-docstring
@@ -168,6 +196,11 @@ class HVACEnv(gym.Env):
         _, time = self._unpack_state(self._state)
         return time.item() >= 1.0
 
+    def termination_fn(self, state, action, next_state):
+        # pylint:disable=unused-argument,missing-docstring
+        _, time = self._unpack_state(next_state)
+        return time[..., 0] >= 1.0
+
     @staticmethod
     def _unpack_state(state):
         obs = torch.as_tensor(state[..., :-1], dtype=torch.float32)
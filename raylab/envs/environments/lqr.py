@@ -4,71 +4,120 @@ Please see http://rail.eecs.berkeley.edu/deeprlcourse/static/slides/lec-10.pdf
 for notation and more details on LQR.
 """
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import torch
 import torch.nn as nn
 from torch import Tensor
 
+Policy = Tuple[Tensor, Tensor]
+ValueFn = Tuple[Tensor, Tensor, Tensor]
+
+
+def _mT(mat: Tensor) -> Tensor:
+    # pylint:disable=invalid-name
+    return mat.transpose(-2, -1)
+
+
+def _mv(mat: Tensor, vec: Tensor) -> Tensor:
+    return (mat @ vec.unsqueeze(-1)).squeeze(-1)
+
+
+def _quad(vec: Tensor, mat: Tensor) -> Tensor:
+    return (vec * _mv(mat, vec)).sum(-1)
+
+
+def _dot(vec1: Tensor, vec2: Tensor) -> Tensor:
+    return (vec1 * vec2).sum(-1)
+
+
+def _broadcast(vec1: Tensor, vec2: Tensor) -> Tuple[Tensor, Tensor]:
+    # Expand vectors of possibly different sizes to a common batch shape
+    batch_shape = list((vec1[..., 0] + vec2[..., 0]).shape)
+    vec1 = vec1.expand(batch_shape + [vec1.size(-1)])
+    vec2 = vec2.expand(batch_shape + [vec2.size(-1)])
+    return vec1, vec2
+
+
+def _cat(vec1: Tensor, vec2: Tensor) -> Tensor:
+    return torch.cat(_broadcast(vec1, vec2), dim=-1)
+
 
 class LQR(nn.Module):
-    """Linear Quadratic Regulator solver and simulator."""
+    """Linear Quadratic Regulator solver and simulator.
+
+    Supports batches of systems: the dynamics and cost parameters may have
+    matching leading batch dimensions, in which case all systems are solved
+    and simulated at once. States and actions passed to the methods below must
+    broadcast with the systems' batch shape.
+
+    Args:
+        F: Dynamics matrix of shape (*B, n, n + m)
+        f: Dynamics bias of shape (*B, n)
+        C: Cost matrix of shape (*B, n + m, n + m)
+        c: Cost vector of shape (*B, n + m)
+    """
 
     # pylint:disable=invalid-name,abstract-method,missing-function-docstring
     def __init__(self, F: Tensor, f: Tensor, C: Tensor, c: Tensor):
         super().__init__()
-        self.F = F.float().detach()
-        self.f = f.float().detach()
-        self.C = C.float().detach()
-        self.c = c.float().detach()
+        self.register_buffer("F", F.float().detach())
+        self.register_buffer("f", f.float().detach())
+        self.register_buffer("C", C.float().detach())
+        self.register_buffer("c", c.float().detach())
 
-        self.n_dim = self.F.shape[1]
-        self.state_size = self.F.shape[0]
+        self.n_dim = self.F.shape[-1]
+        self.state_size = self.F.shape[-2]
         self.action_size = self.n_dim - self.state_size
 
     @torch.jit.export
     def transition(self, x, u):
-        inputs = torch.cat([x, u])
-        return self.F @ inputs + self.f
+        inputs = _cat(x, u)
+        return _mv(self.F, inputs) + self.f
 
     @torch.jit.export
     def cost(self, x, u):
-        inputs = torch.cat([x, u])
-        c1 = 1 / 2 * inputs.T @ self.C @ inputs
-        c2 = inputs @ self.c
-        return c1 + c2
+        inputs = _cat(x, u)
+        return 1 / 2 * _quad(inputs, self.C) + _dot(inputs, self.c)
 
     @torch.jit.export
     def final_cost(self, x):
         state_size = self.state_size
-        C_xx = self.C[:state_size, :state_size]
-        c_x = self.c[:state_size]
-        c1 = 1 / 2 * x.T @ C_xx @ x
-        c2 = x @ c_x
-        return c1 + c2
+        C_xx = self.C[..., :state_size, :state_size]
+        c_x = self.c[..., :state_size]
+        return 1 / 2 * _quad(x, C_xx) + _dot(x, c_x)
 
     @torch.jit.export
-    def backward(self, T: int):
-        policy: List[Tuple[Tensor, Tensor]] = []
-        value_fn: List[Tuple[Tensor, Tensor, Tensor]] = []
-        state_size = self.state_size
-
-        V = self.C[:state_size, :state_size]
-        v = self.c[:state_size]
-        const = torch.zeros(())
-
-        value_fn.append((V, v, const))
-
-        for _ in range(T - 1, -1, -1):
-            K, k, V, v, const_ = self.single_step(V, v)
-            const += const_
-            policy.append((K, k))
-            value_fn.append((V, v, const))
-
-        # policy = list(reversed(policy))
-        # value_fn = list(reversed(value_fn[1:]))
-
-        return policy[::-1], value_fn[1:][::-1]
+    def backward(self, T: int) -> Tuple[Policy, ValueFn]:
+        """Solve the LQR problem with the Riccati recursion.
+
+        Args:
+            T: The time horizon
+
+        Returns:
+            A tuple with the optimal time-varying linear policy as stacked
+            (K, k) tensors of shapes (T, *B, m, n) and (T, *B, m), and the
+            value function for each timestep as stacked (V, v, const) tensors
+            of shapes (T, *B, n, n), (T, *B, n), and (T, *B)
+        """
+        state_size, action_size = self.state_size, self.action_size
+        batch_shape = list(self.F.shape[:-2])
+        Ks = self.F.new_empty([T] + batch_shape + [action_size, state_size])
+        ks = self.F.new_empty([T] + batch_shape + [action_size])
+        Vs = self.F.new_empty([T] + batch_shape + [state_size, state_size])
+        vs = self.F.new_empty([T] + batch_shape + [state_size])
+        consts = self.F.new_empty([T] + batch_shape)
+
+        V = self.C[..., :state_size, :state_size]
+        v = self.c[..., :state_size]
+        const = self.F.new_zeros(batch_shape)
+        for t in range(T - 1, -1, -1):
+            K, k, V_, v_, const_ = self.single_step(V, v)
+            V, v, const = V_, v_, const + const_
+            Ks[t], ks[t], Vs[t], vs[t], consts[t] = K, k, V, v, const
+
+        return (Ks, ks), (Vs, vs, consts)
 
     @torch.jit.export
     def single_step(self, V, v):
@@ -82,80 +131,198 @@ class LQR(nn.Module):
     def compute_Q(self, V, v):
         F, f, C, c = self.F, self.f, self.C, self.c
 
-        FV = F.T @ V
+        FV = _mT(F) @ V
         Q = C + FV @ F
-        q = c + FV @ f + F.T @ v
+        q = c + _mv(FV, f) + _mv(_mT(F), v)
         return Q, q
 
     @torch.jit.export
     def compute_K(self, Q, q):
         state_size = self.state_size
-        Q_uu = Q[state_size:, state_size:]
-        Q_ux = Q[state_size:, :state_size]
-        q_u = q[state_size:]
+        Q_uu = Q[..., state_size:, state_size:]
+        Q_ux = Q[..., state_size:, :state_size]
+        q_u = q[..., state_size:]
 
-        inv_Q_uu = Q_uu.inverse()
-
-        K = -inv_Q_uu @ Q_ux
-        k = -inv_Q_uu @ q_u
-        return K, k
+        # Solve for the gain and bias at once
+        Kk = -Q_uu.inverse() @ torch.cat([Q_ux, q_u.unsqueeze(-1)], dim=-1)
+        return Kk[..., :-1], Kk[..., -1]
 
     @torch.jit.export
     def compute_V(self, Q, q, K, k):
         state_size = self.state_size
-        Q_uu = Q[state_size:, state_size:]
-        Q_ux = Q[state_size:, :state_size]
-        q_u = q[state_size:]
-        Q_xx = Q[:state_size, :state_size]
-        Q_xu = Q[:state_size, state_size:]
-        q_x = q[:state_size]
-
-        K_Q_uu = K.T @ Q_uu
-
-        V = Q_xx + Q_xu @ K + K.T @ Q_ux + K_Q_uu @ K
-        v = q_x + Q_xu @ k + K.T @ q_u + K_Q_uu @ k
+        Q_uu = Q[..., state_size:, state_size:]
+        Q_ux = Q[..., state_size:, :state_size]
+        q_u = q[..., state_size:]
+        Q_xx = Q[..., :state_size, :state_size]
+        Q_xu = Q[..., :state_size, state_size:]
+        q_x = q[..., :state_size]
+
+        K_T = _mT(K)
+        K_Q_uu = K_T @ Q_uu
+
+        V = Q_xx + Q_xu @ K + K_T @ Q_ux + K_Q_uu @ K
+        v = q_x + _mv(Q_xu, k) + _mv(K_T, q_u) + _mv(K_Q_uu, k)
         return V, v
 
     @torch.jit.export
     def compute_const(self, V, v, k):
-        # pylint:disable=too-many-locals
         state_size = self.state_size
         F, f, C, c = self.F, self.f, self.C, self.c
 
-        V_f = V @ f
-        W = C + F.T @ V @ F
-        w = c + F.T @ V_f + F.T @ v
-        W_uu = W[state_size:, state_size:]
-        w_u = w[state_size:]
+        F_T = _mT(F)
+        V_f = _mv(V, f)
+        W_uu = (C + F_T @ V @ F)[..., state_size:, state_size:]
+        w_u = (c + _mv(F_T, V_f) + _mv(F_T, v))[..., state_size:]
 
-        const1 = 1 / 2 * k.T @ W_uu @ k
-        const2 = k.T @ w_u
-        const3 = 1 / 2 * f.T @ V_f + f.T @ v
-        const = const1 + const2 + const3
-        return const.squeeze()
+        const1 = 1 / 2 * _quad(k, W_uu)
+        const2 = _dot(k, w_u)
+        const3 = 1 / 2 * _dot(f, V_f) + _dot(f, v)
+        return const1 + const2 + const3
 
     @torch.jit.export
-    def forward(self, policy: List[Tuple[Tensor, Tensor]], x0: Tensor):
+    def forward(self, policy: Policy, x0: Tensor) -> Tuple[Tensor, Tensor, Tensor]:
+        """Simulate trajectories of a time-varying linear policy.
+
+        Args:
+            policy: Stacked (K, k) tensors as returned by :meth:`backward`
+            x0: Initial states of shape (*S, n), where S broadcasts with the
+                systems' batch shape
+
+        Returns:
+            Stacked states, actions, and costs of shapes (T + 1, *S', n),
+            (T, *S', m), and (T + 1, *S'), where S' is the broadcast of S and
+            the systems' batch shape
+        """
         # pylint:disable=arguments-differ
+        Ks, ks = policy
+        x0, _ = _broadcast(x0, self.f)
         states = [x0]
-        actions = []
-        costs = []
+        actions: List[Tensor] = []
+        costs: List[Tensor] = []
 
         state = x0
-
-        for K, k in policy:
-            action = K @ state + k
-
+        for t in range(Ks.size(0)):
+            action = _mv(Ks[t], state) + ks[t]
             next_state = self.transition(state, action)
-            cost = self.cost(state, action)
-
-            state = next_state
-
-            states.append(next_state)
+            costs.append(self.cost(state, action))
             actions.append(action)
-            costs.append(cost)
-
-        final_cost = self.final_cost(state)
-        costs.append(final_cost)
+            states.append(next_state)
+            state = next_state
 
+        costs.append(self.final_cost(state))
         return torch.stack(states), torch.stack(actions), torch.stack(costs)
+
+    @torch.jit.export
+    def expected_cost(
+        self,
+        policy: Policy,
+        mu0: Tensor,
+        Sigma0: Tensor,
+        Sigma_u: Optional[Tensor] = None,
+    ) -> Tensor:
+        """Exact expected total cost of a linear Gaussian policy.
+
+        Propagates the mean and covariance of the state distribution in closed
+        form under actions :math:`u_t = K_t x_t + k_t + \\epsilon_t`, with
+        :math:`\\epsilon_t \\sim N(0, \\Sigma_u)`.
+
+        Args:
+            policy: Stacked (K, k) tensors of shapes (T, *B, m, n), (T, *B, m)
+            mu0: Initial state mean of shape (*B, n)
+            Sigma0: Initial state covariance of shape (*B, n, n)
+            Sigma_u: Optional action noise covariance of shape (*B, m, m)
+
+        Returns:
+            The expected cost for each system, of shape (*B,)
+        """
+        Ks, ks = policy
+        state_size = self.state_size
+        mu, Sigma = mu0, Sigma0
+        total = torch.zeros_like(mu0[..., 0])
+        for t in range(Ks.size(0)):
+            K, k = Ks[t], ks[t]
+            eye = torch.eye(state_size, dtype=K.dtype, device=K.device)
+            eye = eye.expand(list(K.shape[:-2]) + [state_size, state_size])
+            G = torch.cat([eye, K], dim=-2)
+            z_mu = torch.cat([mu, _mv(K, mu) + k], dim=-1)
+            z_Sigma = G @ Sigma @ _mT(G)
+            if Sigma_u is not None:
+                z_Sigma = z_Sigma + torch.nn.functional.pad(
+                    Sigma_u, [state_size, 0, state_size, 0]
+                )
+
+            trace = (self.C * z_Sigma).sum([-2, -1])
+            total = total + 1 / 2 * (trace + _quad(z_mu, self.C)) + _dot(z_mu, self.c)
+
+            mu = _mv(self.F, z_mu) + self.f
+            Sigma = self.F @ z_Sigma @ _mT(self.F)
+
+        C_xx = self.C[..., :state_size, :state_size]
+        trace = (C_xx * Sigma).sum([-2, -1])
+        return total + 1 / 2 * trace + self.final_cost(mu)
+
+    def policy_gradient(
+        self,
+        policy: Policy,
+        mu0: Tensor,
+        Sigma0: Tensor,
+        Sigma_u: Optional[Tensor] = None,
+    ) -> Policy:
+        """Analytic gradient of the expected cost w.r.t. a linear policy.
+
+        Differentiates the closed-form expected cost (see
+        :meth:`expected_cost`), providing ground-truth gradients to check
+        model-based policy gradient estimators against. Since each system's
+        cost only depends on its own policy parameters, gradients are computed
+        for all systems at once.
+
+        Args:
+            policy: Stacked (K, k) tensors of shapes (T, *B, m, n), (T, *B, m)
+            mu0: Initial state mean of shape (*B, n)
+            Sigma0: Initial state covariance of shape (*B, n, n)
+            Sigma_u: Optional action noise covariance of shape (*B, m, m)
+
+        Returns:
+            The gradients w.r.t. K and k
+        """
+        Ks, ks = (p.detach().requires_grad_() for p in policy)
+        with torch.enable_grad():
+            cost = self.expected_cost((Ks, ks), mu0, Sigma0, Sigma_u).sum()
+            K_grad, k_grad = torch.autograd.grad(cost, [Ks, ks])
+        return K_grad, k_grad
+
+
+def random_lqr(
+    batch_shape: Tuple[int, ...],
+    state_size: int,
+    action_size: int,
+    generator: Optional[torch.Generator] = None,
+) -> LQR:
+    """Sample a batch of random LQR systems.
+
+    Samples dynamics matrices with spectral radius below 1 and positive
+    definite cost matrices.
+
+    Args:
+        batch_shape: Batch dimensions of the systems
+        state_size: Size of the state vectors
+        action_size: Size of the action vectors
+        generator: Optional random number generator
+
+    Returns:
+        An LQR instance with the sampled systems
+    """
+    # pylint:disable=invalid-name
+    n_dim = state_size + action_size
+    batch_shape = tuple(batch_shape)
+
+    F = torch.randn(batch_shape + (state_size, n_dim), generator=generator)
+    # The Frobenius norm bounds the spectral radius of the state transition
+    F_xx = F[..., :state_size]
+    F = F / (F_xx.norm(dim=(-2, -1), keepdim=True) + 1)
+    f = torch.randn(batch_shape + (state_size,), generator=generator)
+
+    L = torch.randn(batch_shape + (n_dim, n_dim), generator=generator)
+    C = L @ _mT(L) / n_dim + torch.eye(n_dim)
+    c = torch.randn(batch_shape + (n_dim,), generator=generator)
+    return LQR(F, f, C, c)
@@ -99,7 +99,6 @@ class ReservoirEnv(gym.Env):
         return torch.cat([next_state, time], dim=-1), logp
 
     def _rlevel(self, rlevel: Tensor, action: Tensor, rain: Tensor) -> Tensor:
-        MIN_RES_CAP = torch.zeros(self._num_reservoirs)
         outflow = torch.as_tensor(action)
         rlevel = rlevel + rain - self._evaporated(rlevel)
         rlevel = (
@@ -108,7 +107,7 @@ class ReservoirEnv(gym.Env):
             - outflow
             - self._overflow(rlevel, action)
         )
-        return torch.max(MIN_RES_CAP, rlevel)
+        return torch.clamp(rlevel, min=0)
 
     def _rainfall(
         self, rlevel: Tensor, sample_shape: List[int] = ()
@@ -129,10 +128,9 @@ class ReservoirEnv(gym.Env):
         return (overflow + outflow).matmul(DOWNSTREAM.t())
 
     def _overflow(self, rlevel: Tensor, action: Tensor) -> Tensor:
-        MIN_RES_CAP = torch.zeros(self._num_reservoirs)
         MAX_RES_CAP = self._config["MAX_RES_CAP"]
         outflow = torch.as_tensor(action)
-        return torch.max(MIN_RES_CAP, rlevel - outflow - MAX_RES_CAP)
+        return torch.clamp(rlevel - outflow - MAX_RES_CAP, min=0)
 
     def _evaporated(self, rlevel: Tensor) -> Tensor:
         # EVAP_PER_TIME_UNIT = self._config["MAX_WATER_EVAP_FRAC_PER_TIME_UNIT"]
@@ -1,53 +1,155 @@
 # pylint:disable=import-outside-toplevel
-"""Registry of custom Gym environments."""
+"""Registry of custom Gym environments.
+
+Gym environments are resolved on first lookup, so that importing this module
+does not scan Gym's registry or import external environment libraries.
+"""
+import functools
 import importlib
+from collections.abc import MutableMapping
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
 
 import gym
 
 from .utils import wrap_if_needed
 
+EnvCreator = Callable[[dict], gym.Env]
+
+
+def has_dependencies(spec: gym.envs.registration.EnvSpec) -> bool:
+    """Whether all dependencies of a Gym environment spec are installed."""
+    entry_point = spec.entry_point if isinstance(spec.entry_point, str) else ""
+    if "atari" in entry_point:
+        return importlib.util.find_spec("atari_py") is not None
+    if "mujoco" in entry_point or "robotics" in entry_point:
+        return importlib.util.find_spec("mujoco_py") is not None
+    if "box2d" in entry_point:
+        return importlib.util.find_spec("Box2D") is not None
+    return True
+
 
 def filtered_gym_env_ids():
     """
     Return environment ids in Gym registry for which all dependencies are installed.
     """
-    specs = set(gym.envs.registry.all())
+    return {s.id for s in gym.envs.registry.all() if has_dependencies(s)}
 
-    if importlib.util.find_spec("atari_py") is None:
-        specs.difference_update({s for s in specs if "atari" in s.entry_point})
-    if importlib.util.find_spec("mujoco_py") is None:
-        specs.difference_update({s for s in specs if "mujoco" in s.entry_point})
-        specs.difference_update({s for s in specs if "robotics" in s.entry_point})
-    if importlib.util.find_spec("Box2D") is None:
-        specs.difference_update({s for s in specs if "box2d" in s.entry_point})
 
-    return {s.id for s in specs}
+def _gym_spec(env_id: str) -> Optional[gym.envs.registration.EnvSpec]:
+    try:
+        return gym.spec(env_id)
+    except gym.error.Error:
+        return None
 
 
-IDS = filtered_gym_env_ids()
-# kwarg trick from:
-# https://github.com/satwikkansal/wtfpython#-the-sticky-output-function
-ENVS = {i: wrap_if_needed(lambda config, i=i: gym.make(i, **config)) for i in IDS}
+def _gym_env_maker(env_id: str) -> EnvCreator:
+    # kwarg trick from:
+    # https://github.com/satwikkansal/wtfpython#-the-sticky-output-function
+    return wrap_if_needed(lambda config, i=env_id: gym.make(i, **config))
 
 
-def register_external_library_environments(library_name):
-    """Conveniency function for adding external environments to the global registry."""
-    if importlib.util.find_spec(library_name) is None:
-        return
+def _library_env_maker(env_id: str, library_name: str) -> EnvCreator:
+    @wrap_if_needed
+    def _env_maker(config, env_id=env_id):
+        importlib.import_module(library_name)
+
+        kwargs = config.get("kwargs", {})
+        return gym.make(env_id, **kwargs)
+
+    return _env_maker
+
+
+class EnvRegistry(MutableMapping):
+    """Mapping from environment ids to environment creators.
+
+    Holds creators for custom environments and builds creators for
+    environments in Gym's registry on first lookup. External libraries which
+    register environments in Gym are only imported when an id can't be found
+    otherwise, or when iterating over all environment ids.
+    """
+
+    def __init__(self):
+        self._creators: Dict[str, EnvCreator] = {}
+        self._custom_ids: List[str] = []
+        self._libraries: List[str] = []
+        self._imported_libraries: List[str] = []
+
+    def __getitem__(self, env_id: str) -> EnvCreator:
+        if env_id not in self._creators:
+            self._creators[env_id] = self._resolve(env_id)
+        return self._creators[env_id]
+
+    def __setitem__(self, env_id: str, env_creator: EnvCreator):
+        self._creators[env_id] = env_creator
+        if env_id not in self._custom_ids:
+            self._custom_ids.append(env_id)
+
+    def __delitem__(self, env_id: str):
+        del self._creators[env_id]
+        if env_id in self._custom_ids:
+            self._custom_ids.remove(env_id)
+
+    def __iter__(self) -> Iterator[str]:
+        self._import_libraries()
+        yield from self._custom_ids
+        yield from sorted(filtered_gym_env_ids().difference(self._custom_ids))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, EnvCreator]:
+        """Return a dict with all environment creators."""
+        return {k: self[k] for k in self}
 
-    importlib.import_module(library_name)
-    new_ids = filtered_gym_env_ids() - IDS
-    for name in new_ids:
+    def custom_ids(self) -> List[str]:
+        """Return the ids of environments added explicitly to the registry."""
+        return self._custom_ids.copy()
 
-        @wrap_if_needed
-        def _env_maker(config, env_id=name):
-            importlib.import_module(library_name)
+    def add_library(self, library_name: str):
+        """Add an external library of Gym environments, if installed."""
+        if importlib.util.find_spec(library_name) is not None:
+            self._libraries.append(library_name)
 
-            kwargs = config.get("kwargs", {})
-            return gym.make(env_id, **kwargs)
+    def _resolve(self, env_id: str) -> EnvCreator:
+        spec = _gym_spec(env_id)
+        while spec is None and self._import_next_library():
+            spec = _gym_spec(env_id)
 
-        ENVS[name] = _env_maker
-    IDS.update(new_ids)
+        if spec is None or not has_dependencies(spec):
+            raise KeyError(env_id)
+
+        entry_point = spec.entry_point if isinstance(spec.entry_point, str) else ""
+        library_name = entry_point.split(".")[0].split(":")[0]
+        if library_name in self._libraries:
+            return _library_env_maker(env_id, library_name)
+        return _gym_env_maker(env_id)
+
+    def _import_next_library(self) -> bool:
+        for library_name in self._libraries:
+            if library_name not in self._imported_libraries:
+                importlib.import_module(library_name)
+                self._imported_libraries.append(library_name)
+                return True
+        return False
+
+    def _import_libraries(self):
+        while self._import_next_library():
+            pass
+
+
+ENVS = EnvRegistry()
+
+
+def register_external_library_environments(library_name):
+    """Conveniency function for adding external environments to the global registry.
+
+    The library is only imported when one of its environments is requested.
+    """
+    ENVS.add_library(library_name)
 
 
 @wrap_if_needed
@@ -57,33 +159,44 @@ def _cartpole_stateless_maker(_):
     return CartPoleStateless()
 
 
-@wrap_if_needed
-def _navigation_maker(config):
+def _navigation_env(config):
     from raylab.envs.environments.navigation import NavigationEnv
 
     return NavigationEnv(config)
 
 
-@wrap_if_needed
-def _reservoir_maker(config):
+def _reservoir_env(config):
     from raylab.envs.environments.reservoir import ReservoirEnv
 
     return ReservoirEnv(config)
 
 
-@wrap_if_needed
-def _hvac_maker(config):
+def _hvac_env(config):
     from raylab.envs.environments.hvac import HVACEnv
 
     return HVACEnv(config)
 
 
+def _vector_env_maker(env_creator: EnvCreator, transition_fn: str) -> EnvCreator:
+    # Defer importing RLlib's VectorEnv until the environment is created
+    @functools.wraps(env_creator)
+    def wrapped(config):
+        from .vector import vector_env_maker
+
+        return vector_env_maker(env_creator, transition_fn)(config)
+
+    return wrapped
+
+
 ENVS.update(
     {
         "CartPoleStateless": _cartpole_stateless_maker,
-        "Navigation": _navigation_maker,
-        "Reservoir": _reservoir_maker,
-        "HVAC": _hvac_maker,
+        "Navigation": wrap_if_needed(_navigation_env),
+        "Reservoir": wrap_if_needed(_reservoir_env),
+        "HVAC": wrap_if_needed(_hvac_env),
+        "VectorNavigation": _vector_env_maker(_navigation_env, "transition_fn"),
+        "VectorReservoir": _vector_env_maker(_reservoir_env, "dynamics_fn"),
+        "VectorHVAC": _vector_env_maker(_hvac_env, "transition_fn"),
     }
 )
 
@@ -34,10 +34,17 @@ def has_reward_fn(env_id: str) -> bool:
     return _raylab_registry.contains(RAYLAB_REWARD, env_id)
 
 
-def get_reward_fn(env_id: str, env_config: Optional[dict] = None) -> "RewardFn":
+def get_reward_fn(
+    env_id: str, env_config: Optional[dict] = None, script: bool = False
+) -> "RewardFn":
     """Return the reward funtion for the given environment name and configuration.
 
     Only returns reward functions for environments which have been registered with Tune.
+
+    Args:
+        env_id: The environment name
+        env_config: The environment configuration
+        script: Whether to compile the reward function with TorchScript
     """
     assert has_env_creator(env_id), f"{env_id} environment not registered with Tune."
     assert has_reward_fn(env_id), f"{env_id} environment reward not registered."
@@ -46,11 +53,17 @@ def get_reward_fn(env_id: str, env_config: Optional[dict] = None) -> "RewardFn":
     reward_fn = _raylab_registry.get(RAYLAB_REWARD, env_id)(env_config)
     if env_config.get("time_aware", False):
         reward_fn = TimeAwareRewardFn(reward_fn)
+    if script:
+        reward_fn = torch.jit.script(reward_fn)
     return reward_fn
 
 
 class RewardFn(nn.Module):
-    """Module that computes an environment's reward function for batches of inputs."""
+    """Module that computes an environment's reward function for batches of inputs.
+
+    Subclasses should be compatible with TorchScript and hold constant tensors
+    as buffers, so that they follow the module's device.
+    """
 
     def __init__(self, _):
         super().__init__()
@@ -140,12 +153,12 @@ class HVACReward(RewardFn):
         from .environments.hvac import DEFAULT_CONFIG
 
         config = {**DEFAULT_CONFIG, **config}
-        self.air_max = torch.as_tensor(config["AIR_MAX"]).float()
-        self.is_room = torch.as_tensor(config["IS_ROOM"])
-        self.cost_air = torch.as_tensor(config["COST_AIR"]).float()
-        self.temp_low = torch.as_tensor(config["TEMP_LOW"]).float()
-        self.temp_up = torch.as_tensor(config["TEMP_UP"]).float()
-        self.penalty = torch.as_tensor(config["PENALTY"]).float()
+        self.register_buffer("air_max", torch.as_tensor(config["AIR_MAX"]).float())
+        self.register_buffer("is_room", torch.as_tensor(config["IS_ROOM"]))
+        self.register_buffer("cost_air", torch.as_tensor(config["COST_AIR"]).float())
+        self.register_buffer("temp_low", torch.as_tensor(config["TEMP_LOW"]).float())
+        self.register_buffer("temp_up", torch.as_tensor(config["TEMP_UP"]).float())
+        self.register_buffer("penalty", torch.as_tensor(config["PENALTY"]).float())
 
     def forward(self, state, action, next_state):
         air = action * self.air_max
@@ -193,7 +206,7 @@ class NavigationReward(RewardFn):
         from .environments.navigation import DEFAULT_CONFIG
 
         config = {**DEFAULT_CONFIG, **config}
-        self._end = torch.as_tensor(config["end"]).float()
+        self.register_buffer("_end", torch.as_tensor(config["end"]).float())
 
     def forward(self, state, action, next_state):
         next_state = next_state[..., :2]
@@ -221,11 +234,11 @@ class ReservoirReward(RewardFn):
         from .environments.reservoir import DEFAULT_CONFIG
 
         config = {**DEFAULT_CONFIG, **config}
-        self.lower_bound = torch.as_tensor(config["LOWER_BOUND"])
-        self.upper_bound = torch.as_tensor(config["UPPER_BOUND"])
+        self.register_buffer("lower_bound", torch.as_tensor(config["LOWER_BOUND"]))
+        self.register_buffer("upper_bound", torch.as_tensor(config["UPPER_BOUND"]))
 
-        self.low_penalty = torch.as_tensor(config["LOW_PENALTY"])
-        self.high_penalty = torch.as_tensor(config["HIGH_PENALTY"])
+        self.register_buffer("low_penalty", torch.as_tensor(config["LOW_PENALTY"]))
+        self.register_buffer("high_penalty", torch.as_tensor(config["HIGH_PENALTY"]))
 
     def forward(self, state, action, next_state):
         rlevel = next_state[..., :-1]
@@ -233,11 +246,11 @@ class ReservoirReward(RewardFn):
         mean_capacity_deviation = -0.01 * torch.abs(
             rlevel - (self.lower_bound + self.upper_bound) / 2
         )
-        overflow_penalty = self.high_penalty * torch.max(
-            torch.zeros_like(rlevel), rlevel - self.upper_bound
+        overflow_penalty = self.high_penalty * torch.clamp(
+            rlevel - self.upper_bound, min=0
         )
-        underflow_penalty = self.low_penalty * torch.max(
-            torch.zeros_like(rlevel), self.lower_bound - rlevel
+        underflow_penalty = self.low_penalty * torch.clamp(
+            self.lower_bound - rlevel, min=0
         )
 
         penalty = mean_capacity_deviation + overflow_penalty + underflow_penalty
@@ -252,12 +265,11 @@ class MountainCarContinuousReward(RewardFn):
         super().__init__(config)
         goal_position = 0.45
         goal_velocity = config.get("goal_velocity", 0.0)
-        self.goal = torch.as_tensor([goal_position, goal_velocity])
+        self.register_buffer("goal", torch.as_tensor([goal_position, goal_velocity]))
 
     def forward(self, state, action, next_state):
         done = (next_state >= self.goal).all(-1)
-        shape = state.shape[:-1]
-        reward = torch.where(done, torch.empty(shape).fill_(200), torch.zeros(shape))
+        reward = done.to(next_state.dtype) * 200
         reward -= torch.pow(action, 2).squeeze(-1) * 0.1
         return reward
 
@@ -316,7 +328,9 @@ class PendulumReward(RewardFn):
 class PusherReward(RewardFn):
     """Pusher-v2's reward function."""
 
-    vec_size: int = 3
+    def __init__(self, config):
+        super().__init__(config)
+        self.vec_size = 3
 
     def forward(self, state, action, next_state):
         idx, vec_size = 14, self.vec_size
@@ -457,7 +471,7 @@ class HopperReward(RewardFn):
         healthy_reward = torch.full_like(ctrl_cost, fill_value=self._healthy_reward)
         if not self._terminate_when_unhealthy:
             healthy_reward = torch.where(
-                self._is_healthy(next_state),
+                self.is_healthy(next_state),
                 healthy_reward,
                 torch.zeros_like(healthy_reward),
             )
@@ -487,4 +501,4 @@ class InvertedPendulumReward(RewardFn):
     # pylint:disable=abstract-method,missing-class-docstring
     def forward(self, state, action, next_state):
         # pylint:disable=no-self-use
-        return torch.ones(next_state.shape[:-1])
+        return torch.ones_like(next_state[..., 0])
@@ -17,10 +17,15 @@ def has_termination_fn(env_id: str) -> bool:
     return _raylab_registry.contains(RAYLAB_TERMINATION, env_id)
 
 
-def get_termination_fn(env_id, env_config=None):
+def get_termination_fn(env_id, env_config=None, script=False):
     """Return the termination funtion for the given environment name and configuration.
 
     Only returns for environments which have been registered with Tune.
+
+    Args:
+        env_id: The environment name
+        env_config: The environment configuration
+        script: Whether to compile the termination function with TorchScript
     """
     assert has_env_creator(env_id), f"{env_id} environment not registered with Tune."
     assert has_termination_fn(
@@ -31,6 +36,8 @@ def get_termination_fn(env_id, env_config=None):
     termination_fn = _raylab_registry.get(RAYLAB_TERMINATION, env_id)(env_config)
     if env_config.get("time_aware", False):
         termination_fn = TimeAwareTerminationFn(termination_fn)
+    if script:
+        termination_fn = torch.jit.script(termination_fn)
     return termination_fn
 
 
@@ -50,6 +57,9 @@ def register(*ids):
 class TerminationFn(nn.Module):
     """
     Module that computes an environment's termination function for batches of inputs.
+
+    Subclasses should be compatible with TorchScript and hold constant tensors
+    as buffers, so that they follow the module's device.
     """
 
     def forward(self, state, action, next_state):  # pylint:disable=arguments-differ
@@ -98,7 +108,7 @@ class NoTermination(TerminationFn):
         super().__init__()
 
     def forward(self, state, action, next_state):
-        return torch.zeros(next_state.shape[:-1]).bool()
+        return torch.zeros_like(next_state[..., 0], dtype=torch.bool)
 
 
 @register(
@@ -129,7 +139,7 @@ class MountainCarContinuousTermination(TerminationFn):
         super().__init__()
         goal_position = 0.45
         goal_velocity = config.get("goal_velocity", 0.0)
-        self.goal = torch.as_tensor([goal_position, goal_velocity])
+        self.register_buffer("goal", torch.as_tensor([goal_position, goal_velocity]))
 
     def forward(self, state, action, next_state):
         return (next_state >= self.goal).all(dim=-1)
@@ -166,7 +176,7 @@ class NavigationTermination(TerminationFn):
 
         super().__init__()
         config = {**DEFAULT_CONFIG, **config}
-        self.end = torch.as_tensor(config["end"]).float()
+        self.register_buffer("end", torch.as_tensor(config["end"]).float())
 
     def forward(self, state, action, next_state):
         hit_goal = ((next_state[..., :2] - self.end).abs() <= 1e-1).all(dim=-1)
@@ -213,7 +223,7 @@ class Walker2DTermination(TerminationFn):
     def forward(self, state, action, next_state):
         if self._terminate_when_unhealthy:
             return ~self._is_healthy(next_state)
-        return torch.zeros(next_state.shape[:-1]).bool()
+        return torch.zeros_like(next_state[..., 0], dtype=torch.bool)
 
 
 @register("Hopper-v3")
@@ -235,7 +245,7 @@ class HopperTermination(TerminationFn):
     def forward(self, state, action, next_state):
         if self._terminate_when_unhealthy:
             return ~self.is_healthy(next_state)
-        return torch.zeros(next_state.shape[:-1]).bool()
+        return torch.zeros_like(next_state[..., 0], dtype=torch.bool)
 
     def is_healthy(self, state):
         # pylint:disable=invalid-name
@@ -15,17 +15,31 @@ from .wrappers import SinglePrecision
 
 
 def has_env_creator(env_id: str) -> bool:
-    "Whether and environment with the given id is in the global registry."
-    return _global_registry.contains(ENV_CREATOR, env_id)
+    """Whether and environment with the given id is in the global registry.
+
+    Environments in Raylab's registry are registered with Tune on first lookup.
+    """
+    return _global_registry.contains(ENV_CREATOR, env_id) or _register_if_known(env_id)
 
 
 def get_env_creator(env_id: str) -> Callable[[dict], gym.Env]:
     """Return the environment creator funtion for the given environment id."""
-    if not _global_registry.contains(ENV_CREATOR, env_id):
+    if not has_env_creator(env_id):
         raise ValueError(f"Environment id {env_id} not registered in Tune")
     return _global_registry.get(ENV_CREATOR, env_id)
 
 
+def _register_if_known(env_id: str) -> bool:
+    # pylint:disable=import-outside-toplevel
+    from ray.tune import register_env
+    from .registry import ENVS
+
+    if env_id not in ENVS:
+        return False
+    register_env(env_id, ENVS[env_id])
+    return True
+
+
 def wrap_if_needed(env_creator):
     """Wraps an env creator function to handle time limit configurations."""
 
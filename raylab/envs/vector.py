@@ -0,0 +1,106 @@
+"""Batched vector environments for domains with torch-defined dynamics."""
+import functools
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import gym
+import numpy as np
+import torch
+from ray.rllib.env.vector_env import VectorEnv
+from torch import Tensor
+
+
+class TorchVectorEnv(VectorEnv):
+    """Steps several copies of an environment as a single batch of tensors.
+
+    The environment must define batch-aware `transition_fn`, `reward_fn`, and
+    `termination_fn` methods, which are applied to all sub-environment states
+    at once. Sub-environments are reset individually by calling the base
+    environment's `reset`, so that the initial state distribution is
+    preserved.
+
+    Args:
+        env: The base environment instance
+        num_envs: Number of sub-environments
+        transition_fn: Optional function mapping (state, action) pairs to
+            (next_state, log_prob) pairs. Defaults to the environment's
+            `transition_fn`
+
+    Attributes:
+        env: The base environment instance
+        state: Tensor of stacked sub-environment states
+        reward_fn: The base environment's reward function
+        termination_fn: The base environment's termination function
+    """
+
+    def __init__(
+        self,
+        env: gym.Env,
+        num_envs: int,
+        transition_fn: Optional[
+            Callable[[Tensor, Tensor], Tuple[Tensor, Tensor]]
+        ] = None,
+    ):
+        super().__init__(env.observation_space, env.action_space, num_envs)
+        self.env = env
+        self.transition_fn = transition_fn or env.transition_fn
+        self.reward_fn = env.reward_fn
+        self.termination_fn = env.termination_fn
+        self.state = torch.zeros((num_envs,) + env.observation_space.shape)
+
+    def vector_reset(self) -> List[np.ndarray]:
+        return [self.reset_at(idx) for idx in range(self.num_envs)]
+
+    def reset_at(self, index: int) -> np.ndarray:
+        obs = np.asarray(self.env.reset(), dtype=np.float32)
+        self.state[index] = torch.from_numpy(obs)
+        return obs
+
+    @torch.no_grad()
+    def vector_step(
+        self, actions: List[np.ndarray]
+    ) -> Tuple[List[np.ndarray], List[float], List[bool], List[dict]]:
+        state = self.state
+        action = torch.as_tensor(np.stack(actions), dtype=torch.float32)
+        next_state, _ = self.transition_fn(state, action)
+        reward = self.reward_fn(state, action, next_state)
+        done = self.termination_fn(state, action, next_state)
+
+        # Copy observations before resets overwrite the state in-place
+        self.state = next_state
+        obs = list(next_state.numpy().copy())
+        return obs, reward.tolist(), done.tolist(), [{} for _ in range(self.num_envs)]
+
+    def get_unwrapped(self) -> List[gym.Env]:
+        return [self.env]
+
+
+def vector_env_maker(env_creator: Callable[[dict], gym.Env], transition_fn: str):
+    """Converts an env creator into a creator of batched vector environments.
+
+    The resulting creator reads the number of sub-environments from the
+    `num_envs` key in the environment config (defaults to 1).
+
+    Args:
+        env_creator: Function mapping configs to base environment instances
+        transition_fn: Name of the base environment's transition function
+    """
+
+    @functools.wraps(env_creator)
+    def wrapped(config: dict) -> TorchVectorEnv:
+        tmp = config.copy()
+        num_envs = tmp.pop("num_envs", 1)
+        for key in ("time_aware", "max_episode_steps"):
+            if tmp.pop(key, None):
+                raise ValueError(
+                    f"Vector environments don't support '{key}'."
+                    " Time limits are defined by the domain's 'horizon' config."
+                )
+        tmp.pop("single_precision", None)
+
+        env = env_creator(tmp)
+        return TorchVectorEnv(env, num_envs, getattr(env, transition_fn))
+
+    return wrapped
@@ -0,0 +1,310 @@
+"""Irrelevant/redundant observation wrappers for vector environments.
+
+Each wrapper computes the added variables for all sub-environments with a
+single NumPy call. Wrappers with a random number generator draw from it in
+the same order as their Gym counterparts, so that a seeded wrapper with a
+single sub-environment reproduces the corresponding Gym wrapper.
+
+Not exported in :mod:`raylab.envs.wrappers` to avoid importing RLlib along
+with the Gym wrappers.
+"""
+from abc import ABCMeta
+from abc import abstractmethod
+from typing import List
+from typing import Optional
+
+import numpy as np
+from gym.spaces import Box
+from ray.rllib.env.vector_env import VectorEnv
+
+from .mixins import IrrelevantRedundantMixin
+from .mixins import RNGMixin
+from .utils import assert_flat_box_space
+from .utils import check_redundant_size_compat
+
+
+class VectorObservationWrapper(VectorEnv, metaclass=ABCMeta):
+    """Base class for wrappers that transform a vector env's observations.
+
+    Args:
+        env: The vector environment to wrap
+
+    Attributes:
+        env: The wrapped vector environment
+    """
+
+    def __init__(self, env: VectorEnv):
+        super().__init__(env.observation_space, env.action_space, env.num_envs)
+        self.env = env
+
+    def vector_reset(self) -> List[np.ndarray]:
+        obs = np.stack(self.env.vector_reset())
+        return list(self.observation(obs))
+
+    def reset_at(self, index: int) -> np.ndarray:
+        return self.observation(self.env.reset_at(index), index)
+
+    def vector_step(self, actions: List[np.ndarray]) -> tuple:
+        obs, rewards, dones, infos = self.env.vector_step(actions)
+        return list(self.observation(np.stack(obs))), rewards, dones, infos
+
+    def get_unwrapped(self) -> list:
+        return self.env.get_unwrapped()
+
+    def seed(self, seed: Optional[int] = None) -> List[int]:
+        """Seed the wrapped vector environment, if possible."""
+        if hasattr(self.env, "seed"):
+            return self.env.seed(seed)
+        return []
+
+    @abstractmethod
+    def observation(
+        self, observation: np.ndarray, index: Optional[int] = None
+    ) -> np.ndarray:
+        """Transform observations from the wrapped environment.
+
+        Args:
+            observation: Batch of observations from all sub-environments if
+                `index` is None, otherwise the observation from sub-environment
+                `index`
+            index: Optional index of the sub-environment
+        """
+
+
+class VectorIrrelevantRedundantMixin(IrrelevantRedundantMixin):
+    """Irrelevant/redundant observation wrapper interface for vector envs."""
+
+    # pylint:disable=arguments-differ,abstract-method
+    def observation(
+        self, observation: np.ndarray, index: Optional[int] = None
+    ) -> np.ndarray:
+        """Concatenate irrelevant/redundant variables to the observations."""
+        irrelevant_or_redundant = self._added_vars(observation, index)
+        observation = np.concatenate([observation, irrelevant_or_redundant], axis=-1)
+        return observation.astype(self.observation_space.dtype)
+
+
+def _rows(index: Optional[int]):
+    return slice(None) if index is None else index
+
+
+class VectorCorrelatedIrrelevant(
+    VectorIrrelevantRedundantMixin, RNGMixin, VectorObservationWrapper
+):
+    """Vector version of :class:`raylab.envs.wrappers.CorrelatedIrrelevant`.
+
+    Args:
+        env: Vector environment
+        size: Number of random reward-irrelevant variables
+    """
+
+    def __init__(self, env: VectorEnv, size: int):
+        assert_flat_box_space(env.observation_space, self)
+        super().__init__(env)
+        self._size = size
+        self._timestep = np.zeros(self.num_envs, dtype=np.int64)
+        self._uvars = np.zeros((self.num_envs, size))
+
+        original = self.observation_space
+        low = np.concatenate([original.low, [0] * self._size])
+        high = np.concatenate([original.high, [1] * self._size])
+        self.observation_space = Box(
+            low=low.astype(original.dtype), high=high.astype(original.dtype)
+        )
+
+        self._set_reward_if_possible()
+        self._set_termination_if_possible()
+
+    @property
+    def added_size(self):
+        return self._size
+
+    def vector_reset(self):
+        self._uvars = self.np_random.uniform(size=self._uvars.shape)
+        self._timestep[:] = 0
+        return super().vector_reset()
+
+    def reset_at(self, index):
+        self._uvars[index] = self.np_random.uniform(size=self._size)
+        self._timestep[index] = 0
+        return super().reset_at(index)
+
+    def vector_step(self, actions):
+        self._timestep += 1
+        return super().vector_step(actions)
+
+    def _added_vars(self, _, index=None) -> np.ndarray:
+        rows = _rows(index)
+        return self._uvars[rows] ** np.expand_dims(self._timestep[rows], -1)
+
+
+class VectorGaussianRandomWalks(
+    VectorIrrelevantRedundantMixin, RNGMixin, VectorObservationWrapper
+):
+    """Vector version of :class:`raylab.envs.wrappers.GaussianRandomWalks`.
+
+    Args:
+        env: Vector environment
+        size: The number of random walks to append to the observation
+        loc: Mean of the Gaussian distribution
+        scale: Stddev of the Gaussian distribution
+    """
+
+    def __init__(self, env: VectorEnv, size: int, loc: float = 0.0, scale: float = 1.0):
+        assert_flat_box_space(env.observation_space, self)
+        super().__init__(env)
+        self._size = size
+        self._loc = loc
+        self._scale = scale
+        self._random_walk = np.zeros((self.num_envs, size))
+
+        original = self.env.observation_space
+        low = np.concatenate([original.low, [-np.inf] * size])
+        high = np.concatenate([original.high, [np.inf] * size])
+        self.observation_space = Box(low=low, high=high, dtype=original.dtype)
+
+        self._set_reward_if_possible()
+        self._set_termination_if_possible()
+
+    @property
+    def added_size(self):
+        return self._size
+
+    def vector_reset(self):
+        self._random_walk = self._normal(self._random_walk.shape)
+        return super().vector_reset()
+
+    def reset_at(self, index):
+        self._random_walk[index] = self._normal(self._size)
+        return super().reset_at(index)
+
+    def _added_vars(self, _, index=None) -> np.ndarray:
+        rows = _rows(index)
+        self._random_walk[rows] += self._normal(self._random_walk[rows].shape)
+        return self._random_walk[rows]
+
+    def _normal(self, size) -> np.ndarray:
+        return self.np_random.normal(loc=self._loc, scale=self._scale, size=size)
+
+
+class VectorLinearRedundant(
+    VectorIrrelevantRedundantMixin, RNGMixin, VectorObservationWrapper
+):
+    """Vector version of :class:`raylab.envs.wrappers.LinearRedundant`.
+
+    Samples a separate weight matrix for each sub-environment upon its reset.
+
+    Args:
+        env: Vector environment
+        size: Number of left-most features from the observation to use in
+            computing redundant variables. Defaults to the observation size
+    """
+
+    def __init__(self, env: VectorEnv, size: Optional[int] = None):
+        assert_flat_box_space(env.observation_space, self)
+        super().__init__(env)
+        original = self.env.observation_space
+        self._size = size = size or original.shape[0]
+        check_redundant_size_compat(size, original)
+
+        self._wmat = np.zeros((self.num_envs, size, size))
+
+        low = np.concatenate([original.low, [-np.inf] * size]).astype(original.dtype)
+        high = np.concatenate([original.high, [np.inf] * size]).astype(original.dtype)
+        self.observation_space = Box(low=low, high=high)
+
+        self._set_reward_if_possible()
+        self._set_termination_if_possible()
+
+    @property
+    def added_size(self):
+        return self.env.observation_space.shape[0]
+
+    def vector_reset(self):
+        self._wmat = self.np_random.uniform(low=0.0, high=1.0, size=self._wmat.shape)
+        return super().vector_reset()
+
+    def reset_at(self, index):
+        size = self._size
+        self._wmat[index] = self.np_random.uniform(low=0.0, high=1.0, size=(size, size))
+        return super().reset_at(index)
+
+    def _added_vars(self, observation, index=None) -> np.ndarray:
+        features = observation[..., : self._size, np.newaxis]
+        return np.matmul(self._wmat[_rows(index)], features)[..., 0]
+
+
+class VectorNonlinearRedundant(
+    VectorIrrelevantRedundantMixin, VectorObservationWrapper
+):
+    """Vector version of :class:`raylab.envs.wrappers.NonlinearRedundant`.
+
+    Args:
+        env: Vector environment
+        size: Number of left-most features from the observation to use in
+            computing redundant variables. Defaults to the observation size
+    """
+
+    def __init__(self, env: VectorEnv, size: Optional[int] = None):
+        assert_flat_box_space(env.observation_space, self)
+        super().__init__(env)
+        original = self.env.observation_space
+        self._size = size = size or original.shape[0]
+        check_redundant_size_compat(size, original)
+
+        low = np.concatenate([original.low, [-1] * 2 * size]).astype(original.dtype)
+        high = np.concatenate([original.high, [1] * 2 * size]).astype(original.dtype)
+        self.observation_space = Box(low=low, high=high)
+
+        self._set_reward_if_possible()
+        self._set_termination_if_possible()
+
+    @property
+    def added_size(self):
+        return 2 * self.env.observation_space.shape[0]
+
+    def _added_vars(self, observation, index=None) -> np.ndarray:
+        features = observation[..., : self._size]
+        return np.concatenate([np.cos(features), np.sin(features)], axis=-1)
+
+    @staticmethod
+    def wrap_env_function(func: callable, size: int) -> callable:
+        return IrrelevantRedundantMixin.wrap_env_function(func, size * 2)
+
+
+class VectorRandomIrrelevant(
+    VectorIrrelevantRedundantMixin, RNGMixin, VectorObservationWrapper
+):
+    """Vector version of :class:`raylab.envs.wrappers.RandomIrrelevant`.
+
+    Args:
+        env: Vector environment
+        size: Number of random reward-irrelevant variables
+        loc: Normal mean
+        scale: Normal standard deviation
+    """
+
+    def __init__(self, env: VectorEnv, size: int, loc: float = 0.0, scale: float = 1.0):
+        assert_flat_box_space(env.observation_space, self)
+        super().__init__(env)
+        self._size = size
+        self._loc = loc
+        self._scale = scale
+
+        original = self.observation_space
+        low = np.concatenate([original.low, [-np.inf] * self._size])
+        high = np.concatenate([original.high, [np.inf] * self._size])
+        self.observation_space = Box(
+            low=low.astype(original.dtype), high=high.astype(original.dtype)
+        )
+
+        self._set_reward_if_possible()
+        self._set_termination_if_possible()
+
+    @property
+    def added_size(self):
+        return self._size
+
+    def _added_vars(self, observation, index=None) -> np.ndarray:
+        size = observation.shape[:-1] + (self._size,)
+        return self.np_random.normal(loc=self._loc, scale=self._scale, size=size)
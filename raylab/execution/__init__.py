@@ -1,2 +1,7 @@
 """Customizes execution plan components."""
+from .learner_thread import ReplayLearnerThread
+from .learner_thread import StoreToLearnerThread
+from .replay_ratio import StoreToPolicyReplay
+from .replay_ratio import TrainAtReplayRatio
+from .replay_ratio import UpdateWorkerWeights
 from .warmup import LearningStarts
@@ -0,0 +1,248 @@
+# pylint:disable=missing-module-docstring
+import threading
+from typing import Optional
+
+from ray.rllib import Policy
+from ray.rllib.evaluation.metrics import get_learner_stats
+from ray.rllib.evaluation.worker_set import WorkerSet
+from ray.rllib.execution.common import _get_global_vars
+from ray.rllib.execution.common import _get_shared_metrics
+from ray.rllib.execution.common import LEARN_ON_BATCH_TIMER
+from ray.rllib.execution.common import LEARNER_INFO
+from ray.rllib.execution.common import STEPS_SAMPLED_COUNTER
+from ray.rllib.execution.common import STEPS_TRAINED_COUNTER
+from ray.rllib.execution.common import WORKER_UPDATE_TIMER
+from ray.rllib.utils.types import SampleBatchType
+
+from raylab.utils.timer import TimerStat
+
+
+class ReplayLearnerThread(threading.Thread):
+    """Background thread that trains a policy on its own replay buffer.
+
+    The learner runs `learn_on_replay` on its policy whenever it is owed
+    gradient steps according to the target replay ratio. Samples are added to
+    the learner's replay buffer from another thread via :meth:`add_samples`,
+    which blocks while the learner lags behind by more than `max_lag` calls to
+    `learn_on_replay`.
+
+    Other threads must hold `policy_lock` while reading or writing the
+    learner's weights, so that they never see or overwrite parameters in the
+    middle of an update.
+
+    Args:
+        policy: The learner policy. Must implement `add_to_buffer` and
+            `learn_on_replay`
+        replay_ratio: Target number of gradient steps per sampled timestep
+        learning_starts: Hold this number of sampled timesteps before the first
+            training operation
+        max_lag: Maximum number of owed calls to `learn_on_replay` before
+            sampling is blocked
+    """
+
+    def __init__(
+        self,
+        policy: Policy,
+        replay_ratio: float,
+        learning_starts: int,
+        max_lag: float,
+    ):
+        super().__init__(daemon=True)
+        self.policy = policy
+        self.replay_ratio = replay_ratio
+        self.learning_starts = learning_starts
+        self.max_lag = max_lag
+        self.sampled = 0
+        self.learn_calls = 0
+        self.stats = {}
+        self.learn_timer = TimerStat()
+        self.stopped = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+        self.policy_lock = threading.Lock()
+
+    @property
+    def owed_calls(self) -> float:
+        """Number of calls to `learn_on_replay` the learner is lagging behind."""
+        steps_per_call = self.policy.config["improvement_steps"]
+        sampled = max(0, self.sampled - self.learning_starts)
+        return sampled * self.replay_ratio / steps_per_call - self.learn_calls
+
+    def run(self):
+        try:
+            while not self.stopped:
+                self.step()
+        except BaseException as err:  # pylint:disable=broad-except
+            self._error = err
+        finally:
+            with self._cond:
+                self.stopped = True
+                self._cond.notify_all()
+
+    def step(self):
+        """Wait until the learner is owed gradient steps and train the policy."""
+        with self._cond:
+            while not self.stopped and self.owed_calls < 1:
+                self._cond.wait()
+        if self.stopped:
+            return
+
+        with self.policy_lock, self.learn_timer:
+            info = self.policy.learn_on_replay()
+        self.stats = get_learner_stats(info)
+
+        with self._cond:
+            self.learn_calls += 1
+            self._cond.notify_all()
+
+    def add_samples(self, batch: SampleBatchType):
+        """Add samples to the learner's replay buffer.
+
+        Blocks while the learner lags behind the target replay ratio by more
+        than `max_lag` calls to `learn_on_replay`.
+
+        Raises:
+            RuntimeError: If the learner thread stopped due to an error
+        """
+        self.policy.add_to_buffer(batch)
+        with self._cond:
+            self.sampled += batch.count
+            self._cond.notify_all()
+            while not self.stopped and self.owed_calls > self.max_lag:
+                self._cond.wait()
+        self.raise_if_failed()
+
+    def raise_if_failed(self):
+        """Re-raise any error that stopped the learner thread."""
+        if self._error is not None:
+            raise RuntimeError("Learner thread failed") from self._error
+
+    def stop(self):
+        """Signal the learner thread to finish after its current step."""
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+
+
+class StoreToLearnerThread:
+    """Callable used to feed local samples to a background learner thread.
+
+    Creates a learner copy of the local worker's policy and starts a
+    :class:`ReplayLearnerThread` on the first call. The local policy is then
+    only used for sampling, and receives the learner's weights once it has
+    sampled at least `sync_interval` timesteps since its last update.
+
+    This should be used with the .for_each() operator on an iterator of sample
+    batches collected by the local worker.
+
+    Args:
+        workers: The worker set. Sampling happens in the local worker
+        replay_ratio: Target number of gradient steps per sampled timestep
+        learning_starts: Hold this number of sampled timesteps before the first
+            training operation
+        sync_interval: Minimum number of timesteps sampled between consecutive
+            weight updates of the sampling policy
+        max_lag: Maximum number of owed calls to `learn_on_replay` before
+            sampling is blocked
+    """
+
+    # pylint:disable=too-few-public-methods,too-many-arguments
+    def __init__(
+        self,
+        workers: WorkerSet,
+        replay_ratio: float,
+        learning_starts: int,
+        sync_interval: int,
+        max_lag: float,
+    ):
+        self.workers = workers
+        self.replay_ratio = replay_ratio
+        self.learning_starts = learning_starts
+        self.sync_interval = sync_interval
+        self.max_lag = max_lag
+        self.learner_thread: Optional[ReplayLearnerThread] = None
+        self.steps_since_update = 0
+
+    def __call__(self, batch: SampleBatchType) -> SampleBatchType:
+        if self.learner_thread is None:
+            self.learner_thread = self.start_learner_thread()
+
+        metrics = _get_shared_metrics()
+        learner_thread = self.learner_thread
+        learner_thread.policy.global_timestep = metrics.counters[STEPS_SAMPLED_COUNTER]
+        learner_thread.add_samples(batch)
+
+        self.steps_since_update += batch.count
+        if self.steps_since_update >= self.sync_interval:
+            with metrics.timers[WORKER_UPDATE_TIMER]:
+                self.sync_weights()
+            self.steps_since_update = 0
+            metrics.counters["num_weight_syncs"] += 1
+
+        steps_per_call = learner_thread.policy.config["improvement_steps"]
+        batch_size = learner_thread.policy.config["batch_size"]
+        metrics.counters[STEPS_TRAINED_COUNTER] = (
+            learner_thread.learn_calls * steps_per_call * batch_size
+        )
+        metrics.counters["num_gradient_steps"] = (
+            learner_thread.learn_calls * steps_per_call
+        )
+        metrics.info[LEARNER_INFO] = learner_thread.stats
+        metrics.timers[LEARN_ON_BATCH_TIMER] = learner_thread.learn_timer
+        self.workers.local_worker().set_global_vars(_get_global_vars())
+        return batch
+
+    def start_learner_thread(self) -> ReplayLearnerThread:
+        """Create the learner policy and start training it in the background."""
+        worker = self.workers.local_worker()
+        actor = worker.get_policy()
+        for method in ("add_to_buffer", "learn_on_replay"):
+            if not hasattr(actor, method):
+                raise ValueError(
+                    f"{type(actor).__name__} has no '{method}' method."
+                    " Policies must manage and learn from their own replay buffer"
+                    " to use a learner thread."
+                )
+
+        learner = type(actor)(
+            actor.observation_space, actor.action_space, worker.policy_config
+        )
+        if learner.config.get("compile", False):
+            learner.compile()
+        learner.set_weights(actor.get_weights())
+
+        learner_thread = ReplayLearnerThread(
+            learner,
+            replay_ratio=self.replay_ratio,
+            learning_starts=self.learning_starts,
+            max_lag=self.max_lag,
+        )
+        learner_thread.start()
+        return learner_thread
+
+    def sync_weights(self):
+        """Copy the learner's current weights to the sampling policy."""
+        if self.learner_thread is None:
+            return
+        actor = self.workers.local_worker().get_policy()
+        learner_thread = self.learner_thread
+        # Weights may share memory with the learner's parameters, so copy them
+        # into the sampling policy before releasing the lock
+        with learner_thread.policy_lock:
+            actor.set_weights(learner_thread.policy.get_weights())
+
+    def restore_learner(self):
+        """Copy the sampling policy's weights to the learner.
+
+        Should be called after restoring the local worker from a checkpoint.
+        """
+        if self.learner_thread is not None:
+            actor = self.workers.local_worker().get_policy()
+            learner_thread = self.learner_thread
+            with learner_thread.policy_lock:
+                learner_thread.policy.set_weights(actor.get_weights())
+
+    def stop(self):
+        """Stop the learner thread, if running."""
+        if self.learner_thread is not None:
+            self.learner_thread.stop()
@@ -0,0 +1,136 @@
+# pylint:disable=missing-module-docstring
+from collections import defaultdict
+from typing import Any
+from typing import Optional
+from typing import Tuple
+
+import ray
+from ray.rllib.evaluation.metrics import get_learner_stats
+from ray.rllib.evaluation.worker_set import WorkerSet
+from ray.rllib.execution.common import _get_global_vars
+from ray.rllib.execution.common import _get_shared_metrics
+from ray.rllib.execution.common import LEARN_ON_BATCH_TIMER
+from ray.rllib.execution.common import LEARNER_INFO
+from ray.rllib.execution.common import STEPS_SAMPLED_COUNTER
+from ray.rllib.execution.common import STEPS_TRAINED_COUNTER
+from ray.rllib.execution.common import WORKER_UPDATE_TIMER
+from ray.rllib.utils.types import SampleBatchType
+
+ActorBatch = Tuple[Any, SampleBatchType]
+
+
+class StoreToPolicyReplay:
+    """Callable used to add sample batches to the local policy's replay buffer.
+
+    This should be used with the .for_each() operator on an iterator of
+    (actor, batch) pairs. The local policy must implement `add_to_buffer`.
+
+    Examples:
+        >>> rollouts = ParallelRollouts(workers, mode="async")
+        >>> store_op = rollouts.zip_with_source_actor().for_each(
+        ...     StoreToPolicyReplay(workers))
+    """
+
+    # pylint:disable=too-few-public-methods
+    def __init__(self, workers: WorkerSet):
+        self.policy = workers.local_worker().get_policy()
+        if not hasattr(self.policy, "add_to_buffer"):
+            raise ValueError(
+                f"{type(self.policy).__name__} has no 'add_to_buffer' method."
+                " Policies must manage their own replay buffer to use remote workers."
+            )
+
+    def __call__(self, item: ActorBatch) -> ActorBatch:
+        _, batch = item
+        self.policy.add_to_buffer(batch)
+        return item
+
+
+class TrainAtReplayRatio:
+    """Callable used to train the local policy at a target replay ratio.
+
+    Calls `learn_on_replay` on the local policy as many times as needed to keep
+    the number of gradient steps per sampled timestep close to `replay_ratio`.
+    Fractional credit is carried over between calls, so that the target ratio
+    is met on average regardless of the size of incoming batches.
+
+    This should be used with the .for_each() operator on an iterator of
+    (actor, batch) pairs, after the batches have been stored in the policy's
+    replay buffer.
+
+    Args:
+        workers: The worker set. Training happens in the local worker
+        replay_ratio: Target number of gradient steps per sampled timestep
+        learning_starts: Hold this number of sampled timesteps before the first
+            training operation
+    """
+
+    # pylint:disable=too-few-public-methods
+    def __init__(self, workers: WorkerSet, replay_ratio: float, learning_starts: int):
+        self.workers = workers
+        self.policy = workers.local_worker().get_policy()
+        self.replay_ratio = replay_ratio
+        self.learning_starts = learning_starts
+        self.credit = 0.0
+
+    def __call__(self, item: ActorBatch) -> ActorBatch:
+        _, batch = item
+        metrics = _get_shared_metrics()
+        # Only timesteps sampled after learning starts count towards the ratio
+        sampled = metrics.counters[STEPS_SAMPLED_COUNTER] - self.learning_starts
+        steps_per_call = self.policy.config["improvement_steps"]
+        new_steps = max(0, min(batch.count, sampled))
+        self.credit += new_steps * self.replay_ratio / steps_per_call
+
+        while self.credit >= 1:
+            with metrics.timers[LEARN_ON_BATCH_TIMER]:
+                learner_info = self.policy.learn_on_replay()
+            metrics.info[LEARNER_INFO] = get_learner_stats(learner_info)
+            metrics.counters[STEPS_TRAINED_COUNTER] += (
+                steps_per_call * self.policy.config["batch_size"]
+            )
+            metrics.counters["num_gradient_steps"] += steps_per_call
+            self.credit -= 1
+
+        self.workers.local_worker().set_global_vars(_get_global_vars())
+        return item
+
+
+class UpdateWorkerWeights:
+    """Callable used to broadcast the learner's weights to remote workers.
+
+    Weights are sent to a worker once it has sampled at least `sync_interval`
+    timesteps since its last update. Weights are only serialized again if the
+    learner has been trained in the meantime.
+
+    This should be used with the .for_each() operator on an iterator of
+    (actor, batch) pairs.
+
+    Args:
+        workers: The worker set
+        sync_interval: Minimum number of timesteps sampled by a remote worker
+            between consecutive weight updates
+    """
+
+    # pylint:disable=too-few-public-methods
+    def __init__(self, workers: WorkerSet, sync_interval: int):
+        self.workers = workers
+        self.sync_interval = sync_interval
+        self.steps_since_update = defaultdict(int)
+        self.weights = None
+        self.weights_trained_steps: Optional[int] = None
+
+    def __call__(self, item: ActorBatch) -> ActorBatch:
+        actor, batch = item
+        metrics = _get_shared_metrics()
+        self.steps_since_update[actor] += batch.count
+        if self.steps_since_update[actor] >= self.sync_interval:
+            with metrics.timers[WORKER_UPDATE_TIMER]:
+                trained_steps = metrics.counters[STEPS_TRAINED_COUNTER]
+                if self.weights is None or self.weights_trained_steps != trained_steps:
+                    self.weights = ray.put(self.workers.local_worker().get_weights())
+                    self.weights_trained_steps = trained_steps
+                actor.set_weights.remote(self.weights, _get_global_vars())
+            self.steps_since_update[actor] = 0
+            metrics.counters["num_weight_syncs"] += 1
+        return item
@@ -4,6 +4,7 @@ from abc import abstractmethod
 
 import torch.nn as nn
 from ray.rllib.models.action_dist import ActionDistribution
+from torch import Tensor
 
 from .modules.actor import DeterministicPolicy
 from .modules.actor import StochasticPolicy
@@ -54,6 +55,27 @@ class BaseActionDist(ActionDistribution, metaclass=ABCMeta):
     def _check_model_compat(cls, model: nn.Module):
         pass
 
+    @classmethod
+    def fast_action(cls, model: nn.Module, obs: Tensor, explore: bool) -> Tensor:
+        """Compute actions by calling the model's actor directly.
+
+        Skips creating a distribution instance. Used for low-latency inference.
+        Subclasses should override this method. By default, falls back to the
+        distribution's `sample` or `deterministic_sample` methods.
+
+        Args:
+            model: NN module compatible with the distribution
+            obs: Batch of observation tensors
+            explore: Whether to sample actions from the exploration policy
+                instead of computing deterministic actions
+
+        Returns:
+            A batch of action tensors
+        """
+        dist = cls({"obs": obs}, model)
+        action, _ = dist.sample() if explore else dist.deterministic_sample()
+        return action
+
 
 class WrapStochasticPolicy(BaseActionDist):
     """Wraps an nn.Module with a stochastic actor and its inputs.
@@ -85,6 +107,14 @@ class WrapStochasticPolicy(BaseActionDist):
     def entropy(self):
         return self.model.actor.entropy(**self.inputs)
 
+    @classmethod
+    def fast_action(cls, model: nn.Module, obs: Tensor, explore: bool) -> Tensor:
+        if explore:
+            action, _ = model.actor.sample(obs)
+        else:
+            action, _ = model.actor.deterministic(obs)
+        return action
+
     @classmethod
     def _check_model_compat(cls, model):
         assert hasattr(model, "actor"), f"NN model {type(model)} has no actor attribute"
@@ -116,6 +146,10 @@ class WrapDeterministicPolicy(BaseActionDist):
     def logp(self, x):
         return None
 
+    @classmethod
+    def fast_action(cls, model: nn.Module, obs: Tensor, explore: bool) -> Tensor:
+        return model.behavior(obs) if explore else model.actor(obs)
+
     @classmethod
     def _check_model_compat(cls, model: nn.Module):
         assert hasattr(model, "actor"), f"NN model {type(model)} has no actor attribute"
@@ -0,0 +1,125 @@
+"""Standalone TorchScript policies for deployment."""
+from typing import Optional
+
+import torch
+import torch.nn as nn
+from torch import Tensor
+
+
+class _DeterministicPolicyAction(nn.Module):
+    def __init__(self, policy: nn.Module):
+        super().__init__()
+        self.policy = policy
+
+    def forward(self, obs: Tensor) -> Tensor:  # pylint:disable=arguments-differ
+        return self.policy(obs)
+
+
+class _StochasticPolicyAction(nn.Module):
+    def __init__(self, policy: nn.Module):
+        super().__init__()
+        self.policy = policy
+
+    def forward(self, obs: Tensor) -> Tensor:  # pylint:disable=arguments-differ
+        action, _ = self.policy.deterministic(obs)
+        return action
+
+
+class ExportedPolicy(nn.Module):
+    """Self-contained actor with observation preprocessing.
+
+    Maps raw environment observations to deterministic actions, applying the
+    same preprocessing the actor saw during training.
+
+    Args:
+        actor: The policy's deterministic or stochastic actor, possibly
+            compiled with TorchScript
+        obs_mean: Optional observation mean for standardization
+        obs_std: Optional observation standard deviation for standardization
+        max_episode_steps: If not None, appends the relative timestep to
+            observations, as done by time-aware environments
+
+    Attributes:
+        time_aware: Whether the forward pass expects the current timestep
+        standardize: Whether observations are standardized
+    """
+
+    # pylint:disable=arguments-differ
+    time_aware: bool
+    standardize: bool
+
+    def __init__(
+        self,
+        actor: nn.Module,
+        obs_mean: Optional[Tensor] = None,
+        obs_std: Optional[Tensor] = None,
+        max_episode_steps: Optional[int] = None,
+    ):
+        super().__init__()
+        # Stochastic policies export a `deterministic` method, even if scripted
+        if hasattr(actor, "deterministic"):
+            self.action = _StochasticPolicyAction(actor)
+        else:
+            self.action = _DeterministicPolicyAction(actor)
+
+        self.standardize = obs_mean is not None and obs_std is not None
+        self.register_buffer(
+            "obs_mean", obs_mean if self.standardize else torch.zeros(())
+        )
+        self.register_buffer("obs_std", obs_std if self.standardize else torch.ones(()))
+
+        self.time_aware = max_episode_steps is not None
+        self.max_episode_steps = max_episode_steps or 1
+
+    def forward(self, obs: Tensor, timestep: Optional[Tensor] = None) -> Tensor:
+        """Compute deterministic actions for a batch of observations.
+
+        Args:
+            obs: Batch of raw environment observations
+            timestep: Batch of elapsed episode steps. Required if the policy
+                is time-aware, ignored otherwise
+
+        Returns:
+            Batch of actions
+        """
+        if self.time_aware:
+            if timestep is None:
+                raise ValueError("Time-aware policies require the current timestep")
+            relative_time = timestep.to(obs.dtype) / self.max_episode_steps
+            obs = torch.cat([obs, relative_time.unsqueeze(-1)], dim=-1)
+        if self.standardize:
+            obs = (obs - self.obs_mean) / (self.obs_std + 1e-7)
+        return self.action(obs)
+
+
+def export_policy(policy, path: str):
+    """Save a policy's actor and preprocessing as a TorchScript artifact.
+
+    The artifact can be loaded with `torch.jit.load` without RLlib or raylab
+    (use `map_location` to load policies trained on GPU into the CPU).
+    Calling it maps a batch of raw observations (and elapsed episode steps, for
+    time-aware environments) to a batch of deterministic actions.
+
+    Args:
+        policy: A TorchPolicy whose module has an `actor` attribute
+        path: File path to save the artifact to
+    """
+    obs_mean = obs_std = None
+    replay = getattr(policy, "replay", None)
+    if policy.config.get("std_obs", False) and replay is not None:
+        stats = replay.obs_stats
+        if stats is not None:
+            obs_mean, obs_std = (torch.as_tensor(s, dtype=torch.float32) for s in stats)
+
+    env_config = policy.config["env_config"]
+    max_episode_steps = None
+    if env_config.get("time_aware", False):
+        max_episode_steps = env_config["max_episode_steps"]
+
+    exported = ExportedPolicy(
+        policy.module.actor,
+        obs_mean=obs_mean,
+        obs_std=obs_std,
+        max_episode_steps=max_episode_steps,
+    )
+    torch.jit.save(torch.jit.script(exported.to(policy.device)), path)
@@ -13,6 +13,7 @@ from raylab.policy.modules.critic import QValueEnsemble
 from raylab.policy.modules.critic import VValue
 from raylab.policy.modules.model import SME
 from raylab.policy.modules.model import StochasticModel
+from raylab.torch.utils import tree_stack
 from raylab.utils.types import StatDict
 from raylab.utils.types import TensorDict
 
@@ -54,6 +55,10 @@ class DynaQLearning(UniformModelPriorMixin, EnvFunctionsMixin, Loss):
         target_critic: Target state-value function
         batch_keys: Keys required to be in the tensor batch
         gamma: discount factor
+        full_ensemble: whether to sample next states from every model in the
+            ensemble, evaluating all models in a single ensemble call, instead
+            of from a single model chosen uniformly at random. Targets are
+            averaged over models and samples.
     """
 
     critics: QValueEnsemble
@@ -62,6 +67,7 @@ class DynaQLearning(UniformModelPriorMixin, EnvFunctionsMixin, Loss):
     target_critic: VValue
 
     gamma: float = 0.99
+    full_ensemble: bool = False
     batch_keys: Tuple[str] = (SampleBatch.CUR_OBS,)
     _model_samples: int = 1
 
@@ -92,7 +98,7 @@ class DynaQLearning(UniformModelPriorMixin, EnvFunctionsMixin, Loss):
 
     @property
     def model_samples(self) -> int:
-        """Number of next states to sample from model."""
+        """Number of next states to sample from each model."""
         return self._model_samples
 
     @model_samples.setter
@@ -109,9 +115,10 @@ class DynaQLearning(UniformModelPriorMixin, EnvFunctionsMixin, Loss):
 
         with torch.no_grad():
             action = self.get_action(obs)
-            model, _ = self.sample_model()
-            dist_params = model(obs, action)
-            next_obs, _ = model.sample(dist_params, sample_shape=(self.model_samples,))
+            if self.full_ensemble:
+                next_obs, dist_params = self.ensemble_transition(obs, action)
+            else:
+                next_obs, dist_params = self.transition(obs, action)
 
             reward = self._env.reward(obs, action, next_obs).mean(dim=0)
             next_values = self.target_critic(next_obs)
@@ -127,3 +134,39 @@ class DynaQLearning(UniformModelPriorMixin, EnvFunctionsMixin, Loss):
         stats.update(QLearningMixin.q_value_info(values))
         stats.update(dist_params_stats(dist_params, name="model"))
         return loss, stats
+
+    def transition(self, obs: Tensor, action: Tensor) -> Tuple[Tensor, TensorDict]:
+        """Samples next states from a model chosen uniformly at random.
+
+        Returns:
+            Next state samples of shape `(S,) + (*,) + O`, where `S` is the
+            number of model samples, and the model's distribution parameters
+        """
+        model, _ = self.sample_model()
+        dist_params = model(obs, action)
+        next_obs, _ = model.sample(dist_params, sample_shape=(self.model_samples,))
+        return next_obs, dist_params
+
+    def ensemble_transition(
+        self, obs: Tensor, action: Tensor
+    ) -> Tuple[Tensor, TensorDict]:
+        """Samples next states from every model in the ensemble.
+
+        Computes the distribution parameters of all models with a single
+        ensemble call, so that forked or vectorized ensembles evaluate them
+        at once. Draws all samples of a model from its parameters expanded
+        along a new leading dimension.
+
+        Returns:
+            Next state samples of shape `(N * S,) + (*,) + O`, where `N` is the
+            ensemble size and `S` is the number of model samples, and the
+            distribution parameters of all models stacked along a new leading
+            dimension
+        """
+        size, samples = len(self.models), self.model_samples
+        params = self.models([obs] * size, [action] * size)
+        expanded = [
+            {k: v.expand((samples,) + v.shape) for k, v in p.items()} for p in params
+        ]
+        next_obs = torch.cat([s for s, _ in self.models.sample(expanded)], dim=0)
+        return next_obs, tree_stack(params)
@@ -32,11 +32,16 @@ class MAGE(EnvFunctionsMixin, UniformModelPriorMixin, Loss):
     Attributes:
         gamma: discount factor
         lambd: weighting factor for TD-error regularization
+        split_gradient: whether to differentiate the TD target and the
+            Q-values w.r.t. the action separately, only keeping the graph of
+            the latter for backpropagation. Only used if the target critic
+            shares no parameters with the critics.
     """
 
     batch_keys = (SampleBatch.CUR_OBS,)
     gamma: float = 0.99
     lambd: float = 0.05
+    split_gradient: bool = True
 
     def __init__(
         self,
@@ -52,6 +57,9 @@ class MAGE(EnvFunctionsMixin, UniformModelPriorMixin, Loss):
         if isinstance(models, StochasticModel):
             models = SME([models])
         self.models = models
+        self._separable_target = set(target_critic.parameters()).isdisjoint(
+            critics.parameters()
+        )
 
     def __call__(self, batch: TensorDict) -> Tuple[Tensor, StatDict]:
         self.check_env_fns()
@@ -60,8 +68,14 @@ class MAGE(EnvFunctionsMixin, UniformModelPriorMixin, Loss):
         action = self.policy(obs)
         next_obs, dist_params = self.transition(obs, action)
 
-        delta = self.temporal_diff_error(obs, action, next_obs)
-        grad_loss = self.gradient_loss(delta, action)
+        if self.split_gradient and self._separable_target:
+            delta, action_gradient = self.temporal_diff_error_and_gradient(
+                obs, action, next_obs
+            )
+            grad_loss = torch.sum(action_gradient ** 2, dim=-1).mean()
+        else:
+            delta = self.temporal_diff_error(obs, action, next_obs)
+            grad_loss = self.gradient_loss(delta, action)
         td_reg = self.temporal_diff_loss(delta)
         loss = grad_loss + self.lambd * td_reg
 
@@ -87,13 +101,55 @@ class MAGE(EnvFunctionsMixin, UniformModelPriorMixin, Loss):
         next_obs: Tensor,
     ) -> Tensor:
         """Returns the temporal difference error."""
+        target = self.temporal_diff_target(obs, action, next_obs)  # (*,)
+        values = self.critics(obs, action)  # [(*,)] * N
+        return torch.stack([target - v for v in values], dim=-1)  # (*, N)
+
+    def temporal_diff_target(
+        self,
+        obs: Tensor,
+        action: Tensor,
+        next_obs: Tensor,
+    ) -> Tensor:
+        """Returns the one-step bootstrapped target for the Q-values."""
         reward = self._env.reward(obs, action, next_obs)  # (*,)
         done = self._env.termination(obs, action, next_obs)  # (*,)
         next_val = self.target_critic(next_obs)  # (*,)
-        target = torch.where(done, reward, reward + self.gamma * next_val)  # (*,)
+        return torch.where(done, reward, reward + self.gamma * next_val)  # (*,)
 
-        values = self.critics(obs, action)  # [(*,)] * N
-        return torch.stack([target - v for v in values], dim=-1)  # (*, N)
+    def temporal_diff_error_and_gradient(
+        self,
+        obs: Tensor,
+        action: Tensor,
+        next_obs: Tensor,
+    ) -> Tuple[Tensor, Tensor]:
+        """Returns the TD error and its action gradient summed over critics.
+
+        The action gradient of the target does not depend on the critics'
+        parameters, so it is computed with a single first-order backward pass
+        that frees the graph through the model, environment functions and
+        target critic. Only the Q-values' action gradients keep their graph
+        for double backpropagation. Both terms reuse the forward pass of the
+        TD error.
+
+        Note:
+            Unlike `temporal_diff_error`, the returned error and gradient only
+            propagate gradients to the critics' parameters.
+
+        Returns:
+            The TD error of each critic, with shape (*, N), and the action
+            gradient of its sum over critics, with the same shape as `action`
+        """
+        target = self.temporal_diff_target(obs, action, next_obs)  # (*,)
+        (target_grad,) = torch.autograd.grad(target.sum(), action, allow_unused=True)
+        if target_grad is None:
+            target_grad = torch.zeros_like(action)
+
+        values = torch.stack(self.critics(obs, action), dim=-1)  # (*, N)
+        (values_grad,) = torch.autograd.grad(values.sum(), action, create_graph=True)
+
+        delta = target.detach().unsqueeze(-1) - values  # (*, N)
+        return delta, values.size(-1) * target_grad - values_grad
 
     @staticmethod
     def gradient_loss(delta: Tensor, action: Tensor) -> Tensor:
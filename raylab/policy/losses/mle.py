@@ -13,6 +13,8 @@ from torch.jit import wait
 from raylab.policy.modules.model import ForkedSME
 from raylab.policy.modules.model import SME
 from raylab.policy.modules.model import StochasticModel
+from raylab.policy.modules.model import VectorizedSME
+from raylab.torch.utils import vmap_module_call
 from raylab.utils.dictionaries import get_keys
 from raylab.utils.types import StatDict
 from raylab.utils.types import TensorDict
@@ -83,6 +85,18 @@ class ForkedLosses(Losses):
         return [wait(f) for f in futures]
 
 
+class VectorizedLosses(Losses):
+    # pylint:disable=abstract-method,missing-class-docstring
+    def forward(self, obs: Tensor, act: Tensor, new_obs: Tensor) -> List[Tensor]:
+        if torch.jit.is_scripting():
+            return [loss(obs, act, new_obs) for loss in self]
+        return self._vmap_losses(obs, act, new_obs)
+
+    @torch.jit.ignore
+    def _vmap_losses(self, obs: Tensor, act: Tensor, new_obs: Tensor) -> List[Tensor]:
+        return vmap_module_call(self, "forward", obs, act, new_obs)
+
+
 class MaximumLikelihood(Loss):
     """Loss function for model learning of single transitions.
 
@@ -110,7 +124,12 @@ class MaximumLikelihood(Loss):
         # pylint:disable=missing-function-docstring
         models = self.models
         losses = [NLLLoss(m) for m in models]
-        cls = ForkedLosses if isinstance(models, ForkedSME) else Losses
+        if isinstance(models, ForkedSME):
+            cls = ForkedLosses
+        elif isinstance(models, VectorizedSME):
+            cls = VectorizedLosses
+        else:
+            cls = Losses
         self.loss_fns = cls(losses)
 
     @property
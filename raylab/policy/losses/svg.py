@@ -1,6 +1,5 @@
 """Losses for Stochastic Value Gradients."""
 from typing import Callable
-from typing import List
 from typing import Tuple
 
 import torch
@@ -121,16 +120,23 @@ class OneStepSoftSVG(OneStepSVG):
 class TrajectorySVG(EnvFunctionsMixin, Loss):
     """Loss function for Stochastic Value Gradients on full trajectory.
 
+    Expects a time-major batch of padded trajectories, with tensors of shape
+    `(T, B, *)` and a boolean mask of shape `(T, B)` marking valid timesteps,
+    e.g., from :func:`raylab.policy.postprocessing.time_major_episodes`. All
+    trajectories are reproduced in lockstep.
+
     Args:
         model: model that reproduces state and its log density
         actor: policy that reproduces action and its log density
         critic: state-value function
     """
 
-    batch_keys: Tuple[str, str, str] = (
+    MASK = "mask"
+    batch_keys: Tuple[str, str, str, str] = (
         SampleBatch.CUR_OBS,
         SampleBatch.ACTIONS,
         SampleBatch.NEXT_OBS,
+        MASK,
     )
 
     def __init__(self, model: StochasticModel, actor: StochasticPolicy, critic: VValue):
@@ -149,22 +155,16 @@ class TrajectorySVG(EnvFunctionsMixin, Loss):
         """Compile the rollout module to TorchScript."""
         self._rollout = torch.jit.script(self._rollout)
 
-    def __call__(self, episodes: List[TensorDict]) -> Tuple[Tensor, StatDict]:
+    def __call__(self, batch: TensorDict) -> Tuple[Tensor, StatDict]:
         """Compute Stochatic Value Gradient loss given full trajectories."""
         assert (
             self._rollout is not None
         ), "Rollout module not set. Did you call `set_reward_fn`?"
+        obs, actions, next_obs, mask = self.unpack_batch(batch)
 
-        total_ret = 0
-        for episode in episodes:
-            init_obs = episode[SampleBatch.CUR_OBS][0]
-            actions = episode[SampleBatch.ACTIONS]
-            next_obs = episode[SampleBatch.NEXT_OBS]
-
-            _, _, rewards = self._rollout(actions, next_obs, init_obs)
-            total_ret += rewards.sum()
-
-        sim_return_mean = total_ret / len(episodes)
+        _, _, rewards = self._rollout(actions, next_obs, obs[0])
+        rewards = torch.where(mask, rewards, torch.zeros_like(rewards))
+        sim_return_mean = rewards.sum(dim=0).mean()
         loss = -sim_return_mean
         info = {"loss(actor)": loss.item(), "sim_return_mean": sim_return_mean.item()}
         return loss, info
@@ -205,7 +205,8 @@ class ReproduceRewards(nn.Module):
 
         Note:
             Assumes the first tensor dimension of `acts` and `next_obs`
-            corresponds to the timestep and iterates over it.
+            corresponds to the timestep and iterates over it. Any following
+            batch dimensions are reproduced in lockstep.
         """
         # pylint:disable=arguments-differ
         obs_seq = []
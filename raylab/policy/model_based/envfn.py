@@ -35,9 +35,15 @@ class EnvFnMixin:
         self.dynamics_fn = None
 
     def set_reward_from_config(self):
-        """Build and set the reward function from environment configurations."""
+        """Build and set the reward function from environment configurations.
+
+        The reward function is placed in the policy's device and compiled with
+        TorchScript if the `compile` option is set.
+        """
         env_id, env_config = self.config["env"], self.config["env_config"]
-        self.reward_fn = envs.get_reward_fn(env_id, env_config)
+        self.reward_fn = envs.get_reward_fn(
+            env_id, env_config, script=self.config.get("compile", False)
+        ).to(self.device)
         self._set_reward_hook()
 
     def set_reward_from_callable(self, function: RewardFn):
@@ -52,9 +58,15 @@ class EnvFnMixin:
         self._set_reward_hook()
 
     def set_termination_from_config(self):
-        """Build and set a termination function from environment configurations."""
+        """Build and set a termination function from environment configurations.
+
+        The termination function is placed in the policy's device and compiled
+        with TorchScript if the `compile` option is set.
+        """
         env_id, env_config = self.config["env"], self.config["env_config"]
-        self.termination_fn = envs.get_termination_fn(env_id, env_config)
+        self.termination_fn = envs.get_termination_fn(
+            env_id, env_config, script=self.config.get("compile", False)
+        ).to(self.device)
         self._set_termination_hook()
 
     def set_termination_from_callable(self, function: TerminationFn):
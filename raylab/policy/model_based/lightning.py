@@ -21,6 +21,8 @@ from torch.utils.data import random_split
 from raylab.options import option
 from raylab.policy.losses import Loss
 from raylab.policy.modules.model import SME
+from raylab.torch.utils import autocast_context
+from raylab.torch.utils import check_precision
 from raylab.torch.utils import convert_to_tensor
 from raylab.utils.lightning import supress_stderr
 from raylab.utils.lightning import supress_stdout
@@ -36,11 +38,20 @@ from raylab.utils.types import TensorDict
 
 class LightningModel(pl.LightningModule):
     # pylint:disable=too-many-ancestors,arguments-differ,missing-docstring
-    def __init__(self, model: nn.Module, loss: Loss, optimizer: Optimizer):
+    def __init__(
+        self,
+        model: nn.Module,
+        loss: Loss,
+        optimizer: Optimizer,
+        precision: str = "float32",
+    ):
         super().__init__()
         self.model = model
         self.configure_losses(loss)
         self.optimizer = optimizer
+        # Lightning owns `precision` and overwrites it with the trainer's
+        check_precision(precision)
+        self.loss_precision = precision
 
     def configure_optimizers(self) -> Optimizer:
         return self.optimizer
@@ -52,7 +63,8 @@ class LightningModel(pl.LightningModule):
         return self.train_loss(batch)
 
     def training_step(self, batch: TensorDict, _) -> pl.TrainResult:
-        loss, info = self.train_loss(batch)
+        with autocast_context(self.loss_precision, self.device):
+            loss, info = self.train_loss(batch)
         info = self.stat_to_tensor_dict(info)
         result = pl.TrainResult(loss, early_stop_on=loss)
         result.log("train/loss", loss)
@@ -60,7 +72,8 @@ class LightningModel(pl.LightningModule):
         return result
 
     def validation_step(self, batch: TensorDict, _) -> pl.EvalResult:
-        loss, info = self.val_loss(batch)
+        with autocast_context(self.loss_precision, self.device):
+            loss, info = self.val_loss(batch)
         info = self.stat_to_tensor_dict(info)
         result = pl.EvalResult(early_stop_on=loss)
         result.log("val/loss", loss)
@@ -328,7 +341,8 @@ class LightningModelTrainer:
         loss_fn: Loss associated with the model ensemble
         optimizer: Optimizer associated with the model ensemble
         replay: Experience replay buffer
-        config: Dictionary containg `model_training` and `model_warmup` dicts
+        config: Dictionary containg `model_training` and `model_warmup` dicts.
+            May also contain the policy's `precision` for loss computations
 
     Attributes:
         pl_model: Pytorch Lightning model
@@ -352,7 +366,12 @@ class LightningModelTrainer:
     ):
         # pylint:disable=too-many-arguments
         self.spec = TrainingSpec.from_dict(config["model_training"])
-        self.pl_model = LightningModel(model=models, loss=loss_fn, optimizer=optimizer)
+        self.pl_model = LightningModel(
+            model=models,
+            loss=loss_fn,
+            optimizer=optimizer,
+            precision=config.get("precision", "float32"),
+        )
         self.datamodule = DataModule(replay, self.spec.datamodule)
         self.training_loss = self.warmup_loss = loss_fn
 
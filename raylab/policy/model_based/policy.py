@@ -19,7 +19,9 @@ def model_based_options(cls: type) -> type:
     model_update_interval = option(
         "model_update_interval",
         default=1,
-        help="""Number of calls to `learn_on_batch` between each model update run.
+        help="""Number of calls to `learn_on_replay` between each model update run.
+
+        `learn_on_replay` is called once on each call to `learn_on_batch`.
 
         Example:
             With a 'rollout_fragment_length' of 1 and 'model_update_interval' of 25,
@@ -45,10 +47,14 @@ class MBPolicyMixin(ABC):
         self.timers = {"model": TimerStat(), "policy": TimerStat()}
         self._info = {}
 
-    @learner_stats
     def learn_on_batch(self, samples: SampleBatch) -> dict:
         # pylint:disable=missing-function-docstring
         self.add_to_buffer(samples)
+        return self.learn_on_replay()
+
+    @learner_stats
+    def learn_on_replay(self) -> dict:
+        # pylint:disable=missing-function-docstring
         self._learn_calls += 1
 
         warmup = self._learn_calls == 1
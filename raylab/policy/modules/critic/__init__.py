@@ -5,10 +5,12 @@ from .q_value import ForkedQValueEnsemble
 from .q_value import MLPQValue
 from .q_value import QValue
 from .q_value import QValueEnsemble
+from .q_value import VectorizedQValueEnsemble
 from .v_value import ClippedVValue
 from .v_value import ForkedVValueEnsemble
 from .v_value import HardValue
 from .v_value import MLPVValue
 from .v_value import SoftValue
 from .v_value import VValue
+from .v_value import VectorizedVValueEnsemble
 from .v_value import VValueEnsemble
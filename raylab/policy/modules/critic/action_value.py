@@ -1,6 +1,7 @@
 """Network and configurations for modules with Q-value critics."""
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Union
 
 import torch.nn as nn
 from dataclasses_json import DataClassJsonMixin
@@ -9,10 +10,18 @@ from gym.spaces import Box
 from .q_value import ForkedQValueEnsemble
 from .q_value import MLPQValue
 from .q_value import QValueEnsemble
+from .q_value import VectorizedQValueEnsemble
 
 
 QValueSpec = MLPQValue.spec_cls
 
+ENSEMBLE_CLASSES = {
+    False: QValueEnsemble,
+    True: ForkedQValueEnsemble,
+    "fork": ForkedQValueEnsemble,
+    "vmap": VectorizedQValueEnsemble,
+}
+
 
 @dataclass
 class ActionValueCriticSpec(DataClassJsonMixin):
@@ -23,8 +32,10 @@ class ActionValueCriticSpec(DataClassJsonMixin):
             states and actions to pre-value function linear features
         double_q: Whether to create two Q-value estimators instead of one.
             Defaults to True
-        parallelize: Whether to evaluate Q-values in parallel. Defaults to
-            False.
+        parallelize: Whether to evaluate Q-values in parallel. If True or
+            'fork', forks each estimator's call with TorchScript. If 'vmap',
+            evaluates all estimators in a single vectorized call over their
+            stacked parameters. Defaults to False.
         initializer: Optional dictionary with mandatory `type` key corresponding
             to the initializer function name in `torch.nn.init` and optional
             keyword arguments.
@@ -32,7 +43,7 @@ class ActionValueCriticSpec(DataClassJsonMixin):
 
     encoder: QValueSpec = field(default_factory=QValueSpec)
     double_q: bool = True
-    parallelize: bool = False
+    parallelize: Union[bool, str] = False
     initializer: dict = field(default_factory=dict)
 
 
@@ -66,10 +77,7 @@ class ActionValueCritic(nn.Module):
         def make_q_value_ensemble():
             n_q_values = 2 if spec.double_q else 1
             q_values = [make_q_value() for _ in range(n_q_values)]
-
-            if spec.parallelize:
-                return ForkedQValueEnsemble(q_values)
-            return QValueEnsemble(q_values)
+            return ENSEMBLE_CLASSES[spec.parallelize](q_values)
 
         q_values = make_q_value_ensemble()
         q_values.initialize_parameters(spec.initializer)
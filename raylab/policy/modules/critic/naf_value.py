@@ -1,4 +1,8 @@
 """Parameterized normalized advantage function estimators."""
+from typing import List
+from typing import Tuple
+
+import torch
 import torch.nn as nn
 from gym.spaces import Box
 from torch import Tensor
@@ -7,7 +11,9 @@ import raylab.torch.nn as nnx
 from raylab.policy.modules.actor import DeterministicPolicy
 
 from .q_value import QValue
+from .q_value import QValueEnsemble
 from .v_value import VValue
+from .v_value import VValueEnsemble
 
 
 class NAFQValue(QValue):
@@ -36,11 +42,41 @@ class NAFQValue(QValue):
         )
 
     def forward(self, obs: Tensor, action: Tensor) -> Tensor:
-        logits = self.policy.encoder(obs)
-        best_value = self._value_linear(logits).squeeze(-1)
-        advantage = self._advantage(logits, action).squeeze(-1)
+        return self.forward_with_features(self.encode_obs(obs), action)
+
+    @torch.jit.export
+    def encode_obs(self, obs: Tensor) -> Tensor:
+        return self.policy.encoder(obs)
+
+    @torch.jit.export
+    def forward_with_features(self, features: Tensor, action: Tensor) -> Tensor:
+        best_value = self._value_linear(features).squeeze(-1)
+        advantage = self._advantage(features, action).squeeze(-1)
         return advantage + best_value
 
+    @torch.jit.export
+    def head_params(self) -> Tuple[Tensor, Tensor]:
+        """Concatenated parameters of the state-value and matrix heads.
+
+        Returns:
+            Weight of shape `(1 + N * (N + 1) / 2, F)` and bias of shape
+            `(1 + N * (N + 1) / 2,)`, where `N` is the action size and `F` the
+            number of observation features
+        """
+        weight = torch.cat([self._value_linear.weight, self._tril.linear_module.weight])
+        bias = torch.cat([self._value_linear.bias, self._tril.linear_module.bias])
+        return weight, bias
+
+    @torch.jit.export
+    def best_action(self, features: Tensor) -> Tensor:
+        """Action maximizing the Q-value given the observation features."""
+        return self.policy.squashing(self.policy.action_linear(features))
+
+    @torch.jit.export
+    def tril_from_flat(self, flat_tril: Tensor) -> Tensor:
+        """Lower-triangular matrices from the flattened matrix head outputs."""
+        return self._tril.tril_from_flat(flat_tril)
+
 
 class NAFVValue(VValue):
     """Wrapper around NAF's state-value function."""
@@ -65,7 +101,116 @@ class AdvantageFunction(nn.Module):
     def forward(self, logits, action):  # pylint:disable=arguments-differ
         tril_matrix = self.tril_module(logits)  # square matrix [..., N, N]
         best_action = self.action_module(logits)  # batch of actions [..., N]
-        action_diff = (action - best_action).unsqueeze(-1)  # column vector [..., N, 1]
-        vec = tril_matrix.matmul(action_diff)  # column vector [..., N, 1]
-        advantage = -0.5 * vec.transpose(-1, -2).matmul(vec).squeeze(-1)
-        return advantage  # scalars [..., 1]
+        advantage = naf_advantage(tril_matrix, best_action, action)
+        return advantage.unsqueeze(-1)  # scalars [..., 1]
+
+
+def naf_advantage(tril_matrix: Tensor, best_action: Tensor, action: Tensor) -> Tensor:
+    """Compute the quadratic advantage `-0.5 * ||L (a - mu)||^2` of NAF.
+
+    Leading dimensions of all inputs are broadcast against each other.
+
+    Args:
+        tril_matrix: Lower-triangular matrices `L` of shape `(*, N, N)`
+        best_action: Maximizing actions `mu` of shape `(*, N)`
+        action: Actions `a` of shape `(*, N)`
+
+    Returns:
+        Advantages of shape `(*,)`
+    """
+    action_diff = (action - best_action).unsqueeze(-1)  # column vector [..., N, 1]
+    vec = tril_matrix.matmul(action_diff).squeeze(-1)  # vector [..., N]
+    return -0.5 * vec.pow(2).sum(dim=-1)
+
+
+def stacked_linear(inputs: Tensor, weight: Tensor, bias: Tensor) -> Tensor:
+    """Apply a different linear map to each slice of a stacked input.
+
+    Args:
+        inputs: Tensor of shape `(E, *, F)`
+        weight: Stacked weights of shape `(E, O, F)`
+        bias: Stacked biases of shape `(E, O)`
+
+    Returns:
+        Tensor of shape `(E, *, O)`
+    """
+    flat_inputs = inputs.reshape(inputs.size(0), -1, inputs.size(-1))
+    outputs = torch.baddbmm(bias.unsqueeze(1), flat_inputs, weight.transpose(1, 2))
+    return outputs.reshape(inputs.shape[:-1] + weight.shape[1:2])
+
+
+class NAFQValueEnsemble(QValueEnsemble):
+    """Ensemble of NAF Q-value estimators with fused heads.
+
+    Evaluates the state-value and matrix heads of all members with one batched
+    matrix product over their stacked weights, and the advantages of all
+    members with one batched quadratic form. Only the observation encoders and
+    policy heads are evaluated member by member.
+
+    Args:
+        q_values: A list of NAFQValue modules
+    """
+
+    # pylint:disable=abstract-method
+
+    def __init__(self, q_values: List[NAFQValue]):
+        assert all(
+            isinstance(q, NAFQValue) for q in q_values
+        ), f"All modules in {type(self).__name__} must be instances of NAFQValue."
+        super().__init__(q_values)
+
+    def _action_values(self, obs: Tensor, act: Tensor) -> List[Tensor]:
+        return self.forward_with_features(self.encode_obs(obs), act)
+
+    @torch.jit.export
+    def forward_with_features(
+        self, features: List[Tensor], action: Tensor
+    ) -> List[Tensor]:
+        weights, biases, best_actions = [], [], []
+        for idx, member in enumerate(self):
+            weight, bias = member.head_params()
+            weights.append(weight)
+            biases.append(bias)
+            best_actions.append(member.best_action(features[idx]))
+
+        outputs = stacked_linear(
+            torch.stack(features), torch.stack(weights), torch.stack(biases)
+        )
+        best_action = torch.stack(best_actions)
+        # Align additional leading action dimensions after the ensemble one
+        for _ in range(action.dim() - features[0].dim()):
+            outputs, best_action = outputs.unsqueeze(1), best_action.unsqueeze(1)
+
+        best_value, flat_tril = outputs[..., 0], outputs[..., 1:]
+        # All members share the same action size, hence the same scatter indices
+        tril_matrix = self[0].tril_from_flat(flat_tril)
+        advantage = naf_advantage(tril_matrix, best_action, action)
+        return (best_value + advantage).unbind(0)
+
+
+class NAFVValueEnsemble(VValueEnsemble):
+    """Ensemble of NAF state-value functions with fused value heads.
+
+    Args:
+        v_values: A list of NAFVValue modules
+    """
+
+    # pylint:disable=abstract-method
+
+    def __init__(self, v_values: List[NAFVValue]):
+        assert all(
+            isinstance(v, NAFVValue) for v in v_values
+        ), f"All modules in {type(self).__name__} must be instances of NAFVValue."
+        super().__init__(v_values)
+
+    def _state_values(self, obs: Tensor) -> List[Tensor]:
+        features, weights, biases = [], [], []
+        for member in self:
+            features.append(member.encoder(obs))
+            weights.append(member.value_linear.weight)
+            biases.append(member.value_linear.bias)
+
+        values = stacked_linear(
+            torch.stack(features), torch.stack(weights), torch.stack(biases)
+        )
+        return values.squeeze(-1).unbind(0)
@@ -9,6 +9,7 @@ from gym.spaces import Box
 from torch import Tensor
 
 from raylab.policy.modules.networks.mlp import StateActionMLP
+from raylab.torch.utils import vmap_module_call
 
 
 MLPSpec = StateActionMLP.spec_cls
@@ -27,6 +28,29 @@ class QValue(ABC, nn.Module):
             batch of 10 obs-action pairs, the output will have shape (10,).
         """
 
+    def encode_obs(self, obs: Tensor) -> Tensor:
+        """Compute the action-independent features of observations.
+
+        Evaluating many actions for the same observations with
+        :meth:`forward_with_features` then only requires computing these once.
+        Defaults to the observations themselves.
+        """
+        # pylint:disable=no-self-use
+        return obs
+
+    def forward_with_features(self, features: Tensor, action: Tensor) -> Tensor:
+        """Compute Q-values from observation features and actions.
+
+        Args:
+            features: Output of :meth:`encode_obs`
+            action: Actions, possibly with additional leading dimensions, e.g.,
+                for many samples per observation
+
+        Returns:
+            Q-values with the batch shape of the actions
+        """
+        return self(features, action)
+
 
 class MLPQValue(QValue):
     """Q-value function with a multilayer perceptron encoder.
@@ -49,7 +73,15 @@ class MLPQValue(QValue):
         self.value_linear = nn.Linear(self.encoder.out_features, 1)
 
     def forward(self, obs: Tensor, action: Tensor) -> Tensor:
-        features = self.encoder(obs, action)
+        return self.forward_with_features(self.encode_obs(obs), action)
+
+    @torch.jit.export
+    def encode_obs(self, obs: Tensor) -> Tensor:
+        return self.encoder.encode_obs(obs)
+
+    @torch.jit.export
+    def forward_with_features(self, features: Tensor, action: Tensor) -> Tensor:
+        features = self.encoder.forward_with_features(features, action)
         return self.value_linear(features).squeeze(dim=-1)
 
     def initialize_parameters(self, initializer_spec: dict):
@@ -98,6 +130,36 @@ class QValueEnsemble(nn.ModuleList):
     def _action_values(self, obs: Tensor, act: Tensor) -> List[Tensor]:
         return [m(obs, act) for m in self]
 
+    @torch.jit.export
+    def encode_obs(self, obs: Tensor) -> List[Tensor]:
+        """Compute the observation features of each Q estimator.
+
+        Args:
+            obs: The observation tensor
+
+        Returns:
+            List of `N` feature tensors, where `N` is the ensemble size
+        """
+        return [m.encode_obs(obs) for m in self]
+
+    @torch.jit.export
+    def forward_with_features(
+        self, features: List[Tensor], action: Tensor
+    ) -> List[Tensor]:
+        """Evaluate each Q estimator with its precomputed observation features.
+
+        Args:
+            features: Output of :meth:`encode_obs`
+            action: The action tensor, possibly with additional leading
+                dimensions
+
+        Returns:
+            List of `N` output tensors, where `N` is the ensemble size
+        """
+        return [
+            m.forward_with_features(features[i], action) for i, m in enumerate(self)
+        ]
+
     def initialize_parameters(self, initializer_spec: dict):
         """Initialize each Q estimator in the ensemble.
 
@@ -126,6 +188,26 @@ class ForkedQValueEnsemble(QValueEnsemble):
         return [torch.jit.wait(f) for f in futures]
 
 
+class VectorizedQValueEnsemble(QValueEnsemble):
+    """Ensemble of Q-value estimators with vectorized forward pass.
+
+    Evaluates all estimators in a single call over their stacked parameters.
+    Expects estimators with the same architecture. Once compiled with
+    TorchScript, evaluates each estimator in turn.
+    """
+
+    # pylint:disable=abstract-method
+
+    def _action_values(self, obs: Tensor, act: Tensor) -> List[Tensor]:
+        if torch.jit.is_scripting():
+            return [m(obs, act) for m in self]
+        return self._vmap_action_values(obs, act)
+
+    @torch.jit.ignore
+    def _vmap_action_values(self, obs: Tensor, act: Tensor) -> List[Tensor]:
+        return vmap_module_call(self, "forward", obs, act)
+
+
 class ClippedQValue(QValue):
     """Q-value computed as the minimum among Q-values in an ensemble."""
 
@@ -137,3 +219,15 @@ class ClippedQValue(QValue):
         values = self.q_values(obs, act)
         mininum, _ = torch.stack(values, dim=0).min(dim=0)
         return mininum
+
+    @torch.jit.export
+    def encode_obs(self, obs: Tensor) -> List[Tensor]:
+        return self.q_values.encode_obs(obs)
+
+    @torch.jit.export
+    def forward_with_features(  # pylint:disable=arguments-differ
+        self, features: List[Tensor], action: Tensor
+    ) -> Tensor:
+        values = self.q_values.forward_with_features(features, action)
+        mininum, _ = torch.stack(values, dim=0).min(dim=0)
+        return mininum
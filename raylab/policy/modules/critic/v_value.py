@@ -15,6 +15,7 @@ from raylab.policy.modules.actor import Alpha
 from raylab.policy.modules.actor import DeterministicPolicy
 from raylab.policy.modules.actor import StochasticPolicy
 from raylab.policy.modules.networks.mlp import StateMLP
+from raylab.torch.utils import vmap_module_call
 
 from .q_value import ClippedQValue
 from .q_value import QValue
@@ -110,6 +111,26 @@ class ForkedVValueEnsemble(VValueEnsemble):
         return [wait(f) for f in futures]
 
 
+class VectorizedVValueEnsemble(VValueEnsemble):
+    """Ensemble of V-value estimators with vectorized forward pass.
+
+    Evaluates all estimators in a single call over their stacked parameters.
+    Expects estimators with the same architecture. Once compiled with
+    TorchScript, evaluates each estimator in turn.
+    """
+
+    # pylint:disable=abstract-method
+
+    def _state_values(self, obs: Tensor) -> List[Tensor]:
+        if torch.jit.is_scripting():
+            return [m(obs) for m in self]
+        return self._vmap_state_values(obs)
+
+    @torch.jit.ignore
+    def _vmap_state_values(self, obs: Tensor) -> List[Tensor]:
+        return vmap_module_call(self, "forward", obs)
+
+
 class SoftValue(VValue):
     """V-value computed from stochastic policy, Q-value, and entropy bonus."""
 
@@ -5,6 +5,7 @@ from .builders import EnsembleSpec
 from .builders import Spec as SingleSpec
 from .ensemble import ForkedSME
 from .ensemble import SME
+from .ensemble import VectorizedSME
 from .single import MLPModel
 from .single import ResidualMixin
 from .single import StochasticModel
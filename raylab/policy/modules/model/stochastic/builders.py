@@ -1,17 +1,26 @@
 """Constructors for stochastic dynamics models."""
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Union
 
 from dataclasses_json import DataClassJsonMixin
 from gym.spaces import Box
 
 from .ensemble import ForkedSME
 from .ensemble import SME
+from .ensemble import VectorizedSME
 from .single import MLPModel
 from .single import ResidualMLPModel
 
 ModelSpec = MLPModel.spec_cls
 
+ENSEMBLE_CLASSES = {
+    False: SME,
+    True: ForkedSME,
+    "fork": ForkedSME,
+    "vmap": VectorizedSME,
+}
+
 
 @dataclass
 class Spec(DataClassJsonMixin):
@@ -61,11 +70,13 @@ class EnsembleSpec(Spec):
             keyword arguments. Used to initialize the models' Linear layers.
         ensemble_size: Number of models in the collection.
         parallelize: Whether to use an ensemble with parallelized `sample`,
-            `rsample`, and `log_prob` methods
+            `rsample`, and `log_prob` methods. If True or 'fork', forks each
+            model's call with TorchScript. If 'vmap', evaluates all models in
+            a single vectorized call over their stacked parameters
     """
 
     ensemble_size: int = 1
-    parallelize: bool = False
+    parallelize: Union[bool, str] = False
 
 
 def build_ensemble(obs_space: Box, action_space: Box, spec: EnsembleSpec) -> SME:
@@ -80,6 +91,6 @@ def build_ensemble(obs_space: Box, action_space: Box, spec: EnsembleSpec) -> SME
         A stochastic dynamics model ensemble
     """
     models = [build(obs_space, action_space, spec) for _ in range(spec.ensemble_size)]
-    cls = ForkedSME if spec.parallelize else SME
+    cls = ENSEMBLE_CLASSES[spec.parallelize]
     ensemble = cls(models)
     return ensemble
@@ -8,6 +8,8 @@ from torch import Tensor
 from torch.jit import fork
 from torch.jit import wait
 
+from raylab.torch.utils import tree_stack
+from raylab.torch.utils import vmap_module_call
 from raylab.utils.types import TensorDict
 
 from .single import StochasticModel
@@ -120,3 +122,70 @@ class ForkedSME(SME):
     def deterministic(self, params: List[TensorDict]) -> List[SampleLogp]:
         futures = [fork(m.deterministic, params[i]) for i, m in enumerate(self)]
         return [wait(f) for f in futures]
+
+
+class VectorizedSME(SME):
+    """Stochastic Model Ensemble with vectorized methods.
+
+    Evaluates all models in a single call over their stacked parameters.
+    Expects models with the same architecture and inputs of the same shape
+    for every model. Once compiled with TorchScript, evaluates each model in
+    turn.
+    """
+
+    # pylint:disable=abstract-method
+
+    def forward(self, obs: List[Tensor], act: List[Tensor]) -> List[TensorDict]:
+        if torch.jit.is_scripting():
+            return [m(obs[i], act[i]) for i, m in enumerate(self)]
+        return self._vmap_forward(obs, act)
+
+    @torch.jit.export
+    def sample(self, params: List[TensorDict]) -> List[SampleLogp]:
+        if torch.jit.is_scripting():
+            return [m.sample(params[i]) for i, m in enumerate(self)]
+        return self._vmap_sample(params)
+
+    @torch.jit.export
+    def rsample(self, params: List[TensorDict]) -> List[SampleLogp]:
+        if torch.jit.is_scripting():
+            return [m.rsample(params[i]) for i, m in enumerate(self)]
+        return self._vmap_rsample(params)
+
+    @torch.jit.export
+    def log_prob(self, new_obs: List[Tensor], params: List[TensorDict]) -> List[Tensor]:
+        if torch.jit.is_scripting():
+            return [m.log_prob(new_obs[i], params[i]) for i, m in enumerate(self)]
+        return self._vmap_log_prob(new_obs, params)
+
+    @torch.jit.export
+    def deterministic(self, params: List[TensorDict]) -> List[SampleLogp]:
+        if torch.jit.is_scripting():
+            return [m.deterministic(params[i]) for i, m in enumerate(self)]
+        return self._vmap_deterministic(params)
+
+    @torch.jit.ignore
+    def _vmap_forward(self, obs: List[Tensor], act: List[Tensor]) -> List[TensorDict]:
+        return self._vmap("forward", obs, act)
+
+    @torch.jit.ignore
+    def _vmap_sample(self, params: List[TensorDict]) -> List[SampleLogp]:
+        return self._vmap("sample", params)
+
+    @torch.jit.ignore
+    def _vmap_rsample(self, params: List[TensorDict]) -> List[SampleLogp]:
+        return self._vmap("rsample", params)
+
+    @torch.jit.ignore
+    def _vmap_log_prob(
+        self, new_obs: List[Tensor], params: List[TensorDict]
+    ) -> List[Tensor]:
+        return self._vmap("log_prob", new_obs, params)
+
+    @torch.jit.ignore
+    def _vmap_deterministic(self, params: List[TensorDict]) -> List[SampleLogp]:
+        return self._vmap("deterministic", params)
+
+    def _vmap(self, method: str, *args) -> list:
+        stacked = [tree_stack(a) for a in args]
+        return vmap_module_call(self, method, *stacked, in_dims=(0,) * len(args))
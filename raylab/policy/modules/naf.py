@@ -1,6 +1,7 @@
 """NN architecture used in Normalized Advantage Function."""
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Union
 
 import torch.nn as nn
 from dataclasses_json import DataClassJsonMixin
@@ -11,8 +12,12 @@ from .actor import MLPDeterministicPolicy
 from .critic import ForkedQValueEnsemble
 from .critic import ForkedVValueEnsemble
 from .critic import QValueEnsemble
+from .critic import VectorizedQValueEnsemble
+from .critic import VectorizedVValueEnsemble
 from .critic import VValueEnsemble
 from .critic.naf_value import NAFQValue
+from .critic.naf_value import NAFQValueEnsemble
+from .critic.naf_value import NAFVValueEnsemble
 
 
 MLPPolicySpec = MLPDeterministicPolicy.spec_cls
@@ -20,12 +25,26 @@ MLPPolicySpec = MLPDeterministicPolicy.spec_cls
 
 @dataclass
 class NAFSpec(DataClassJsonMixin):
-    """Specifications for Normalized Advantage Function."""
+    """Specifications for Normalized Advantage Function.
+
+    Args:
+        policy: Specifications for the deterministic policies
+        separate_behavior: Whether to create a separate behavior policy
+        double_q: Whether to use two Q-value estimators
+        parallelized: Whether to evaluate the critics in parallel. If True or
+            'fork', forks each critic's forward pass with TorchScript. If
+            'vmap', evaluates all critics in a single vectorized call over
+            their stacked parameters
+        fused_heads: Whether to evaluate the value and matrix heads of all
+            critics with batched matrix products over their stacked weights.
+            Ignored if `parallelized` is set
+    """
 
     policy: MLPPolicySpec = field(default_factory=MLPPolicySpec)
     separate_behavior: bool = False
     double_q: bool = True
-    parallelized: bool = False
+    parallelized: Union[bool, str] = False
+    fused_heads: bool = False
 
 
 class NAF(nn.Module):
@@ -47,14 +66,22 @@ class NAF(nn.Module):
             self.behavior = make_policy()
             self.behavior.load_state_dict(self.actor.state_dict())
 
-        ensemble_cls = ForkedQValueEnsemble if spec.parallelized else QValueEnsemble
-        self.critics: QValueEnsemble = ensemble_cls(
+        q_ensemble_cls, v_ensemble_cls = QValueEnsemble, VValueEnsemble
+        if spec.parallelized == "vmap":
+            q_ensemble_cls = VectorizedQValueEnsemble
+            v_ensemble_cls = VectorizedVValueEnsemble
+        elif spec.parallelized:
+            q_ensemble_cls, v_ensemble_cls = ForkedQValueEnsemble, ForkedVValueEnsemble
+        elif spec.fused_heads:
+            q_ensemble_cls, v_ensemble_cls = NAFQValueEnsemble, NAFVValueEnsemble
+
+        self.critics: QValueEnsemble = q_ensemble_cls(
             [NAFQValue(action_space, pol) for pol in policies]
         )
-
-        ensemble_cls = ForkedVValueEnsemble if spec.parallelized else VValueEnsemble
-        self.vcritics: VValueEnsemble = ensemble_cls([q.v_value for q in self.critics])
-        self.target_vcritics: VValueEnsemble = ensemble_cls(
+        self.vcritics: VValueEnsemble = v_ensemble_cls(
+            [q.v_value for q in self.critics]
+        )
+        self.target_vcritics: VValueEnsemble = v_ensemble_cls(
             [NAFQValue(action_space, make_policy()).v_value for _ in self.critics]
         )
         self.target_vcritics.load_state_dict(self.vcritics.state_dict())
@@ -122,11 +122,21 @@ class StateActionMLP(nn.Module):
 
     def forward(self, obs: Tensor, act: Tensor) -> Tensor:
         # pylint:disable=arguments-differ
+        return self.forward_with_features(self.encode_obs(obs), act)
+
+    @torch.jit.export
+    def encode_obs(self, obs: Tensor) -> Tensor:
+        """Compute observation features to reuse for many actions."""
         if self.obs_scaler is not None:
             obs = self.obs_scaler(obs)
+        return self.encoder.encode_obs(obs)
+
+    @torch.jit.export
+    def forward_with_features(self, features: Tensor, act: Tensor) -> Tensor:
+        """Encode actions with features from :meth:`encode_obs`."""
         if self.act_scaler is not None:
             act = self.act_scaler(act)
-        return self.encoder(obs, act)
+        return self.encoder.forward_with_features(features, act)
 
     def initialize_parameters(self, initializer_spec: dict):
         """Initialize all Linear models in the encoder.
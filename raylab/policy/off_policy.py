@@ -62,7 +62,6 @@ class OffPolicyMixin(ABC):
         )
         self.replay.seed(self.config["seed"])
 
-    @learner_stats
     def learn_on_batch(self, samples: SampleBatch):
         """Run one logical iteration of training.
 
@@ -70,7 +69,18 @@ class OffPolicyMixin(ABC):
             An info dict from this iteration.
         """
         self.add_to_buffer(samples)
+        return self.learn_on_replay()
+
+    @learner_stats
+    def learn_on_replay(self):
+        """Run one logical iteration of training on previously stored samples.
+
+        Used directly by execution plans that add samples to the replay buffer
+        separately via :meth:`add_to_buffer`.
 
+        Returns:
+            An info dict from this iteration.
+        """
         info = {}
         info.update(self.get_exploration_info())
 
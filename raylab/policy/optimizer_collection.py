@@ -4,14 +4,36 @@ from collections import OrderedDict
 from collections.abc import MutableMapping
 from typing import Iterator
 
+import torch
 from torch.optim import Optimizer
 
+from raylab.torch.utils import autocast_context
+from raylab.torch.utils import check_precision
 
-class OptimizerCollection(MutableMapping):
-    """A collection of PyTorch `Optimizer`s with names."""
 
-    def __init__(self):
+class OptimizerCollection(MutableMapping):
+    """A collection of PyTorch `Optimizer`s with names.
+
+    Args:
+        precision: Floating point precision in which to compute losses inside
+            :meth:`optimize`. Parameters (master weights) and gradients are
+            always kept in single precision.
+        device: Device in which losses are computed
+
+    Raises:
+        ValueError: If `precision` is not a known floating point type
+        RuntimeError: If `precision` is not supported by the current PyTorch
+            version
+    """
+
+    def __init__(
+        self, precision: str = "float32", device: torch.device = torch.device("cpu")
+    ):
         self._optimizers = OrderedDict()
+        self.precision = precision
+        self.device = device
+        # Fail fast on invalid precision types
+        check_precision(precision)
 
     def __setitem__(self, key: str, value: Optimizer):
         """Adds an optimizer to the collection.
@@ -21,11 +43,19 @@ class OptimizerCollection(MutableMapping):
             value: the optimizer instance
 
         Raises:
-            ValueError: if the value to insert is not an optimizer
+            ValueError: if the value to insert is not an optimizer or if mixed
+                precision is enabled and the optimizer has non-float32 parameters
         """
         assert key not in self._optimizers, f"'{key}' optimizer already in collection"
         if not isinstance(value, Optimizer):
             raise ValueError("'{type(value).__name__}' is not an Optimizer instance")
+        if self.precision != "float32":
+            params = (p for g in value.param_groups for p in g["params"])
+            if any(p.dtype != torch.float32 for p in params):
+                raise ValueError(
+                    f"'{key}' optimizer must have float32 parameters when using"
+                    f" {self.precision} precision"
+                )
 
         self._optimizers[key] = value
 
@@ -68,12 +98,17 @@ class OptimizerCollection(MutableMapping):
         better performance. See the following video for more info:
 
         `https://youtu.be/9mS1fIYj1So?t=530`
+
+        Ops inside the context run with the collection's `precision` via
+        autocast. Since autocast only affects activations, the optimizer still
+        updates the float32 parameters with float32 gradients.
         """
         optimizer = self[name]
         for group in optimizer.param_groups:
             for par in group["params"]:
                 par.grad = None
-        yield
+        with autocast_context(self.precision, self.device):
+            yield
         optimizer.step()
 
     def state_dict(self) -> dict:
@@ -0,0 +1,147 @@
+"""Batched postprocessing of on-policy samples in PyTorch."""
+from typing import Sequence
+from typing import Tuple
+
+import torch
+import torch.nn as nn
+from ray.rllib import SampleBatch
+from ray.rllib.evaluation.postprocessing import Postprocessing
+from torch import Tensor
+
+from raylab.utils.types import TensorDict
+
+
+def discount_cumsum(values: Tensor, discounts: Tensor) -> Tensor:
+    """Reverse discounted cumulative sum with per-step discounts.
+
+    Computes :math:`y_t = x_t + c_t y_{t+1}`, with :math:`y_T = 0`, as a
+    parallel scan over the leading dimension, i.e., with a logarithmic number
+    of vectorized operations instead of a Python loop over timesteps. Setting
+    :math:`c_t = 0` stops the sum at timestep `t`, e.g., at episode boundaries.
+
+    Args:
+        values: The summands :math:`x_t` of shape `(T, *)`
+        discounts: The discounts :math:`c_t` of shape `(T, *)`
+
+    Returns:
+        The discounted cumulative sums :math:`y_t` of shape `(T, *)`
+    """
+    size, shift = values.size(0), 1
+    while shift < size:
+        values = torch.cat(
+            [values[:-shift] + discounts[:-shift] * values[shift:], values[-shift:]]
+        )
+        discounts = torch.cat(
+            [discounts[:-shift] * discounts[shift:], discounts[-shift:]]
+        )
+        shift *= 2
+    return values
+
+
+def episode_ends(batch: TensorDict) -> Tensor:
+    """Mark the last timestep of each trajectory in a concatenated batch.
+
+    A trajectory ends at a terminal timestep, before a change of episode id,
+    and at the end of the batch.
+
+    Args:
+        batch: Dictionary of sample tensors, possibly from many episodes
+
+    Returns:
+        A boolean tensor of shape `(N,)`
+    """
+    ends = batch[SampleBatch.DONES].bool().clone()
+    if SampleBatch.EPS_ID in batch:
+        eps_id = batch[SampleBatch.EPS_ID]
+        ends[:-1] |= eps_id[1:] != eps_id[:-1]
+    ends[-1] = True
+    return ends
+
+
+def time_major_episodes(
+    batch: TensorDict, keys: Sequence[str]
+) -> Tuple[TensorDict, Tensor]:
+    """Stack the trajectories in a concatenated batch along a new dimension.
+
+    Trajectories, delimited by :func:`episode_ends`, are padded to the length
+    of the longest one by repeating their last timestep, so that padded
+    entries are valid inputs to downstream modules.
+
+    Args:
+        batch: Dictionary of sample tensors, possibly from many episodes
+        keys: The entries of the batch to stack
+
+    Returns:
+        A dictionary with tensors of shape `(T, B, *)` for each key, where `T`
+        is the maximum trajectory length and `B` the number of trajectories,
+        and a boolean tensor of shape `(T, B)` marking the valid timesteps
+    """
+    last = episode_ends(batch).nonzero().squeeze(-1)
+    first = torch.cat([last.new_zeros(1), last[:-1] + 1])
+    lengths = last - first + 1
+
+    steps = torch.arange(int(lengths.max()), device=last.device).unsqueeze(-1)
+    mask = steps < lengths
+    idxs = torch.min(first + steps, last)
+    return {k: batch[k][idxs] for k in keys}, mask
+
+
+@torch.no_grad()
+def compute_advantages(
+    batch: TensorDict,
+    critic: nn.Module,
+    gamma: float,
+    lambda_: float = 1.0,
+    use_gae: bool = True,
+) -> TensorDict:
+    """Compute advantages and value targets for a whole train batch at once.
+
+    Batched equivalent of RLlib's :func:`compute_advantages` applied to each
+    trajectory in the batch. Evaluates the critic with a single forward pass
+    over all observations and the next observations at the end of each
+    trajectory, and accumulates TD errors with :func:`discount_cumsum`, using
+    :func:`episode_ends` to stop the sums at trajectory boundaries.
+    Trajectories are bootstrapped with the critic's value of their last next
+    observation, unless it's terminal.
+
+    Args:
+        batch: Dictionary of sample tensors, possibly from many episodes
+        critic: State-value function
+        gamma: Discount factor
+        lambda_: Parameter for GAE(:math:`\\gamma`, :math:`\\lambda`)
+        use_gae: Whether to use Generalized Advantage Estimation. Otherwise,
+            advantages are discounted returns minus value predictions
+
+    Returns:
+        The input batch, updated with value predictions, advantages, and value
+        targets
+    """
+    obs, next_obs, rewards, dones = (
+        batch[k]
+        for k in (
+            SampleBatch.CUR_OBS,
+            SampleBatch.NEXT_OBS,
+            SampleBatch.REWARDS,
+            SampleBatch.DONES,
+        )
+    )
+    ends = episode_ends(batch)
+
+    values = critic(torch.cat([obs, next_obs[ends]])).squeeze(-1)
+    values, last_values = values[: len(obs)], values[len(obs) :]
+    next_values = torch.cat([values[1:], values[-1:]])
+    next_values[ends] = torch.where(
+        dones[ends].bool(), torch.zeros_like(last_values), last_values
+    )
+
+    deltas = rewards + gamma * next_values - values
+    lambda_ = lambda_ if use_gae else 1.0
+    discounts = torch.where(
+        ends, torch.zeros_like(deltas), torch.full_like(deltas, gamma * lambda_)
+    )
+    advantages = discount_cumsum(deltas, discounts)
+
+    batch[SampleBatch.VF_PREDS] = values
+    batch[Postprocessing.ADVANTAGES] = advantages
+    batch[Postprocessing.VALUE_TARGETS] = advantages + values
+    return batch
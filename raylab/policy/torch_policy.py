@@ -1,9 +1,12 @@
 """Base for all PyTorch policies."""
+import os
 import textwrap
 from typing import List
+from typing import Optional
 from typing import Set
 from typing import Tuple
 
+import numpy as np
 import torch
 import torch.nn as nn
 from gym.spaces import Space
@@ -22,10 +25,12 @@ from torch import Tensor
 from raylab.options import configure
 from raylab.options import option
 from raylab.options import RaylabOptions
+from raylab.torch.utils import check_precision
 from raylab.torch.utils import convert_to_tensor
 from raylab.utils.types import StatDict
 from raylab.utils.types import TensorDict
 
+from .export import export_policy
 from .modules import get_module
 from .optimizer_collection import OptimizerCollection
 
@@ -53,6 +58,22 @@ from .optimizer_collection import OptimizerCollection
     allow_unknown_subkeys=True,
 )
 @option("compile", False, help="Whether to optimize the policy's backend")
+@option(
+    "precision",
+    "float32",
+    help="""Floating point precision for loss computations.
+
+    Either 'float32' or 'bfloat16'. The latter uses automatic mixed precision
+    (`torch.autocast`) while computing losses for critics, actors and models.
+    Parameters and gradients are always kept in float32, as are numerically
+    sensitive quantities such as log-likelihoods.
+
+    'bfloat16' is supported on CPUs and recent GPUs and requires PyTorch >=
+    1.10, which provides `torch.autocast`. Policies raise an error at
+    construction if it isn't available. 'float16' is not offered since it
+    would need gradient scaling to avoid underflow.
+    """,
+)
 class TorchPolicy(Policy):
     """A Policy that uses PyTorch as a backend.
 
@@ -97,6 +118,9 @@ class TorchPolicy(Policy):
         self.framework = "torch"  # Needed to create exploration
         self.exploration = self._create_exploration()
 
+        # Preallocated input for `compute_single_action_fast`
+        self._single_obs: Optional[Tensor] = None
+
     # ==========================================================================
     # PublicAPI
     # ==========================================================================
@@ -163,7 +187,7 @@ class TorchPolicy(Policy):
         state_batches = convert_to_torch_tensor(state_batches or [], device=self.device)
 
         # Call the exploration before_compute_actions hook.
-        self.exploration.before_compute_actions(timestep=timestep)
+        self.exploration.before_compute_actions(timestep=timestep, episodes=episodes)
 
         dist_inputs, state_out = self._compute_module_output(
             self._unpack_observations(input_dict),
@@ -190,6 +214,37 @@ class TorchPolicy(Policy):
 
         return convert_to_non_torch_type((actions, state_out, extra_fetches))
 
+    @torch.no_grad()
+    def compute_single_action_fast(self, obs, explore: bool = False) -> np.ndarray:
+        """Compute the action for a single observation with minimal overhead.
+
+        Lean alternative to `compute_single_action` for deployment. Copies the
+        observation into a preallocated input tensor and calls the module's
+        actor directly (scripted, if the policy was compiled). Skips input
+        dict wrappers, exploration hooks, action distribution instances and
+        extra action outputs.
+
+        Note:
+            The policy's exploration strategy (e.g., Gaussian action noise or
+            uniform random warmup) is not applied.
+
+        Args:
+            obs: A single, unbatched observation from a Box space
+            explore: Whether to sample from the actor's stochastic or behavior
+                policy instead of computing the deterministic action
+
+        Returns:
+            The unbatched action array
+        """
+        if self._single_obs is None:
+            self._single_obs = torch.empty(
+                (1,) + self.observation_space.shape, device=self.device
+            )
+        self._single_obs[0].copy_(torch.as_tensor(obs))
+
+        action = self.dist_class.fast_action(self.module, self._single_obs, explore)
+        return action[0].cpu().numpy()
+
     @torch.no_grad()
     @override(Policy)
     def compute_log_likelihoods(
@@ -246,6 +301,15 @@ class TorchPolicy(Policy):
         # Optimizer state dicts don't store tensors, only ids
         self.optimizers.load_state_dict(weights["optimizers"])
 
+    @override(Policy)
+    def export_model(self, export_dir):
+        """Save the actor and observation preprocessing as a TorchScript file.
+
+        See :func:`raylab.policy.export.export_policy`.
+        """
+        os.makedirs(export_dir, exist_ok=True)
+        export_policy(self, os.path.join(export_dir, "policy.pt"))
+
     def convert_to_tensor(self, arr) -> Tensor:
         """Convert an array to a PyTorch tensor in this policy's device.
 
@@ -304,6 +368,7 @@ class TorchPolicy(Policy):
         passed = config.get("policy", {}).copy()
         passed.update({k: config[k] for k in self.pull_from_global if k in config})
         new = self.options.merge_defaults_with(passed)
+        check_precision(new["precision"])
         return new
 
     @staticmethod
@@ -331,8 +396,9 @@ class TorchPolicy(Policy):
         Returns:
             A mapping from names to optimizer instances
         """
-        # pylint:disable=no-self-use
-        return OptimizerCollection()
+        return OptimizerCollection(
+            precision=self.config["precision"], device=self.device
+        )
 
     def _unpack_observations(self, input_dict):
         restored = input_dict.copy()
@@ -393,9 +459,6 @@ class TorchPolicy(Policy):
     # Unimplemented Policy methods
     # ==========================================================================
 
-    def export_model(self, export_dir):
-        pass
-
     def export_checkpoint(self, export_dir):
         pass
 
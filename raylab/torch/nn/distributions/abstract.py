@@ -100,6 +100,18 @@ class ConditionalDistribution(nn.Module):
             return self.distribution.deterministic()
         return torch.tensor(np.nan).float(), torch.tensor(np.nan).float()
 
+    @torch.jit.export
+    def fisher_metric(self, params: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """Returns the diagonal of the Fisher information w.r.t. `params`.
+
+        The Fisher information matrix w.r.t. some upstream parameters can then
+        be computed as :math:`J^T M J`, where :math:`J` is the Jacobian of the
+        distribution parameters and :math:`M` the diagonal metric. An empty
+        dictionary means the metric has no closed form.
+        """
+        # pylint:disable=no-self-use
+        return {}
+
 
 class Distribution(nn.Module):
     """Unconditional Distribution.
@@ -279,6 +291,12 @@ class Independent(ConditionalDistribution):
             flows.utils.sum_rightmost(log_prob, self.reinterpreted_batch_ndims),
         )
 
+    @override(ConditionalDistribution)
+    @torch.jit.export
+    def fisher_metric(self, params: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        # The Fisher information of independent variables is the sum of theirs
+        return self.base_dist.fisher_metric(params)
+
 
 class TransformedDistribution(ConditionalDistribution):
     """
@@ -336,3 +354,14 @@ class TransformedDistribution(ConditionalDistribution):
         base_sample, base_log_prob = self.base_dist.deterministic(params)
         transformed, log_abs_det_jacobian = self.transform(base_sample, params)
         return transformed, base_log_prob - log_abs_det_jacobian
+
+    @override(ConditionalDistribution)
+    @torch.jit.export
+    def fisher_metric(self, params: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """Returns the Fisher metric of the base distribution.
+
+        The Fisher information is invariant to bijective transformations of the
+        random variable, provided they don't depend on the distribution
+        parameters.
+        """
+        return self.base_dist.fisher_metric(params)
@@ -69,6 +69,14 @@ class Categorical(ConditionalDistribution):
         sample = torch.argmax(logits, dim=-1)
         return sample, self.log_prob(sample, params)
 
+    @override(ConditionalDistribution)
+    @torch.jit.export
+    def fisher_metric(self, params: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        # Normalized logits are the log-probabilities, whose score function is
+        # the one-hot encoding of the sample
+        logits = self._unpack_params(params)
+        return {"logits": logits.exp()}
+
     def _unpack_params(self, params: Dict[str, torch.Tensor]):
         # pylint:disable=no-self-use
         return params["logits"]
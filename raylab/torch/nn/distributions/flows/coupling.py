@@ -303,13 +303,12 @@ class PiecewiseRQSCouplingTransform(PiecewiseCouplingTransform):
         return self.num_bins * 3 - 1
 
     def _piecewise_cdf(self, inputs, transform_params, reverse: bool = False):
-        unnormalized_widths = transform_params[..., : self.num_bins]
-        unnormalized_heights = transform_params[..., self.num_bins : 2 * self.num_bins]
+        unnormalized_widths = transform_params[..., : self.num_bins] * self.scale
+        unnormalized_heights = (
+            transform_params[..., self.num_bins : 2 * self.num_bins] * self.scale
+        )
         unnormalized_derivatives = transform_params[..., 2 * self.num_bins :]
 
-        unnormalized_widths *= self.scale
-        unnormalized_heights *= self.scale
-
         # Always use linear tails
         return unconstrained_rational_quadratic_spline(
             inputs=inputs,
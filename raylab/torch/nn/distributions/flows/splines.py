@@ -23,6 +23,12 @@ SOFTWARE.
 
 Slightly modified from:
 https://github.com/bayesiains/nsf/blob/master/nde/transforms/splines/rational_quadratic.py
+
+Unlike the original, inputs outside the tail bound are handled with
+`torch.where` instead of boolean-mask indexing and bins are located with
+`torch.searchsorted`, so that all intermediate tensors have the same shape as
+the inputs. This avoids gathers and scatters with data-dependent shapes,
+which TorchScript can't optimize.
 """
 # pylint:disable=missing-docstring,too-many-arguments,too-many-locals
 import math
@@ -36,9 +42,21 @@ DEFAULT_MIN_BIN_HEIGHT = 1e-3
 DEFAULT_MIN_DERIVATIVE = 1e-3
 
 
-def searchsorted(bin_locations, inputs, eps: float = 1e-6):
-    bin_locations[..., -1] += eps
-    return torch.sum(inputs[..., None] >= bin_locations, dim=-1) - 1
+if hasattr(torch, "searchsorted"):
+
+    def searchsorted(bin_locations, inputs):
+        """Index of the bin containing each input, clamped to the valid bins."""
+        # Interior edges only, so that inputs outside the bounds fall in the
+        # first or last bin
+        edges = bin_locations[..., 1:-1].contiguous()
+        return torch.searchsorted(edges, inputs[..., None], right=True)
+
+else:
+
+    def searchsorted(bin_locations, inputs):
+        """Index of the bin containing each input, clamped to the valid bins."""
+        edges = bin_locations[..., 1:-1]
+        return torch.sum(inputs[..., None] >= edges, dim=-1, keepdim=True)
 
 
 def unconstrained_rational_quadratic_spline(
@@ -53,25 +71,20 @@ def unconstrained_rational_quadratic_spline(
     min_derivative: float = DEFAULT_MIN_DERIVATIVE,
 ):
     inside_interval_mask = (inputs >= -tail_bound) & (inputs <= tail_bound)
-    outside_interval_mask = ~inside_interval_mask
-
-    outputs = torch.zeros_like(inputs)
-    logabsdet = torch.zeros_like(inputs)
 
     # Always use linear tails
-    unnormalized_derivatives = F.pad(unnormalized_derivatives, pad=(1, 1))
     constant = math.log(math.exp(1 - min_derivative) - 1)
-    unnormalized_derivatives[..., 0] = constant
-    unnormalized_derivatives[..., -1] = constant
-
-    outputs[outside_interval_mask] = inputs[outside_interval_mask]
-    logabsdet[outside_interval_mask] = torch.zeros_like(inputs[outside_interval_mask])
+    unnormalized_derivatives = F.pad(
+        unnormalized_derivatives, pad=(1, 1), mode="constant", value=constant
+    )
 
-    spline_out = rational_quadratic_spline(
-        inputs=inputs[inside_interval_mask],
-        unnormalized_widths=unnormalized_widths[inside_interval_mask, :],
-        unnormalized_heights=unnormalized_heights[inside_interval_mask, :],
-        unnormalized_derivatives=unnormalized_derivatives[inside_interval_mask, :],
+    # Evaluate the spline everywhere, clamping inputs so that values (and
+    # gradients) discarded for the identity tails are finite
+    spline_outputs, spline_logabsdet = rational_quadratic_spline(
+        inputs=inputs.clamp(-tail_bound, tail_bound),
+        unnormalized_widths=unnormalized_widths,
+        unnormalized_heights=unnormalized_heights,
+        unnormalized_derivatives=unnormalized_derivatives,
         inverse=inverse,
         left=-tail_bound,
         right=tail_bound,
@@ -81,7 +94,10 @@ def unconstrained_rational_quadratic_spline(
         min_bin_height=min_bin_height,
         min_derivative=min_derivative,
     )
-    outputs[inside_interval_mask], logabsdet[inside_interval_mask] = spline_out
+    outputs = torch.where(inside_interval_mask, spline_outputs, inputs)
+    logabsdet = torch.where(
+        inside_interval_mask, spline_logabsdet, torch.zeros_like(spline_logabsdet)
+    )
     return outputs, logabsdet
 
 
@@ -130,9 +146,9 @@ def rational_quadratic_spline(
     heights = cumheights[..., 1:] - cumheights[..., :-1]
 
     if inverse:
-        bin_idx = searchsorted(cumheights, inputs)[..., None]
+        bin_idx = searchsorted(cumheights, inputs)
     else:
-        bin_idx = searchsorted(cumwidths, inputs)[..., None]
+        bin_idx = searchsorted(cumwidths, inputs)
 
     input_cumwidths = cumwidths.gather(-1, bin_idx)[..., 0]
     input_bin_widths = widths.gather(-1, bin_idx)[..., 0]
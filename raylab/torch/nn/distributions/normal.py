@@ -7,6 +7,8 @@ import torch
 import torch.nn as nn
 from ray.rllib.utils import override
 
+from raylab.torch.utils import full_precision
+
 from .abstract import ConditionalDistribution
 
 
@@ -43,6 +45,11 @@ class Normal(ConditionalDistribution):
     @torch.jit.export
     def log_prob(self, value, params: Dict[str, torch.Tensor]):
         loc, scale = self._unpack_params(params)
+        value, loc, scale = (
+            full_precision(value),
+            full_precision(loc),
+            full_precision(scale),
+        )
         var = scale ** 2
         const = math.log(math.sqrt(2 * math.pi))
         return -((value - loc) ** 2) / (2 * var) - scale.log() - const
@@ -80,6 +87,13 @@ class Normal(ConditionalDistribution):
         sample = loc
         return sample, self.log_prob(sample, params)
 
+    @override(ConditionalDistribution)
+    @torch.jit.export
+    def fisher_metric(self, params: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        _, scale = self._unpack_params(params)
+        precision = scale.pow(-2)
+        return {"loc": precision, "scale": 2 * precision}
+
     def _unpack_params(self, params: Dict[str, torch.Tensor]):
         # pylint:disable=no-self-use
         return params["loc"], params["scale"]
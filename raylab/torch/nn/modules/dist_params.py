@@ -7,6 +7,7 @@ import torch.nn.functional as F
 from ray.rllib.utils import override
 
 from raylab.torch.nn.init import initialize_
+from raylab.torch.utils import full_precision
 
 from .leaf_parameter import LeafParameter
 
@@ -58,9 +59,9 @@ class PolicyNormalParams(nn.Module):
     @override(nn.Module)
     def forward(self, inputs: torch.Tensor) -> Dict[str, torch.Tensor]:
         # pylint:disable=arguments-differ
-        loc = self.loc_module(inputs)
+        loc = full_precision(self.loc_module(inputs))
 
-        log_scale = self.log_scale_module(inputs)
+        log_scale = full_precision(self.log_scale_module(inputs))
         log_scale = torch.clamp(log_scale, min=-20, max=2)
         scale = log_scale.exp()
 
@@ -108,9 +109,10 @@ class NormalParams(nn.Module):
     @override(nn.Module)
     def forward(self, inputs: torch.Tensor) -> Dict[str, torch.Tensor]:
         # pylint:disable=arguments-differ
-        loc = self.loc_module(inputs)
+        loc = full_precision(self.loc_module(inputs))
 
-        log_scale = self.log_scale_module(inputs)
+        # Keep logvar bounds in full precision under autocast
+        log_scale = full_precision(self.log_scale_module(inputs))
         max_logvar = self.max_logvar.expand_as(log_scale)
         min_logvar = self.min_logvar.expand_as(log_scale)
         log_scale = max_logvar - F.softplus(max_logvar - log_scale)
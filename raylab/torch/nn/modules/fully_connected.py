@@ -72,8 +72,29 @@ class StateActionEncoder(nn.Module):
     @override(nn.Module)
     def forward(self, obs: torch.Tensor, actions: torch.Tensor) -> torch.Tensor:
         # pylint:disable=arguments-differ
-        output = self.obs_module(obs)
-        output = torch.cat([output, actions], dim=-1)
+        return self.forward_with_features(self.encode_obs(obs), actions)
+
+    @torch.jit.export
+    def encode_obs(self, obs: torch.Tensor) -> torch.Tensor:
+        """Compute the action-independent features of observations.
+
+        These may be reused with :meth:`forward_with_features` to evaluate
+        many actions for the same observations.
+        """
+        return self.obs_module(obs)
+
+    @torch.jit.export
+    def forward_with_features(
+        self, features: torch.Tensor, actions: torch.Tensor
+    ) -> torch.Tensor:
+        """Encode actions along with precomputed observation features.
+
+        Features are broadcasted to any additional leading dimensions of the
+        actions, e.g., a sample dimension for many actions per observation.
+        """
+        if actions.dim() > features.dim():
+            features = features.expand(actions.shape[:-1] + features.shape[-1:])
+        output = torch.cat([features, actions], dim=-1)
         output = self.sequential_module(output)
         return output
 
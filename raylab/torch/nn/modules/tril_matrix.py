@@ -2,35 +2,51 @@
 import torch
 import torch.nn as nn
 from ray.rllib.utils import override
+from torch import Tensor
 
 
 class TrilMatrix(nn.Module):
-    """Neural network module which outputs a lower-triangular matrix."""
+    """Neural network module which outputs a lower-triangular matrix.
 
-    __constants__ = {"in_features", "matrix_dim", "row_sizes"}
+    Flattened lower-triangular entries are scattered into place with indices
+    precomputed at initialization. Diagonal entries are squared.
+    """
+
+    __constants__ = {"in_features", "matrix_dim"}
 
     def __init__(self, in_features, matrix_dim):
         super().__init__()
         self.in_features = in_features
         self.matrix_dim = matrix_dim
-        self.row_sizes = tuple(range(1, self.matrix_dim + 1))
         tril_dim = int(self.matrix_dim * (self.matrix_dim + 1) / 2)
         self.linear_module = nn.Linear(self.in_features, tril_dim)
 
+        # Row-major positions of the lower triangular entries in the flattened
+        # square matrix. Buffers are left out of the state dict since they are
+        # fully determined by the matrix dimension
+        rows, cols = torch.tril_indices(matrix_dim, matrix_dim)
+        self.register_buffer("flat_indices", rows * matrix_dim + cols, persistent=False)
+        self.register_buffer("diag_mask", rows == cols, persistent=False)
+
     @override(nn.Module)
     def forward(self, logits):  # pylint:disable=arguments-differ
         # Batch of flattened lower triangular matrices: [..., N * (N + 1) / 2]
-        flat_tril = self.linear_module(logits)
-        # Split flat lower triangular into rows
-        split_tril = torch.split(flat_tril, self.row_sizes, dim=-1)
-        # Compute exponentiated diagonals, row by row
-        tril_rows = []
-        for row in split_tril:
-            zeros = torch.zeros(row.shape[:-1] + (self.matrix_dim - row.shape[-1],))
-            decomposed_row = [row[..., :-1], row[..., -1:] ** 2, zeros]
-            tril_rows.append(torch.cat(decomposed_row, dim=-1))
-        # Stack rows into a single (batched) matrix. dim=-2 ensures that we stack then
-        # as rows, not columns (which would effectively transpose the matrix into an
-        # upper triangular one)
-        tril = torch.stack(tril_rows, dim=-2)
-        return tril
+        return self.tril_from_flat(self.linear_module(logits))
+
+    @torch.jit.export
+    def tril_from_flat(self, flat_tril: Tensor) -> Tensor:
+        """Scatter flattened lower triangular entries into square matrices.
+
+        Args:
+            flat_tril: Lower triangular entries, row by row, of shape
+                `(*, N * (N + 1) / 2)`
+
+        Returns:
+            Lower triangular matrices of shape `(*, N, N)` with squared
+            diagonals
+        """
+        flat_tril = torch.where(self.diag_mask, flat_tril ** 2, flat_tril)
+        shape = flat_tril.shape[:-1]
+        tril = flat_tril.new_zeros(shape + (self.matrix_dim * self.matrix_dim,))
+        tril = tril.index_copy(-1, self.flat_indices, flat_tril)
+        return tril.reshape(shape + (self.matrix_dim, self.matrix_dim))
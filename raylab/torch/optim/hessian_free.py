@@ -1,10 +1,35 @@
 """
 Hessian-free optimization utilities
 """
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
 import torch
+from torch import Tensor
 from torch.autograd import grad
 
 
+def _unflatten(vector: Tensor, params: List[Tensor]) -> List[Tensor]:
+    vecs, idx = [], 0
+    for par in params:
+        vecs += [vector[idx : idx + par.numel()].reshape_as(par)]
+        idx += par.numel()
+    return vecs
+
+
+def _flatten(grads: Sequence[Tensor], params: List[Tensor]) -> Tensor:
+    zeros = torch.zeros
+    return torch.cat(
+        [
+            (zeros(p.numel()) if g is None else g.flatten())
+            for g, p in zip(grads, params)
+        ]
+    )
+
+
 def hessian_vector_product(output, params, vector):
     """Computes the Hessian vector product w.r.t to a scalar loss.
 
@@ -17,16 +42,51 @@ def hessian_vector_product(output, params, vector):
     """
     # pylint:disable=missing-docstring
     params = list(params)
-    vecs, idx = [], 0
-    for par in params:
-        vecs += [vector[idx : idx + par.numel()].reshape_as(par)]
-        idx += par.numel()
+    vecs = _unflatten(vector, params)
     grads = grad(output, params, allow_unused=True, create_graph=True)
     hvp = grad([g for g in grads if g is not None], params, vecs, allow_unused=True)
-    zeros = torch.zeros
-    return torch.cat(
-        [(zeros(p.numel()) if v is None else v.flatten()) for v, p in zip(hvp, params)]
-    )
+    return _flatten(hvp, params)
+
+
+def fisher_vector_product(
+    outputs: Sequence[Tensor], metrics: Sequence[Tensor], params: Sequence[Tensor]
+) -> Callable[[Tensor], Tensor]:
+    """Returns a function computing Fisher-vector products w.r.t. parameters.
+
+    Computes :math:`J^T M J v`, where :math:`J` is the Jacobian of the outputs
+    w.r.t. the parameters and :math:`M` the diagonal Fisher metric of the
+    outputs, e.g., the parameters of a distribution. The Jacobian-vector
+    product is obtained with the double-backward trick, so that each product
+    costs two backward passes through the graph of the outputs, which is
+    built only once.
+
+    Args:
+        outputs: Tensors computed from the parameters
+        metrics: Diagonal Fisher metric for each output, with the same shape.
+            Should include any averaging over the batch
+        params: The parameters to compute the Fisher information w.r.t.
+
+    Returns:
+        A function mapping flattened vectors with the same total number of
+        elements in `params` to their product with the Fisher matrix
+    """
+    outputs, metrics, params = list(outputs), list(metrics), list(params)
+    dummies = [torch.zeros_like(o, requires_grad=True) for o in outputs]
+    jac_t = grad(outputs, params, dummies, create_graph=True, allow_unused=True)
+    used = [i for i, j in enumerate(jac_t) if j is not None]
+    jac_t = [jac_t[i] for i in used]
+
+    def fvp(vector: Tensor) -> Tensor:
+        vecs = _unflatten(vector, params)
+        vecs = [vecs[i] for i in used]
+        jvp = grad(jac_t, dummies, vecs, retain_graph=True, allow_unused=True)
+        m_jvp = [
+            torch.zeros_like(m) if j is None else m * j for m, j in zip(metrics, jvp)
+        ]
+        prod = grad(outputs, params, m_jvp, retain_graph=True, allow_unused=True)
+        return _flatten(prod, params)
+
+    return fvp
 
 
 def conjugate_gradient(f_mat_vec_prod, b, cg_iters=10, residual_tol=1e-6):
@@ -83,3 +143,73 @@ def line_search(
                 return x_new, expected_improvement * ratio, improvement
 
     return x_0, expected_improvement, 0
+
+
+@torch.no_grad()
+def batched_line_search(
+    func: Callable[[Tensor], Tensor],
+    x_0: Tensor,
+    d_x: Tensor,
+    expected_improvement: float,
+    y_0: Optional[float] = None,
+    accept_ratio: float = 0.1,
+    backtrack_ratio: float = 0.8,
+    max_backtracks: int = 15,
+    atol: float = 1e-7,
+    chunk_size: Optional[int] = None,
+) -> Tuple[Tensor, float, float]:
+    """Perform a linesearch evaluating backtracking steps in batches.
+
+    Equivalent to :func:`line_search`, but `func` receives candidates
+    :math:`x_0 - r^k d_x` stacked along a new leading dimension and should
+    return a tensor with their values, e.g., by using batched parameters.
+    The first candidate satisfying the Armijo condition in each chunk is
+    selected without synchronizing with the device for each candidate. Later
+    chunks are only evaluated if no candidate in the previous ones was
+    accepted.
+
+    Args:
+        func: Function mapping a `(K, *)` tensor of candidates to a `(K,)`
+            tensor of values, where `K` is at most `chunk_size`. Infeasible
+            candidates should have infinite value
+        x_0: Starting point
+        d_x: Descent direction, with the same shape as `x_0`
+        expected_improvement: Expected improvement for the full step
+        y_0: Value of `func` at `x_0`. Computed if not provided
+        accept_ratio: Minimum ratio between actual and expected improvement
+        backtrack_ratio: Step size decay between candidates
+        max_backtracks: Number of candidates
+        atol: Minimum expected improvement to perform the search
+        chunk_size: Maximum number of candidates to evaluate at once. Defaults
+            to all candidates. Use 1 to recover the early exit of
+            :func:`line_search` when `func` evaluates candidates sequentially
+
+    Returns:
+        The selected point, its expected improvement, and its actual
+        improvement. Returns `x_0` if no candidate was accepted.
+    """
+    # pylint:disable=too-many-arguments,too-many-locals
+    if y_0 is None:
+        y_0 = func(x_0.unsqueeze(0))[0].item()
+
+    if expected_improvement >= atol:
+        chunk_size = chunk_size or max_backtracks
+        for start in range(0, max_backtracks, chunk_size):
+            end = min(start + chunk_size, max_backtracks)
+            exps = torch.arange(start, end, dtype=x_0.dtype, device=x_0.device)
+            ratios = backtrack_ratio ** exps
+            candidates = x_0 - ratios.reshape((-1,) + (1,) * x_0.dim()) * d_x
+            improvements = y_0 - func(candidates)
+            # Armijo condition
+            accepted = improvements / (expected_improvement * ratios) >= accept_ratio
+            # Weigh candidates in decreasing order so that the first accepted
+            # one is the unique maximum
+            idx = (accepted.to(ratios) * (max_backtracks - exps)).argmax()
+            if accepted[idx].item():
+                return (
+                    candidates[idx],
+                    expected_improvement * ratios[idx].item(),
+                    improvements[idx].item(),
+                )
+
+    return x_0, expected_improvement, 0
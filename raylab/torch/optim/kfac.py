@@ -16,6 +16,7 @@ copies or substantial portions of the Software.
 Adapted from: https://github.com/Thrandis/EKFAC-pytorch
 """
 import contextlib
+from concurrent.futures import ThreadPoolExecutor
 
 import torch
 import torch.nn as nn
@@ -23,10 +24,34 @@ import torch.nn.functional as F
 from torch.optim import Optimizer
 
 
+def _add_to_diag(mat, value):
+    """Returns a copy of a square matrix with `value` added to its diagonal."""
+    mat = mat.clone()
+    mat.diagonal().add_(value)
+    return mat
+
+
+def _symeig(mat):
+    """Eigendecomposition of a symmetric matrix, across PyTorch versions."""
+    if hasattr(torch, "linalg") and hasattr(torch.linalg, "eigh"):
+        return torch.linalg.eigh(mat)
+    return torch.symeig(mat, eigenvectors=True)
+
+
 class KFACMixin:
-    """Adds methods for forward hooks, covariance computation and updating."""
+    """Adds methods for forward hooks, covariance computation and updating.
+
+    If amortized, the covariances due for processing are handed to a worker
+    thread, which computes their inverses or eigendecompositions while
+    :meth:`step` keeps preconditioning gradients with the last published
+    results. Finished results are published at the start of the next step.
+    New work is only submitted once the previous results were published, so
+    that steps never wait for the worker. The first processing of each layer
+    is always synchronous.
+    """
 
     # pylint:disable=assignment-from-no-return,invalid-name
+    _processed_key = None
 
     @contextlib.contextmanager
     def record_stats(self):
@@ -68,6 +93,8 @@ class KFACMixin:
 
     def step(self):  # pylint:disable=arguments-differ
         """Preconditions and applies gradients."""
+        self._publish_processed()
+        snapshots = {}
         fisher_norm = 0.0
         for group in self.param_groups[:-1]:
             # Getting parameters
@@ -79,7 +106,14 @@ class KFACMixin:
             state.setdefault("step", 0)
             state.update(self._compute_covs(group, state))
             if state["step"] % self.update_freq == 0:
-                state.update(self._process_covs(state))
+                if self._executor is None or self._processed_key not in state:
+                    state.update(self._process_covs(state))
+                elif self._pending is None:
+                    # Covariances are replaced, not updated in-place, on every
+                    # step, so these references are a consistent snapshot
+                    snapshots[weight] = {
+                        k: state[k] for k in "xxt ggt num_locations".split()
+                    }
             state["step"] += 1
 
             # Preconditionning
@@ -96,6 +130,9 @@ class KFACMixin:
             self.state[weight].pop("x", None)
             self.state[weight].pop("gy", None)
 
+        if snapshots:
+            self._pending = self._executor.submit(self._process_snapshots, snapshots)
+
         fisher_norm += sum(
             (p.grad * p.grad).sum() for p in self.param_groups[-1]["params"]
         )
@@ -107,6 +144,20 @@ class KFACMixin:
                 param.grad.data.mul_(scale)
                 param.data.sub_(param.grad.data, alpha=group["lr"])
 
+    def synchronize(self):
+        """Waits for pending covariance processing and publishes its results."""
+        self._publish_processed(wait=True)
+
+    def _publish_processed(self, wait=False):
+        if self._pending is not None and (wait or self._pending.done()):
+            for weight, processed in self._pending.result().items():
+                self.state[weight].update(processed)
+            self._pending = None
+
+    def _process_snapshots(self, snapshots):
+        with torch.no_grad():
+            return {w: self._process_covs(s) for w, s in snapshots.items()}
+
     def _compute_covs(self, group, state):
         """Computes the covariances."""
 
@@ -119,6 +170,8 @@ class KFACMixin:
     def __del__(self):
         for handle in self._fwd_handles + self._bwd_handles:
             handle.remove()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
 
 
 class KFAC(KFACMixin, Optimizer):
@@ -136,9 +189,12 @@ class KFAC(KFACMixin, Optimizer):
         alpha (float): Running average parameter (if == 1, no r. ave.).
         kl_clip (float): Scale the gradients by the squared fisher norm.
         eta (float): upper bound for gradient scaling.
+        amortize (bool): Compute inverses in a background thread, while
+            preconditioning with the last ones computed.
     """
 
     # pylint:disable=invalid-name,too-many-instance-attributes
+    _processed_key = "ixxt"
 
     def __init__(
         self,
@@ -151,6 +207,7 @@ class KFAC(KFACMixin, Optimizer):
         kl_clip=1e-3,
         eta=1.0,
         lr=1.0,
+        amortize=False,
     ):
         # pylint:disable=too-many-arguments,too-many-locals
         assert isinstance(net, nn.Module), "KFAC needs access to module structure."
@@ -163,6 +220,8 @@ class KFAC(KFACMixin, Optimizer):
         self._fwd_handles = []
         self._bwd_handles = []
         self._recording = False
+        self._executor = ThreadPoolExecutor(max_workers=1) if amortize else None
+        self._pending = None
 
         param_groups = []
         param_set = set()
@@ -236,10 +295,8 @@ class KFAC(KFACMixin, Optimizer):
 
         # Regularizes and inverts
         eps = self.eps / num_locations
-        diag_xxt = torch.diag(torch.empty(xxt.shape[0]).fill_(torch.sqrt(eps * pi)))
-        diag_ggt = torch.diag(torch.empty(ggt.shape[0]).fill_(torch.sqrt(eps / pi)))
-        ixxt = (xxt + diag_xxt).inverse()
-        iggt = (ggt + diag_ggt).inverse()
+        ixxt = _add_to_diag(xxt, (eps * pi) ** 0.5).inverse()
+        iggt = _add_to_diag(ggt, (eps / pi) ** 0.5).inverse()
         return {"ixxt": ixxt, "iggt": iggt}
 
     def _precond(self, weight, bias, group, state):
@@ -305,9 +362,12 @@ class EKFAC(KFACMixin, Optimizer):
         alpha (float): Running average parameter (if == 1, no r. ave.).
         kl_clip (float): Scale the gradients by the squared fisher norm.
         eta (float): upper bound for gradient scaling.
+        amortize (bool): Compute eigen-bases in a background thread, while
+            preconditioning with the last ones computed.
     """
 
     # pylint:disable=invalid-name
+    _processed_key = "ua"
 
     def __init__(
         self,
@@ -318,6 +378,7 @@ class EKFAC(KFACMixin, Optimizer):
         kl_clip=1e-3,
         eta=1.0,
         lr=1.0,
+        amortize=False,
     ):
         # pylint:disable=too-many-arguments
         assert isinstance(net, nn.Module), "EKFAC needs access to module structure."
@@ -328,6 +389,8 @@ class EKFAC(KFACMixin, Optimizer):
         self._fwd_handles = []
         self._bwd_handles = []
         self._recording = False
+        self._executor = ThreadPoolExecutor(max_workers=1) if amortize else None
+        self._pending = None
 
         param_groups = []
         param_set = set()
@@ -379,11 +442,8 @@ class EKFAC(KFACMixin, Optimizer):
         # Regularizes and inverts
         pi = (torch.trace(xxt) * ggt.shape[0]) / (torch.trace(ggt) * xxt.shape[0])
         eps = self.eps
-        diag_xxt = torch.diag(torch.empty(xxt.shape[0]).fill_(torch.sqrt(eps * pi)))
-        diag_ggt = torch.diag(torch.empty(ggt.shape[0]).fill_(torch.sqrt(eps / pi)))
-
-        sa, ua = torch.symeig(xxt + diag_xxt, eigenvectors=True)
-        sb, ub = torch.symeig(ggt + diag_ggt, eigenvectors=True)
+        sa, ua = _symeig(_add_to_diag(xxt, (eps * pi) ** 0.5))
+        sb, ub = _symeig(_add_to_diag(ggt, (eps / pi) ** 0.5))
         m2 = sb.unsqueeze(1) * sa.unsqueeze(0)
         return {"ua": ua, "ub": ub, "m2": m2}
 
@@ -13,6 +13,7 @@ Notes:
         http://www.apache.org/licenses/LICENSE-2.0
 """
 import math
+from collections import defaultdict
 from typing import Callable
 from typing import Iterator
 from typing import Optional
@@ -26,6 +27,11 @@ from torch.optim import Optimizer
 class RAdam(Optimizer):
     r"""Rectified Adam
 
+    If `foreach` is set, parameters are grouped by device, dtype and step
+    count, and each group is updated with multi-tensor (``torch._foreach_*``)
+    kernels instead of one parameter at a time. By default, these are used
+    for parameter groups entirely on CUDA, like PyTorch's built-in optimizers.
+
     Reference:
         Liu, Liyuan, et al.
         "On the variance of the adaptive learning rate and beyond."
@@ -40,6 +46,7 @@ class RAdam(Optimizer):
         eps: float = 1e-8,
         weight_decay: float = 0,
         degenerated_to_sgd: bool = True,
+        foreach: Optional[bool] = None,
     ):
         # pylint:disable=too-many-arguments
         if lr < 0:
@@ -52,6 +59,7 @@ class RAdam(Optimizer):
             raise ValueError("Invalid beta parameter at index 1: {}".format(betas[1]))
 
         self.degenerated_to_sgd = degenerated_to_sgd
+        self.foreach = foreach
         if (
             isinstance(params, (list, tuple))
             and len(params) > 0
@@ -80,6 +88,15 @@ class RAdam(Optimizer):
             loss = closure()
 
         for group in self.param_groups:
+            foreach = self.foreach
+            if foreach is None:
+                foreach = hasattr(torch, "_foreach_addcdiv_") and all(
+                    p.is_cuda for p in group["params"]
+                )
+            if foreach:
+                self._foreach_update(group)
+                continue
+
             for p in group["params"]:
                 if p.grad is None:
                     continue
@@ -106,32 +123,7 @@ class RAdam(Optimizer):
                 exp_avg.mul_(beta1).add_(grad, alpha=1 - beta1)
 
                 state["step"] += 1
-                buffered = group["buffer"][int(state["step"] % 10)]
-                if state["step"] == buffered[0]:
-                    N_sma, step_size = buffered[1], buffered[2]
-                else:
-                    buffered[0] = state["step"]
-                    beta2_t = beta2 ** state["step"]
-                    N_sma_max = 2 / (1 - beta2) - 1
-                    N_sma = N_sma_max - 2 * state["step"] * beta2_t / (1 - beta2_t)
-                    buffered[1] = N_sma
-
-                    # more conservative since it's an approximated value
-                    if N_sma >= 5:
-                        step_size = math.sqrt(
-                            (1 - beta2_t)
-                            * (N_sma - 4)
-                            / (N_sma_max - 4)
-                            * (N_sma - 2)
-                            / N_sma
-                            * N_sma_max
-                            / (N_sma_max - 2)
-                        ) / (1 - beta1 ** state["step"])
-                    elif self.degenerated_to_sgd:
-                        step_size = 1.0 / (1 - beta1 ** state["step"])
-                    else:
-                        step_size = -1
-                    buffered[2] = step_size
+                N_sma, step_size = self._rectification(group, state["step"])
 
                 # more conservative since it's an approximated value
                 if N_sma >= 5:
@@ -152,6 +144,91 @@ class RAdam(Optimizer):
 
         return loss
 
+    def _rectification(self, group: dict, step: int) -> Tuple[float, float]:
+        """Returns the SMA length and the step size, cached for each step count."""
+        # pylint:disable=invalid-name
+        beta1, beta2 = group["betas"]
+        buffered = group["buffer"][int(step % 10)]
+        if step == buffered[0]:
+            N_sma, step_size = buffered[1], buffered[2]
+        else:
+            buffered[0] = step
+            beta2_t = beta2 ** step
+            N_sma_max = 2 / (1 - beta2) - 1
+            N_sma = N_sma_max - 2 * step * beta2_t / (1 - beta2_t)
+            buffered[1] = N_sma
+
+            # more conservative since it's an approximated value
+            if N_sma >= 5:
+                step_size = math.sqrt(
+                    (1 - beta2_t)
+                    * (N_sma - 4)
+                    / (N_sma_max - 4)
+                    * (N_sma - 2)
+                    / N_sma
+                    * N_sma_max
+                    / (N_sma_max - 2)
+                ) / (1 - beta1 ** step)
+            elif self.degenerated_to_sgd:
+                step_size = 1.0 / (1 - beta1 ** step)
+            else:
+                step_size = -1
+            buffered[2] = step_size
+        return N_sma, step_size
+
+    def _foreach_update(self, group: dict):
+        """Update the parameters in a group with multi-tensor kernels."""
+        # pylint:disable=invalid-name,too-many-locals,protected-access
+        beta1, beta2 = group["betas"]
+        buckets = defaultdict(list)
+        for p in group["params"]:
+            if p.grad is None:
+                continue
+            if p.grad.is_sparse:
+                raise RuntimeError("RAdam does not support sparse gradients")
+
+            state = self.state[p]
+            if len(state) == 0:
+                state["step"] = 0
+                state["exp_avg"] = torch.zeros_like(p, dtype=torch.float)
+                state["exp_avg_sq"] = torch.zeros_like(p, dtype=torch.float)
+            state["step"] += 1
+            buckets[(p.device, p.dtype, state["step"])].append(p)
+
+        for (_, dtype, step), params in buckets.items():
+            grads = [p.grad.data.float() for p in params]
+            params_fp32 = [p.data.float() for p in params]
+            exp_avgs = [self.state[p]["exp_avg"] for p in params]
+            exp_avg_sqs = [self.state[p]["exp_avg_sq"] for p in params]
+
+            torch._foreach_mul_(exp_avg_sqs, beta2)
+            torch._foreach_addcmul_(exp_avg_sqs, grads, grads, value=1 - beta2)
+            torch._foreach_mul_(exp_avgs, beta1)
+            torch._foreach_add_(exp_avgs, grads, alpha=1 - beta1)
+
+            N_sma, step_size = self._rectification(group, step)
+            if N_sma < 5 and step_size <= 0:
+                continue
+
+            if group["weight_decay"] != 0:
+                torch._foreach_mul_(
+                    params_fp32, 1 - group["weight_decay"] * group["lr"]
+                )
+            if N_sma >= 5:
+                denom = torch._foreach_sqrt(exp_avg_sqs)
+                torch._foreach_add_(denom, group["eps"])
+                torch._foreach_addcdiv_(
+                    params_fp32, exp_avgs, denom, value=-step_size * group["lr"]
+                )
+            else:
+                torch._foreach_add_(
+                    params_fp32, exp_avgs, alpha=-step_size * group["lr"]
+                )
+
+            if dtype != torch.float:
+                for p, p_data_fp32 in zip(params, params_fp32):
+                    p.data.copy_(p_data_fp32)
+
 
 class PlainRAdam(Optimizer):
     """Plain version of RAdam optimizer."""
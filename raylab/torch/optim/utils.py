@@ -1,5 +1,7 @@
 """Utilities for building optimizers."""
 import contextlib
+import inspect
+import warnings
 from typing import Type
 
 import torch
@@ -29,11 +31,19 @@ OPTIMIZERS.update(
         "AdamW": AdamW,
     }
 )
+# Options selecting multi-tensor or fused implementations, which only some
+# optimizers (and PyTorch versions) support
+IMPLEMENTATION_KEYS = ("foreach", "fused")
 
 
 def build_optimizer(module: nn.Module, config: dict, wrap: bool = False) -> Optimizer:
     """Build optimizer with the desired config and tied to a module.
 
+    The config may set any of :data:`IMPLEMENTATION_KEYS`, e.g.,
+    `{"type": "Adam", "foreach": True}`, to select multi-tensor or fused
+    update kernels. These are only passed to optimizers that accept them, and
+    ignored with a warning otherwise.
+
     Args:
         module: the module to tie the optimizer to (or its parameters)
         config: mapping containing the 'type' of the optimizer and additional
@@ -41,7 +51,13 @@ def build_optimizer(module: nn.Module, config: dict, wrap: bool = False) -> Opti
         wrap: whether to wrap the class with :func:`wrap_optim_cls`.
     """
     cls = get_optimizer_class(config["type"], wrap=wrap)
-    return link_optimizer(cls, module, all_except(config, "type"))
+    config = all_except(config, "type")
+    params = inspect.signature(cls.__init__).parameters
+    for key in IMPLEMENTATION_KEYS:
+        if key in config and key not in params:
+            warnings.warn(f"{cls.__name__} doesn't accept '{key}'. Ignoring it.")
+            config = all_except(config, key)
+    return link_optimizer(cls, module, config)
 
 
 def get_optimizer_class(name: str, wrap: bool = True) -> Type[Optimizer]:
@@ -1,12 +1,29 @@
 """PyTorch related utilities."""
+import contextlib
+import itertools
+from typing import Any
+from typing import ContextManager
 from typing import Dict
 from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
 from typing import Union
 
 import numpy as np
 import torch
+import torch.nn as nn
 from torch import Tensor
 from torch.autograd import grad
+from torch.nn.utils import parameters_to_vector
+from torch.nn.utils import vector_to_parameters
+
+# float16 is left out on purpose: it needs loss scaling (GradScaler) to avoid
+# gradient underflow, which bfloat16's float32-like range doesn't
+PRECISIONS = {
+    "float32": torch.float32,
+    "bfloat16": torch.bfloat16,
+}
 
 
 def flat_grad(
@@ -21,6 +38,170 @@ def flat_grad(
     )
 
 
+def vmap_available() -> bool:
+    """Whether :mod:`torch.func` is available to vectorize module calls."""
+    return hasattr(torch, "func")
+
+
+class _MethodCall(nn.Module):
+    # Calls a module's method in `forward`, for use with functional calls
+    # pylint:disable=abstract-method
+    def __init__(self, module: nn.Module, method: str):
+        super().__init__()
+        self.module = module
+        self.method = method
+
+    def forward(self, *args):  # pylint:disable=arguments-differ
+        return getattr(self.module, self.method)(*args)
+
+
+def batched_module_call(
+    module: nn.Module,
+    flat_params: Tensor,
+    method: str,
+    *args,
+    batched_args: bool = False,
+) -> Tensor:
+    """Evaluate a module's method with each of a batch of parameter vectors.
+
+    Uses :func:`torch.func.vmap` over :func:`torch.func.functional_call`
+    (PyTorch >= 2.0) to evaluate all parameter vectors in a single batched
+    pass. Otherwise, loads each parameter vector into the module in turn and
+    restores the original parameters afterwards.
+
+    Args:
+        module: The module to evaluate
+        flat_params: Parameter vectors of shape `(K, P)`, where `P` is the
+            total number of elements in `module.parameters()`, flattened in
+            that order
+        method: Name of the module's method to call
+        *args: Inputs to the method, shared by all parameter vectors
+        batched_args: Whether the inputs have a leading dimension of size `K`
+            instead, so that each parameter vector gets its own inputs
+
+    Returns:
+        The method's outputs for each parameter vector, stacked along a new
+        leading dimension of size `K`
+    """
+    named_params = list(module.named_parameters())
+    params = [p for _, p in named_params]
+    if vmap_available():
+        batched, idx = {}, 0
+        for name, par in named_params:
+            numel = par.numel()
+            batched["module." + name] = flat_params[:, idx : idx + numel].reshape(
+                (-1,) + par.shape
+            )
+            idx += numel
+        wrapper = _MethodCall(module, method)
+        return torch.func.vmap(
+            # Parameters are replaced in their owning modules, so submodules
+            # registered under many names remain shared
+            lambda params, *args: torch.func.functional_call(
+                wrapper, params, args, tie_weights=False
+            ),
+            in_dims=(0,) + (0 if batched_args else None,) * len(args),
+        )(batched, *args)
+
+    original = parameters_to_vector(params)
+    outputs = []
+    try:
+        for idx, vector in enumerate(flat_params):
+            vector_to_parameters(vector, params)
+            inputs = [a[idx] for a in args] if batched_args else args
+            outputs += [getattr(module, method)(*inputs)]
+    finally:
+        vector_to_parameters(original, params)
+    return torch.stack(outputs)
+
+
+def vmap_module_call(
+    modules: Sequence[nn.Module],
+    method: str,
+    *args,
+    in_dims: Optional[Sequence[Optional[int]]] = None,
+) -> List[Any]:
+    """Evaluate a method of structurally identical modules in a vectorized pass.
+
+    Stacks the parameters and buffers of all modules along a new leading
+    dimension and maps :func:`torch.func.functional_call` over them with
+    :func:`torch.func.vmap` (PyTorch >= 2.0). Stacking is differentiable, so
+    gradients flow back to each module's own parameters. Random operations
+    draw different samples for each module. Otherwise, calls each module in
+    turn.
+
+    Note:
+        The functional API does not support modules compiled with TorchScript.
+
+    Args:
+        modules: Modules with the same parameter and buffer names and shapes
+        method: Name of the modules' method to call
+        *args: Inputs to the method. May be tensors or (nested) dicts, lists
+            and tuples of tensors
+        in_dims: For each input, `0` if it is stacked along a leading dimension
+            of size `len(modules)`, one slice for each module, or `None` if it
+            is shared by all modules. Defaults to all shared
+
+    Returns:
+        List with the outputs of each module
+    """
+    in_dims = tuple(in_dims) if in_dims is not None else (None,) * len(args)
+    if not vmap_available():
+        return [
+            getattr(module, method)(
+                *(tree_index(a, idx) if d == 0 else a for a, d in zip(args, in_dims))
+            )
+            for idx, module in enumerate(modules)
+        ]
+
+    states = [
+        dict(itertools.chain(m.named_parameters(), m.named_buffers())) for m in modules
+    ]
+    stacked = {
+        "module." + name: torch.stack([s[name] for s in states]) for name in states[0]
+    }
+    wrapper = _MethodCall(modules[0], method)
+    outputs = torch.func.vmap(
+        lambda state, *args: torch.func.functional_call(
+            wrapper, state, args, tie_weights=False
+        ),
+        in_dims=(0,) + in_dims,
+        randomness="different",
+    )(stacked, *args)
+    return [tree_index(outputs, idx) for idx in range(len(modules))]
+
+
+def tree_stack(trees: Sequence[Any]) -> Any:
+    """Stack tensors at the same position in a sequence of nested structures.
+
+    Args:
+        trees: Tensors or (nested) dicts, lists and tuples of tensors, all with
+            the same structure
+
+    Returns:
+        A single structure whose tensors have a new leading dimension of size
+        `len(trees)`
+    """
+    first = trees[0]
+    if isinstance(first, Tensor):
+        return torch.stack(trees)
+    if isinstance(first, dict):
+        return {k: tree_stack([t[k] for t in trees]) for k in first}
+    return type(first)(tree_stack(items) for items in zip(*trees))
+
+
+def tree_index(tree: Any, idx: int) -> Any:
+    """Index the leading dimension of every tensor in a nested structure.
+
+    Inverse of :func:`tree_stack`.
+    """
+    if isinstance(tree, Tensor):
+        return tree[idx]
+    if isinstance(tree, dict):
+        return {k: tree_index(v, idx) for k, v in tree.items()}
+    return type(tree)(tree_index(v, idx) for v in tree)
+
+
 def convert_to_tensor(arr, device: torch.device) -> Tensor:
     """Convert array-like object to tensor and cast it to appropriate device.
 
@@ -39,6 +220,65 @@ def convert_to_tensor(arr, device: torch.device) -> Tensor:
     return tensor.to(device)
 
 
+def check_precision(precision: str):
+    """Check whether losses can be computed in a floating point precision.
+
+    Args:
+        precision: Name of the floating point type. Either 'float32' or
+            'bfloat16'
+
+    Raises:
+        ValueError: If `precision` is not a known floating point type
+        RuntimeError: If `precision` needs :class:`torch.autocast`, which is
+            only available in PyTorch >= 1.10
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(
+            f"Unknown precision '{precision}'. Choose one of {list(PRECISIONS)}"
+        )
+    if precision != "float32" and not hasattr(torch, "autocast"):
+        raise RuntimeError(
+            f"'{precision}' precision requires torch.autocast (PyTorch >= 1.10)"
+        )
+
+
+def autocast_context(precision: str, device: torch.device) -> ContextManager:
+    """Returns a context in which ops run in the desired floating point precision.
+
+    Uses automatic mixed precision (:class:`torch.autocast`) for lower precision
+    types. Parameters and their gradients are unaffected, i.e., they remain in
+    the dtype they were created with.
+
+    Args:
+        precision: Name of the floating point type. Either 'float32' or
+            'bfloat16'
+        device: Device in which the computations will be performed
+
+    Returns:
+        A context manager. A no-op context if `precision` is 'float32'.
+
+    Raises:
+        ValueError: If `precision` is not a known floating point type
+        RuntimeError: If the current PyTorch version does not support autocast
+            in `device`
+    """
+    check_precision(precision)
+    if precision == "float32":
+        return contextlib.nullcontext()
+    return torch.autocast(device.type, dtype=PRECISIONS[precision])
+
+
+def full_precision(tensor: Tensor) -> Tensor:
+    """Cast half precision tensors to single precision.
+
+    Useful for numerically sensitive operations (e.g., log-likelihoods) under
+    autocast. Tensors of other types are returned as is.
+    """
+    if tensor.dtype == torch.float16 or tensor.dtype == torch.bfloat16:
+        return tensor.float()
+    return tensor
+
+
 class TensorDictDataset(torch.utils.data.Dataset):
     """Dataset wrapping a dict of tensors.
 
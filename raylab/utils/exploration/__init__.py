@@ -1,6 +1,7 @@
 """Collection of Exploration classes for `TorchPolicy`s."""
 from .gaussian_noise import GaussianNoise
 from .parameter_noise import ParameterNoise
+from .parameter_noise import PopulationParameterNoise
 from .random_uniform import RandomUniform
 from .stochastic_actor import StochasticActor
 
@@ -8,6 +9,7 @@ from .stochastic_actor import StochasticActor
 __all__ = [
     "GaussianNoise",
     "ParameterNoise",
+    "PopulationParameterNoise",
     "RandomUniform",
     "StochasticActor",
 ]
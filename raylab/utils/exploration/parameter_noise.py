@@ -1,14 +1,20 @@
 # pylint:disable=missing-module-docstring
 from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
 import torch
+import torch.nn as nn
 from ray.rllib import SampleBatch
 from ray.rllib.models.action_dist import ActionDistribution
+from torch import Tensor
+from torch.nn.utils import parameters_to_vector
 
 from raylab.policy import TorchPolicy
 from raylab.torch.nn.utils import perturb_params
+from raylab.torch.utils import batched_module_call
 from raylab.utils.param_noise import AdaptiveParamNoiseSpec
 from raylab.utils.param_noise import ddpg_distance_metric
 
@@ -96,3 +102,176 @@ class ParameterNoise(RandomUniform):
             "Target and behavior policy cannot share parameters in parameter "
             "noise exploration."
         )
+
+
+class PopulationParameterNoise(ParameterNoise):
+    """Adaptive parameter noise with one perturbed policy per sub-environment.
+
+    Keeps a population of perturbations of the actor's parameters, stacked
+    along a leading dimension, and computes the actions of all members in a
+    single batched functional forward pass. Each episode is assigned a free
+    member when it starts, which is resampled from the current actor, and
+    keeps it until it ends. With `num_envs_per_worker` equal to
+    `population_size`, each vectorized sub-environment thus acts with its own
+    perturbed policy regardless of its row in the observation batch.
+
+    Rows are assigned to members in round-robin order when actions are
+    computed without episodes. The noise stddev is kept and adapted on the
+    policy's device.
+
+    Args:
+        population_size: Number of perturbed policies
+        param_noise_spec: Arguments for `AdaptiveParamNoiseSpec`.
+    """
+
+    def __init__(self, *args, population_size: int = 1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._population_size = population_size
+        self._population = None
+        self._members: Dict[Any, int] = {}
+        self._episode_ids: Optional[List[Any]] = None
+        self._stddev = None
+
+    def before_compute_actions(self, *, episodes: Optional[list] = None, **kwargs):
+        # pylint:disable=arguments-differ
+        super().before_compute_actions(**kwargs)
+        self._episode_ids = (
+            None if episodes is None else [ep.episode_id for ep in episodes]
+        )
+
+    def get_exploration_action(
+        self,
+        *,
+        action_distribution: ActionDistribution,
+        timestep: int,
+        explore: bool = True,
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        if explore and timestep >= self._pure_exploration_steps:
+            return self._population_action(action_distribution), None
+        return super().get_exploration_action(
+            action_distribution=action_distribution,
+            timestep=timestep,
+            explore=explore,
+        )
+
+    def _population_action(self, action_distribution: ActionDistribution) -> Tensor:
+        actor = action_distribution.model.actor
+        obs = action_distribution.inputs["obs"]
+        if self._population is None:
+            self.perturb_population(actor)
+
+        members = self._row_members(obs.size(0), obs.device)
+        actions = batched_module_call(
+            actor,
+            self._population[members],
+            "forward",
+            obs.unsqueeze(1),
+            batched_args=True,
+        )
+        return actions.squeeze(1)
+
+    def on_episode_start(
+        self,
+        policy: TorchPolicy,
+        *,
+        environment: Any = None,
+        episode: Any = None,
+        tf_sess: Any = None,
+    ):
+        # pylint:disable=unused-argument
+        members = None if episode is None else [self._assign_member(episode.episode_id)]
+        self.perturb_population(policy.module.actor, members=members)
+
+    def on_episode_end(
+        self,
+        policy: TorchPolicy,
+        *,
+        environment: Any = None,
+        episode: Any = None,
+        tf_sess: Any = None,
+    ):
+        # pylint:disable=unused-argument
+        if episode is not None:
+            self._members.pop(episode.episode_id, None)
+
+    def _assign_member(self, episode_id: Any) -> int:
+        if episode_id not in self._members:
+            taken = set(self._members.values())
+            free = [i for i in range(self._population_size) if i not in taken]
+            member = free[0] if free else len(self._members) % self._population_size
+            self._members[episode_id] = member
+        return self._members[episode_id]
+
+    def _row_members(self, num_rows: int, device: torch.device) -> Tensor:
+        episode_ids = self._episode_ids
+        if episode_ids is None or len(episode_ids) != num_rows:
+            return torch.arange(num_rows, device=device) % self._population_size
+
+        members = [self._assign_member(i) for i in episode_ids]
+        return torch.as_tensor(members, device=device)
+
+    @torch.no_grad()
+    def perturb_population(self, actor: nn.Module, members: List[int] = None):
+        """Resample the stacked perturbed parameters from the actor's.
+
+        Layer normalization parameters are not perturbed.
+
+        Args:
+            actor: The unperturbed actor
+            members: Indices of the members to resample. Defaults to the whole
+                population
+        """
+        layer_norms = (m for m in actor.modules() if isinstance(m, nn.LayerNorm))
+        layer_norm_params = set(p for m in layer_norms for p in m.parameters())
+        params = list(actor.parameters())
+        mask = parameters_to_vector(
+            [
+                torch.zeros_like(p) if p in layer_norm_params else torch.ones_like(p)
+                for p in params
+            ]
+        )
+
+        flat_params = parameters_to_vector(params)
+        if self._population is None or members is None:
+            members = list(range(self._population_size))
+            self._population = flat_params.expand(len(members), -1).clone()
+
+        noise = torch.randn(
+            (len(members),) + flat_params.shape, device=flat_params.device
+        )
+        stddev = self._curr_stddev(flat_params.device)
+        self._population[members] = flat_params + noise * mask * stddev
+
+    def get_info(self, sess=None) -> dict:
+        if self._stddev is None:
+            return super().get_info(sess)
+        return {"param_noise_stddev": self._stddev.item()}
+
+    def update_parameter_noise(self, policy: TorchPolicy, sample_batch: SampleBatch):
+        """Update parameter noise stddev given a batch from the perturbed policies.
+
+        Computes the DDPG distance metric and adapts the stddev without leaving
+        the policy's device.
+        """
+        module = policy.module
+        cur_obs = policy.convert_to_tensor(sample_batch[SampleBatch.CUR_OBS])
+        actions = policy.convert_to_tensor(sample_batch[SampleBatch.ACTIONS])
+
+        noisy = module.actor.unsquash_action(actions)
+        target = module.actor.unconstrained_action(cur_obs)
+        distance = (noisy - target).pow(2).mean(dim=0).mean().sqrt()
+
+        spec = self._param_noise_spec
+        stddev = self._curr_stddev(distance.device)
+        self._stddev = torch.where(
+            distance > spec.desired_action_stddev,
+            stddev / spec.adaptation_coeff,  # Decrease stddev.
+            stddev * spec.adaptation_coeff,  # Increase stddev.
+        )
+
+    def _curr_stddev(self, device: torch.device) -> Tensor:
+        if self._stddev is None:
+            self._stddev = torch.tensor(
+                self._param_noise_spec.curr_stddev, device=device
+            )
+        return self._stddev
@@ -3,6 +3,8 @@ import random
 import sys
 from dataclasses import dataclass
 from typing import Dict
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import numpy as np
@@ -146,6 +148,11 @@ class NumpyReplayBuffer:
 
     Returns a SampleBatch object when queried for samples.
 
+    Supports one thread adding samples while another samples minibatches without
+    locks. Writes are tracked by a sequence counter, which is odd while a write
+    is in progress. :meth:`sample` retries if the counter changed while copying
+    the minibatch, so that rows are never partially overwritten.
+
     Args:
         obs_space: observation space
         action_space: action space
@@ -178,6 +185,7 @@ class NumpyReplayBuffer:
         self._curr_size = 0
         self._rng = np.random.default_rng()
         self._obs_stats = None
+        self._write_seq = 0
 
     def __len__(self) -> int:
         return self._curr_size
@@ -203,6 +211,14 @@ class NumpyReplayBuffer:
         std = np.std(cur_obs, axis=0)
         self._obs_stats = (mean, std)
 
+    @property
+    def obs_stats(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Mean and standard deviation used for observation normalization.
+
+        None if :meth:`update_obs_stats` was never called.
+        """
+        return self._obs_stats
+
     def add_fields(self, *fields: ReplayField):
         """Add fields to the replay buffer and build the corresponding storage."""
         new_names = {f.name for f in fields}
@@ -238,12 +254,14 @@ class NumpyReplayBuffer:
             else:
                 assign = [(slice(start_idx, end_idx), samples)]
 
+        self._write_seq += 1
         for field in self.fields:
             for slc, smp in assign:
                 self._storage[field.name][slc] = smp[field.name]
 
         self._next_idx = end_idx
         self._curr_size = min(self._curr_size + samples.count, self._maxsize)
+        self._write_seq += 1
 
     def add_row(self, row: dict):
         """Add a row from a SampleBatch to storage.
@@ -252,15 +270,24 @@ class NumpyReplayBuffer:
             row: sample batch row as returned by SampleBatch.rows().
                 Must have the same keys as the field names in the buffer.
         """
+        self._write_seq += 1
         for field in self.fields:
             self._storage[field.name][self._next_idx] = row[field.name]
 
         self._next_idx = (self._next_idx + 1) % self._maxsize
         self._curr_size += 1 if self._curr_size < self._maxsize else 0
+        self._write_seq += 1
 
     def sample(self, batch_size: int) -> SampleBatch:
-        """Transition batch uniformly sampled with replacement."""
-        return SampleBatch(self[self.sample_idxes(batch_size)])
+        """Transition batch uniformly sampled with replacement.
+
+        Safe to call while another thread adds samples to the buffer.
+        """
+        while True:
+            seq = self._write_seq
+            batch = self[self.sample_idxes(batch_size)]
+            if seq % 2 == 0 and seq == self._write_seq:
+                return SampleBatch(batch)
 
     def sample_idxes(self, batch_size: int) -> np.ndarray:
         """Get random transition indexes uniformly sampled with replacement."""
@@ -0,0 +1,199 @@
+"""Local inference server for exported TorchScript policies."""
+import ipaddress
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Listener
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+class _Request(NamedTuple):
+    obs: np.ndarray
+    timestep: Optional[int]
+    future: Future
+
+
+class BatchedInferenceServer:
+    """Serves a policy, dynamically batching concurrent requests.
+
+    A background thread waits for requests and groups them into batches of
+    at most `max_batch_size` observations. After the first request of a batch
+    arrives, the server waits at most `max_wait_ms` milliseconds for others
+    before running the policy on the batch.
+
+    Args:
+        policy: A policy exported with :func:`raylab.policy.export.export_policy`
+            or the path to it
+        max_batch_size: Maximum number of requests processed at once
+        max_wait_ms: Maximum time to wait for new requests after the first one
+            in a batch arrives
+        device: Device to load the policy in
+
+    Examples:
+        >>> with BatchedInferenceServer("policy.pt", max_batch_size=32) as server:
+        ...     action = server.compute_action(obs)
+    """
+
+    def __init__(
+        self,
+        policy: Union[str, nn.Module],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 1.0,
+        device: Union[str, torch.device] = "cpu",
+    ):
+        if isinstance(policy, str):
+            policy = torch.jit.load(policy, map_location=device)
+        self.policy = policy
+        self.device = torch.device(device)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._requests = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """Start processing requests in a background thread."""
+        self._thread = threading.Thread(target=self._serve_batches, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Process pending requests and stop the background thread."""
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, obs: np.ndarray, timestep: Optional[int] = None) -> Future:
+        """Request the action for a single observation.
+
+        Args:
+            obs: The unbatched observation
+            timestep: Elapsed steps in the current episode. Required for
+                time-aware policies
+
+        Returns:
+            A future holding the unbatched action
+        """
+        future = Future()
+        self._requests.put(_Request(np.asarray(obs), timestep, future))
+        return future
+
+    def compute_action(
+        self, obs: np.ndarray, timestep: Optional[int] = None
+    ) -> np.ndarray:
+        """Compute the action for a single observation, blocking until done.
+
+        See :meth:`submit`.
+        """
+        return self.submit(obs, timestep).result()
+
+    def _serve_batches(self):
+        stopped = False
+        while not stopped:
+            request = self._requests.get()
+            if request is None:
+                break
+
+            batch = [request]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = self._requests.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopped = True
+                    break
+                batch.append(request)
+
+            self._process(batch)
+
+    def _process(self, batch: List[_Request]):
+        try:
+            actions = self._compute_actions(batch)
+        except Exception as err:  # pylint:disable=broad-except
+            for request in batch:
+                request.future.set_exception(err)
+        else:
+            for request, action in zip(batch, actions):
+                request.future.set_result(action)
+
+    @torch.no_grad()
+    def _compute_actions(self, batch: List[_Request]) -> np.ndarray:
+        obs = np.stack([r.obs for r in batch])
+        obs = torch.as_tensor(obs, dtype=torch.float32, device=self.device)
+        timestep = None
+        if all(r.timestep is not None for r in batch):
+            timestep = torch.as_tensor([r.timestep for r in batch], device=self.device)
+        return self.policy(obs, timestep).cpu().numpy()
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a host name or address resolves to a loopback address."""
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (socket.gaierror, ValueError):
+        return False
+
+
+def serve(
+    server: BatchedInferenceServer,
+    address: Tuple[str, int],
+    authkey: Optional[bytes] = None,
+):
+    """Accept client connections and forward their requests to the server.
+
+    Each client is handled by a separate thread. Clients send `(obs, timestep)`
+    tuples and receive actions, e.g., using
+    `multiprocessing.connection.Client`. Requests from all clients are batched
+    together. Blocks until interrupted.
+
+    Connections unpickle whatever clients send, so anyone able to connect
+    can run code in the server. An authentication key is therefore required
+    unless listening on a loopback address.
+
+    Args:
+        server: A started inference server
+        address: Host and port to listen on
+        authkey: Authentication key clients must provide. Optional only if
+            `address` is a loopback address
+
+    Raises:
+        ValueError: If `authkey` is missing and `address` is not a loopback
+            address
+    """
+    if authkey is None and not is_loopback(address[0]):
+        raise ValueError(
+            f"An authkey is required to serve on non-loopback host '{address[0]}'"
+        )
+
+    def handle(conn):
+        with conn:
+            while True:
+                try:
+                    obs, timestep = conn.recv()
+                except EOFError:
+                    break
+                conn.send(server.compute_action(obs, timestep))
+
+    with Listener(address, authkey=authkey) as listener:
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
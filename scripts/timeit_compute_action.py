@@ -0,0 +1,56 @@
+# pylint:disable=missing-module-docstring,missing-function-docstring,import-outside-toplevel
+import logging
+import time
+
+import click
+import numpy as np
+
+
+@click.command()
+@click.argument("agent_name", type=str)
+@click.option("--env", "env_name", type=str, default="Navigation", show_default=True)
+@click.option("--iterations", "-n", type=int, default=5000, show_default=True)
+@click.option("--script/--eager", "script", default=False)
+@click.option("--explore/--no-explore", "explore", default=False)
+def main(agent_name, env_name, iterations, script, explore):
+    """Compare single-observation latencies of a policy's inference paths.
+
+    Reports p50/p99 latencies of `compute_single_action` and
+    `compute_single_action_fast` for the policy of AGENT_NAME.
+    """
+    import gym
+    from raylab.agents.registry import AGENTS
+    from raylab.envs import get_env_creator
+
+    gym.logger.set_level(logging.ERROR)
+    env = get_env_creator(env_name)({})
+    policy_cls = AGENTS[agent_name]()._policy  # pylint:disable=protected-access
+    policy = policy_cls(env.observation_space, env.action_space, {"env": env_name})
+    if script:
+        policy.compile()
+
+    obs = [env.observation_space.sample() for _ in range(iterations)]
+    paths = {
+        "compute_single_action": lambda o: policy.compute_single_action(
+            o, [], explore=explore
+        ),
+        "compute_single_action_fast": lambda o: policy.compute_single_action_fast(
+            o, explore=explore
+        ),
+    }
+    for name, func in paths.items():
+        for o in obs[:100]:  # warmup
+            func(o)
+
+        latencies = []
+        for o in obs:
+            start = time.perf_counter()
+            func(o)
+            latencies.append(time.perf_counter() - start)
+
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        click.echo(f"{name:<28} p50: {p50:8.1f}us  p99: {p99:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()  # pylint:disable=no-value-for-parameter
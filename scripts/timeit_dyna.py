@@ -0,0 +1,87 @@
+# pylint:disable=missing-module-docstring,missing-function-docstring,import-outside-toplevel
+import click
+
+ENSEMBLE_SIZES = (4, 8)
+
+
+def make_losses(obs_space, action_space, size, units):
+    import torch
+    from raylab.envs.benchmark import forward_reward_fn
+    from raylab.envs.benchmark import threshold_termination_fn
+    from raylab.policy.losses import DynaQLearning
+    from raylab.policy.modules.actor import Alpha
+    from raylab.policy.modules.critic import ActionValueCritic
+    from raylab.policy.modules.critic import ClippedQValue
+    from raylab.policy.modules.critic import SoftValue
+    from raylab.policy.modules.model import build_ensemble
+    from raylab.policy.modules.model import EnsembleSpec
+    from raylab.policy.modules.model import ForkedSME
+    from raylab.policy.modules.model import SME
+    from raylab.policy.modules.model import VectorizedSME
+    from raylab.policy.modules.sac import SAC
+
+    sac = SAC(obs_space, action_space, SAC.spec_cls())
+    critic_spec = ActionValueCritic.spec_cls.from_dict(
+        {"encoder": {"units": units}, "double_q": True}
+    )
+    critic = ActionValueCritic(obs_space, action_space, critic_spec)
+    target_critic = SoftValue(
+        sac.actor, ClippedQValue(critic.target_q_values), Alpha(1.0)
+    )
+    spec = EnsembleSpec(ensemble_size=size)
+    spec.network.units = units
+    models = list(build_ensemble(obs_space, action_space, spec))
+
+    ensembles = {
+        "eager": SME(models),
+        "forked": torch.jit.script(ForkedSME(models)),
+        "vectorized": VectorizedSME(models),
+    }
+    losses = {}
+    for mode, ensemble in ensembles.items():
+        loss_fn = DynaQLearning(critic.q_values, sac.actor, ensemble, target_critic)
+        loss_fn.set_reward_fn(forward_reward_fn)
+        loss_fn.set_termination_fn(threshold_termination_fn)
+        losses[mode] = loss_fn
+    return losses
+
+
+@click.command()
+@click.option("--iterations", "-n", type=int, default=50, show_default=True)
+@click.option("--batch-size", "-b", type=int, default=256, show_default=True)
+@click.option("--units", type=int, multiple=True, default=(256, 256), show_default=True)
+def main(iterations, batch_size, units):
+    """Compare single-model and full-ensemble Dyna Q-learning targets.
+
+    Reports p50/p99 latencies of computing the DynaQLearning loss and
+    backpropagating it with the same number of imagined next states per
+    transition: `N` samples from a single random model or one sample from
+    each of the `N` models in the ensemble. Full-ensemble targets are timed
+    with eager, forked and vectorized ensembles.
+    """
+    import torch
+    from gym.spaces import Box
+    from raylab.envs.benchmark import time_call
+
+    obs_space, action_space = Box(-1, 1, (17,)), Box(-1, 1, (6,))
+    batch = {"obs": torch.randn(batch_size, 17)}
+
+    for size in ENSEMBLE_SIZES:
+        losses = make_losses(obs_space, action_space, size, tuple(units))
+        configs = [("single", losses["eager"], False, size)]
+        configs += [(mode, loss, True, 1) for mode, loss in losses.items()]
+        for mode, loss_fn, full_ensemble, samples in configs:
+            loss_fn.full_ensemble = full_ensemble
+            loss_fn.model_samples = samples
+
+            def func(loss_fn=loss_fn):
+                loss, _ = loss_fn(batch)
+                loss.backward()
+
+            p50, p99 = time_call(func, iterations)
+            label = f"Dyna({size}x{samples}) {mode}"
+            click.echo(f"{label:<28} p50: {p50:9.1f}us  p99: {p99:9.1f}us")
+
+
+if __name__ == "__main__":
+    main()  # pylint:disable=no-value-for-parameter
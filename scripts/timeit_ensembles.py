@@ -0,0 +1,110 @@
+# pylint:disable=missing-module-docstring,missing-function-docstring,import-outside-toplevel
+import click
+
+ENSEMBLE_SIZES = (2, 4, 8, 16)
+
+
+def make_families(obs_space, action_space, size, units):
+    from raylab.policy.losses.mle import ForkedLosses
+    from raylab.policy.losses.mle import Losses
+    from raylab.policy.losses.mle import NLLLoss
+    from raylab.policy.losses.mle import VectorizedLosses
+    from raylab.policy.modules import critic as crt
+    from raylab.policy.modules.model import build_ensemble
+    from raylab.policy.modules.model import EnsembleSpec
+    from raylab.policy.modules.model import ForkedSME
+    from raylab.policy.modules.model import SME
+    from raylab.policy.modules.model import VectorizedSME
+
+    q_values = [
+        crt.MLPQValue(obs_space, action_space, crt.MLPQValue.spec_cls(units=units))
+        for _ in range(size)
+    ]
+    v_values = [
+        crt.MLPVValue(obs_space, crt.MLPVValue.spec_cls(units=units))
+        for _ in range(size)
+    ]
+    spec = EnsembleSpec(ensemble_size=size)
+    spec.network.units = units
+    models = list(build_ensemble(obs_space, action_space, spec))
+    losses = [NLLLoss(m) for m in models]
+
+    return {
+        "QValueEnsemble": (
+            crt.QValueEnsemble(q_values),
+            crt.ForkedQValueEnsemble(q_values),
+            crt.VectorizedQValueEnsemble(q_values),
+        ),
+        "VValueEnsemble": (
+            crt.VValueEnsemble(v_values),
+            crt.ForkedVValueEnsemble(v_values),
+            crt.VectorizedVValueEnsemble(v_values),
+        ),
+        "SME": (SME(models), ForkedSME(models), VectorizedSME(models)),
+        "Losses": (Losses(losses), ForkedLosses(losses), VectorizedLosses(losses)),
+    }
+
+
+def make_call(family, ensemble, obs, act, new_obs, grad):
+    import torch
+
+    size = len(ensemble)
+    if family == "QValueEnsemble":
+        call = lambda: ensemble(obs, act)  # noqa:E731
+    elif family == "VValueEnsemble":
+        call = lambda: ensemble(obs)  # noqa:E731
+    elif family == "SME":
+        call = lambda: [  # noqa:E731
+            s for s, _ in ensemble.rsample(ensemble([obs] * size, [act] * size))
+        ]
+    else:
+        call = lambda: ensemble(obs, act, new_obs)  # noqa:E731
+
+    def func():
+        with torch.set_grad_enabled(grad):
+            outputs = call()
+            if grad:
+                torch.stack(outputs).sum().backward()
+
+    return func
+
+
+@click.command()
+@click.option("--iterations", "-n", type=int, default=100, show_default=True)
+@click.option("--batch-size", "-b", type=int, default=256, show_default=True)
+@click.option("--units", type=int, multiple=True, default=(256, 256), show_default=True)
+@click.option("--grad/--no-grad", "grad", default=True, show_default=True)
+def main(iterations, batch_size, units, grad):
+    """Compare eager, forked and vectorized ensemble execution.
+
+    Reports p50/p99 latencies of Q-value, V-value, stochastic model and model
+    loss ensembles of several sizes. Eager ensembles call each member in turn,
+    forked ones are compiled with TorchScript and fork each member's call, and
+    vectorized ones call all members at once over their stacked parameters.
+    """
+    import torch
+    from gym.spaces import Box
+    from raylab.envs.benchmark import time_call
+
+    obs_space, action_space = Box(-1, 1, (17,)), Box(-1, 1, (6,))
+    obs = torch.randn(batch_size, 17)
+    act = torch.rand(batch_size, 6) * 2 - 1
+    new_obs = obs + 0.1 * torch.randn_like(obs)
+
+    for size in ENSEMBLE_SIZES:
+        families = make_families(obs_space, action_space, size, tuple(units))
+        for family, (eager, forked, vectorized) in families.items():
+            modes = {
+                "eager": eager,
+                "forked": torch.jit.script(forked),
+                "vectorized": vectorized,
+            }
+            for mode, ensemble in modes.items():
+                func = make_call(family, ensemble, obs, act, new_obs, grad)
+                p50, p99 = time_call(func, iterations)
+                label = f"{family}({size}) {mode}"
+                click.echo(f"{label:<32} p50: {p50:9.1f}us  p99: {p99:9.1f}us")
+
+
+if __name__ == "__main__":
+    main()  # pylint:disable=no-value-for-parameter
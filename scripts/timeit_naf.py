@@ -0,0 +1,67 @@
+# pylint:disable=missing-module-docstring,missing-function-docstring,import-outside-toplevel
+import click
+
+ACTION_DIMS = (6, 10, 20)
+
+
+@click.command()
+@click.option("--iterations", "-n", type=int, default=200, show_default=True)
+@click.option("--batch-size", "-b", type=int, default=256, show_default=True)
+@click.option("--obs-dim", type=int, default=17, show_default=True)
+@click.option("--grad/--no-grad", "grad", default=True, show_default=True)
+@click.option("--script/--no-script", "script", default=False, show_default=True)
+def main(iterations, batch_size, obs_dim, grad, script):
+    """Compare fused and per-member NAF critic ensembles.
+
+    Reports p50/p99 latencies and throughput of the double Q-value critics and
+    the target state-value ensemble of NAF at several action sizes.
+    """
+    import torch
+    from gym.spaces import Box
+    from raylab.envs.benchmark import time_call
+    from raylab.policy.modules.critic import QValueEnsemble
+    from raylab.policy.modules.critic import VValueEnsemble
+    from raylab.policy.modules.critic.naf_value import NAFQValueEnsemble
+    from raylab.policy.modules.critic.naf_value import NAFVValueEnsemble
+    from raylab.policy.modules.naf import NAF
+
+    obs_space = Box(-1, 1, (obs_dim,))
+    for act_dim in ACTION_DIMS:
+        action_space = Box(-1, 1, (act_dim,))
+        module = NAF(obs_space, action_space, NAF.spec_cls())
+        q_values = list(module.critics)
+        v_values = list(module.target_vcritics)
+        obs = torch.randn(batch_size, obs_dim)
+        act = torch.rand(batch_size, act_dim) * 2 - 1
+
+        variants = {
+            "critics": (
+                (QValueEnsemble(q_values), NAFQValueEnsemble(q_values)),
+                (obs, act),
+            ),
+            "target_vcritics": (
+                (VValueEnsemble(v_values), NAFVValueEnsemble(v_values)),
+                (obs,),
+            ),
+        }
+        for name, (ensembles, inputs) in variants.items():
+            for ensemble in ensembles:
+                if script:
+                    ensemble = torch.jit.script(ensemble)
+
+                def func(ensemble=ensemble, inputs=inputs):
+                    with torch.set_grad_enabled(grad):
+                        values = ensemble(*inputs)
+                        if grad:
+                            torch.stack(values).sum().backward()
+
+                p50, p99 = time_call(func, iterations)
+                label = f"act{act_dim} {name} {type(ensemble).__name__}"
+                click.echo(
+                    f"{label:<40} p50: {p50:9.1f}us  p99: {p99:9.1f}us"
+                    f"  {batch_size / p50 * 1e6:12.0f} samples/s"
+                )
+
+
+if __name__ == "__main__":
+    main()  # pylint:disable=no-value-for-parameter
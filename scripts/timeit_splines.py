@@ -0,0 +1,57 @@
+# pylint:disable=missing-module-docstring,missing-function-docstring,import-outside-toplevel
+import click
+
+# (name, batch size, features): single observations and train batches for
+# policies, and train batches for dynamics models
+SIZES = (
+    ("policy-act", 1, 6),
+    ("policy-train", 256, 6),
+    ("model-train", 4096, 17),
+)
+
+
+@click.command()
+@click.option("--iterations", "-n", type=int, default=200, show_default=True)
+@click.option("--bins", type=int, default=8, show_default=True)
+@click.option("--grad/--no-grad", "grad", default=False)
+def main(iterations, bins, grad):
+    """Compare eager and scripted rational-quadratic spline coupling layers.
+
+    Reports p50/p99 latencies of the forward and inverse transforms of a
+    PiecewiseRQSCouplingTransform on policy- and model-sized inputs.
+    """
+    import torch
+    from raylab.envs.benchmark import time_call
+    from raylab.policy.modules.networks import MLP
+    from raylab.torch.nn.distributions.flows.coupling import (
+        PiecewiseRQSCouplingTransform,
+    )
+    from raylab.torch.nn.distributions.flows.masks import (
+        create_alternating_binary_mask,
+    )
+
+    for name, batch_size, features in SIZES:
+        mask = create_alternating_binary_mask(features, even=True)
+        coupling = PiecewiseRQSCouplingTransform(
+            mask, lambda i, o: MLP(i, o, 64), num_bins=bins, tail_bound=3.0
+        )
+        modes = {"eager": coupling, "script": torch.jit.script(coupling)}
+        inputs = torch.randn(batch_size, features, requires_grad=grad)
+
+        for mode, module in modes.items():
+            for reverse in (False, True):
+
+                def func(inputs=inputs, module=module, reverse=reverse):
+                    with torch.set_grad_enabled(grad):
+                        out, logdet = module(inputs, {}, reverse=reverse)
+                        if grad:
+                            (out.sum() + logdet.sum()).backward()
+
+                p50, p99 = time_call(func, iterations)
+                label = f"{name}({batch_size}x{features}) {mode} "
+                label += "inverse" if reverse else "forward"
+                click.echo(f"{label:<40} p50: {p50:9.1f}us  p99: {p99:9.1f}us")
+
+
+if __name__ == "__main__":
+    main()  # pylint:disable=no-value-for-parameter
@@ -1,7 +1,10 @@
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
 
 
-EXPLORATION_TYPES = "ParameterNoise GaussianNoise".split(" ")
+EXPLORATION_TYPES = "ParameterNoise PopulationParameterNoise GaussianNoise".split(" ")
 
 
 @pytest.fixture
@@ -12,7 +15,8 @@ def policy_cls():
 
 
 @pytest.fixture(
-    params=EXPLORATION_TYPES, ids=tuple(s.split(".")[-1] for s in EXPLORATION_TYPES),
+    params=EXPLORATION_TYPES,
+    ids=tuple(s.split(".")[-1] for s in EXPLORATION_TYPES),
 )
 def exploration(request):
     return "raylab.utils.exploration." + request.param
@@ -20,3 +24,46 @@ def exploration(request):
 
 def test_policy_creation(policy_cls, obs_space, action_space, exploration):
     policy_cls(obs_space, action_space, {"exploration_config": {"type": exploration}})
+
+
+def test_population_actions(policy_cls, obs_space, action_space):
+    config = {
+        "type": "raylab.utils.exploration.PopulationParameterNoise",
+        "population_size": 3,
+        "pure_exploration_steps": 0,
+    }
+    policy = policy_cls(obs_space, action_space, {"exploration_config": config})
+
+    obs = np.stack([obs_space.sample() for _ in range(6)])
+    actions, _, _ = policy.compute_actions(obs, explore=True)
+    assert actions.shape == (6,) + action_space.shape
+    assert np.all(np.abs(actions) <= action_space.high)
+
+
+def test_population_members(policy_cls, obs_space, action_space):
+    config = {
+        "type": "raylab.utils.exploration.PopulationParameterNoise",
+        "population_size": 3,
+        "pure_exploration_steps": 0,
+    }
+    policy = policy_cls(obs_space, action_space, {"exploration_config": config})
+    exploration = policy.exploration
+    episodes = [SimpleNamespace(episode_id=i) for i in range(3)]
+    for episode in episodes:
+        exploration.on_episode_start(policy, episode=episode)
+
+    obs = np.stack([obs_space.sample()] * 3)
+    actions, _, _ = policy.compute_actions(obs, episodes=episodes, explore=True)
+    assert not np.allclose(actions[0], actions[1])
+
+    # Members follow episodes, not rows of the observation batch
+    reordered, _, _ = policy.compute_actions(obs, episodes=episodes[::-1], explore=True)
+    assert np.allclose(reordered, actions[::-1])
+
+    # A new episode only resamples the member it takes over
+    exploration.on_episode_end(policy, episode=episodes[0])
+    episodes[0] = SimpleNamespace(episode_id=3)
+    exploration.on_episode_start(policy, episode=episodes[0])
+    restarted, _, _ = policy.compute_actions(obs, episodes=episodes, explore=True)
+    assert not np.allclose(restarted[0], actions[0])
+    assert np.allclose(restarted[1:], actions[1:])
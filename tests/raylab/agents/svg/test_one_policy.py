@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+import torch
+from ray.rllib import SampleBatch
+
+from raylab.policy.stats import LEARNER_STATS_KEY
+from raylab.utils.debug import fake_batch
+
+
+@pytest.fixture
+def policy(svg_one_policy, obs_space, action_space):
+    config = {"kl_schedule": {"initial_coeff": 1.0}, "batch_size": 32}
+    policy = svg_one_policy(obs_space, action_space, {"policy": config})
+    policy.set_reward_from_callable(lambda obs, act, _: -act.norm(dim=-1))
+    return policy
+
+
+@pytest.fixture
+def samples(obs_space, action_space):
+    samples = fake_batch(obs_space, action_space, batch_size=64)
+    samples[SampleBatch.ACTION_LOGP] = np.random.randn(64).astype(np.float32)
+    return samples
+
+
+def test_learn_on_replay(policy, samples):
+    module = policy.module
+    policy.add_to_buffer(samples)
+    coeff = policy.curr_kl_coeff
+
+    info = policy.learn_on_replay()
+    assert "policy_kl_div" in info[LEARNER_STATS_KEY]
+    assert policy.curr_kl_coeff != coeff
+
+    # Old policy holds the parameters from before the latest update
+    info = policy.learn_on_replay()
+    old_params = list(module.old_actor.parameters())
+    new_params = list(module.actor.parameters())
+    assert any(not torch.allclose(o, n) for o, n in zip(old_params, new_params))
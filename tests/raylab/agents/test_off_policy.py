@@ -87,3 +87,78 @@ def test_second_train(trainer, timesteps_per_iteration, learning_starts):
 
     policy = trainer.get_policy()
     assert policy.global_timestep == expected_timesteps
+
+
+@pytest.fixture
+def replay_policy_cls(dummy_policy_cls):
+    class ReplayPolicy(dummy_policy_cls):
+        # pylint:disable=abstract-method
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.config.update(improvement_steps=1, batch_size=1)
+            self.stored = 0
+            self.learn_calls = 0
+
+        def add_to_buffer(self, samples):
+            self.stored += samples.count
+
+        def learn_on_replay(self):
+            self.learn_calls += 1
+            return self.learn_on_batch(None)
+
+    return ReplayPolicy
+
+
+@pytest.fixture(params=(0.5, 2.0), ids=lambda x: f"ReplayRatio:{x}")
+def replay_ratio(request):
+    return request.param
+
+
+@pytest.fixture
+def async_trainer(replay_policy_cls, config, replay_ratio):
+    @configure
+    @OffPolicyMixin.add_options
+    class Sub(OffPolicyMixin, Trainer):
+        _name = "Dummy"
+        _policy = replay_policy_cls
+
+    config.update(num_workers=1, replay_ratio=replay_ratio, weight_sync_interval=1)
+    return Sub(config=config)
+
+
+def test_async_train(async_trainer, replay_ratio, learning_starts):
+    res = async_trainer.train()
+
+    policy = async_trainer.get_policy()
+    timesteps = res["timesteps_total"]
+    assert policy.stored == timesteps
+    assert policy.learn_calls == int(replay_ratio * max(0, timesteps - learning_starts))
+    assert policy.global_timestep == timesteps
+
+
+@pytest.fixture
+def threaded_trainer(replay_policy_cls, config, replay_ratio):
+    @configure
+    @OffPolicyMixin.add_options
+    class Sub(OffPolicyMixin, Trainer):
+        _name = "Dummy"
+        _policy = replay_policy_cls
+
+    config.update(threaded_learner=True, replay_ratio=replay_ratio)
+    trainer = Sub(config=config)
+    yield trainer
+    trainer.stop()
+
+
+def test_threaded_train(threaded_trainer, replay_ratio, learning_starts):
+    res = threaded_trainer.train()
+
+    learner_thread = threaded_trainer._learner_feed.learner_thread
+    learner = learner_thread.policy
+    assert learner is not threaded_trainer.get_policy()
+    timesteps = res["timesteps_total"]
+    assert learner.stored == timesteps
+
+    expected_calls = replay_ratio * max(0, timesteps - learning_starts)
+    assert expected_calls - learner_thread.max_lag <= learner.learn_calls
+    assert learner.learn_calls <= expected_calls
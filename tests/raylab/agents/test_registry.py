@@ -1,5 +1,6 @@
 from collections import defaultdict
 
+import numpy as np
 import pytest
 from ray.rllib import RolloutWorker
 from ray.rllib import SampleBatch
@@ -99,6 +100,26 @@ def test_compute_single_action(env_, env_name, policy_cls):
     assert isinstance(info, dict)
 
 
+@pytest.mark.parametrize("explore", (True, False), ids=lambda b: f"Explore:{b}")
+def test_compute_single_action_fast(
+    env_, env_name, policy_cls, compile_policy, explore
+):
+    env = env_
+    policy = policy_cls(env.observation_space, env.action_space, {"env": env_name})
+    if compile_policy:
+        policy.compile()
+
+    for _ in range(2):
+        obs = env.observation_space.sample()
+        action = policy.compute_single_action_fast(obs, explore=explore)
+        assert isinstance(action, np.ndarray)
+        assert action in env.action_space
+
+    if not explore:
+        expected, _, _ = policy.compute_single_action(obs, [], explore=False)
+        assert np.allclose(action, expected, atol=1e-6)
+
+
 def test_policy_in_rollout_worker(worker):
     traj = worker.sample()
     assert isinstance(traj, SampleBatch)
@@ -1,3 +1,5 @@
+import json
+
 from click.testing import CliRunner
 
 from raylab import cli
@@ -11,3 +13,19 @@ def test_command_line_interface():
     help_result = runner.invoke(cli.raylab, ["--help"])
     assert help_result.exit_code == 0
     assert "--help  Show this message and exit." in help_result.output
+
+
+def test_bench_envs(tmpdir):
+    runner = CliRunner()
+    out = str(tmpdir.join("report.json"))
+    args = "bench-envs Navigation --steps 10 --repeats 1 --batch-size 4 --out".split()
+    result = runner.invoke(cli.raylab, args + [out])
+    assert result.exit_code == 0
+
+    with open(out) as file:
+        report = json.load(file)
+    assert "torch" in report["system"]
+    assert [r["env_id"] for r in report["envs"]] == ["Navigation"]
+
+    result = runner.invoke(cli.raylab, "bench-envs NonexistentEnv-v0".split())
+    assert result.exit_code != 0
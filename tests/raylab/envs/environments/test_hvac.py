@@ -53,21 +53,21 @@ def test_reset(env):
 
 
 def test_temp_outside(env):
-    sample, logp = env._temp_outside()
+    sample, logp = env.dynamics.temp_outside()
     assert sample.shape == (env._num_rooms,)
     assert logp.shape == (env._num_rooms,)
 
-    sample, logp = env._temp_outside(sample_shape=(BATCH_SIZE,))
+    sample, logp = env.dynamics.temp_outside(sample_shape=(BATCH_SIZE,))
     assert sample.shape == (BATCH_SIZE, env._num_rooms)
     assert logp.shape == (BATCH_SIZE, env._num_rooms)
 
 
 def test_temp_hall(env):
-    sample, logp = env._temp_hall()
+    sample, logp = env.dynamics.temp_hall()
     assert sample.shape == (env._num_rooms,)
     assert logp.shape == (env._num_rooms,)
 
-    sample, logp = env._temp_hall(sample_shape=(BATCH_SIZE,))
+    sample, logp = env.dynamics.temp_hall(sample_shape=(BATCH_SIZE,))
     assert sample.shape == (BATCH_SIZE, env._num_rooms)
     assert logp.shape == (BATCH_SIZE, env._num_rooms)
 
@@ -75,14 +75,28 @@ def test_temp_hall(env):
 def test_temp(env):
     action = env.action_space.sample()
     AIR_MAX = torch.as_tensor(env._config["AIR_MAX"])
-    action = torch.as_tensor(action) * AIR_MAX
+    air = torch.as_tensor(action) * AIR_MAX
+    temp, _ = env._unpack_state(env.observation_space.sample())
 
     SAMPLE_SHAPE = ()
-    temp_hall, _ = env._temp_hall(SAMPLE_SHAPE)
-    temp_outside, _ = env._temp_outside(SAMPLE_SHAPE)
+    temp_hall, _ = env.dynamics.temp_hall(SAMPLE_SHAPE)
+    temp_outside, _ = env.dynamics.temp_outside(SAMPLE_SHAPE)
 
-    temp = env._temp(action, temp_outside, temp_hall)
-    assert temp.shape == (env._num_rooms,)
+    next_temp = env.dynamics.temp(temp, air, temp_outside, temp_hall)
+    assert next_temp.shape == (env._num_rooms,)
+
+
+def test_temp_batch(env):
+    temp = torch.randn(BATCH_SIZE, env._num_rooms) * 5 + 15
+    air = torch.rand(BATCH_SIZE, env._num_rooms) * 10
+    temp_hall, _ = env.dynamics.temp_hall((BATCH_SIZE,))
+    temp_outside, _ = env.dynamics.temp_outside((BATCH_SIZE,))
+
+    batched = env.dynamics.temp(temp, air, temp_outside, temp_hall)
+    rows = [
+        env.dynamics.temp(*args) for args in zip(temp, air, temp_outside, temp_hall)
+    ]
+    assert torch.allclose(batched, torch.stack(rows))
 
 
 def test_transition_fn(env):
@@ -100,6 +114,26 @@ def test_transition_fn(env):
     assert logp.shape == (BATCH_SIZE, env._num_rooms)
 
 
+@pytest.mark.parametrize("sample_shape", ((), (1,), (2,)))
+def test_transition_fn_batch(env, sample_shape):
+    state = torch.as_tensor(
+        np.stack([env.observation_space.sample() for _ in range(BATCH_SIZE)])
+    )
+    action = torch.as_tensor(
+        np.stack([env.action_space.sample() for _ in range(BATCH_SIZE)])
+    )
+    state.requires_grad_()
+    action.requires_grad_()
+
+    next_state, logp = env.transition_fn(state, action, sample_shape=sample_shape)
+    assert next_state.shape == sample_shape + (BATCH_SIZE, env._num_rooms + 1)
+    assert logp.shape == sample_shape + (BATCH_SIZE, env._num_rooms)
+
+    next_state.sum().backward()
+    assert state.grad is not None
+    assert action.grad is not None
+
+
 def test_reward_fn(env):
     state = env.observation_space.sample()
     action = env.action_space.sample()
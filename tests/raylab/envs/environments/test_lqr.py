@@ -0,0 +1,125 @@
+import pytest
+import torch
+
+from raylab.envs.environments.lqr import LQR
+from raylab.envs.environments.lqr import random_lqr
+
+BATCH_SIZE = 4
+STATE_SIZE = 3
+ACTION_SIZE = 2
+HORIZON = 10
+
+
+@pytest.fixture
+def lqr():
+    generator = torch.Generator().manual_seed(42)
+    return random_lqr((BATCH_SIZE,), STATE_SIZE, ACTION_SIZE, generator=generator)
+
+
+@pytest.fixture
+def solution(lqr):
+    return lqr.backward(HORIZON)
+
+
+@pytest.fixture
+def x0():
+    generator = torch.Generator().manual_seed(0)
+    return torch.randn(BATCH_SIZE, STATE_SIZE, generator=generator)
+
+
+def quad(vec, mat):
+    return (vec * (mat @ vec.unsqueeze(-1)).squeeze(-1)).sum(-1)
+
+
+def test_backward_shapes(solution):
+    (K, k), (V, v, const) = solution
+    assert K.shape == (HORIZON, BATCH_SIZE, ACTION_SIZE, STATE_SIZE)
+    assert k.shape == (HORIZON, BATCH_SIZE, ACTION_SIZE)
+    assert V.shape == (HORIZON, BATCH_SIZE, STATE_SIZE, STATE_SIZE)
+    assert v.shape == (HORIZON, BATCH_SIZE, STATE_SIZE)
+    assert const.shape == (HORIZON, BATCH_SIZE)
+
+
+def test_batched_backward(lqr, solution):
+    for idx in range(BATCH_SIZE):
+        single = LQR(lqr.F[idx], lqr.f[idx], lqr.C[idx], lqr.c[idx])
+        for expected, tensor in zip(
+            sum(single.backward(HORIZON), ()), sum(solution, ())
+        ):
+            assert torch.allclose(expected, tensor[:, idx], atol=1e-5)
+
+
+def test_value_function(lqr, solution, x0):
+    policy, (V, v, const) = solution
+    states, actions, costs = lqr(policy, x0)
+    assert states.shape == (HORIZON + 1, BATCH_SIZE, STATE_SIZE)
+    assert actions.shape == (HORIZON, BATCH_SIZE, ACTION_SIZE)
+    assert costs.shape == (HORIZON + 1, BATCH_SIZE)
+
+    value = 1 / 2 * quad(x0, V[0]) + (x0 * v[0]).sum(-1) + const[0]
+    assert torch.allclose(costs.sum(0), value, rtol=1e-4, atol=1e-3)
+
+
+def test_broadcast_initial_state(lqr, solution, x0):
+    policy, _ = solution
+    single = x0[0]
+    for expected, tensor in zip(lqr(policy, single.expand_as(x0)), lqr(policy, single)):
+        assert torch.allclose(expected, tensor)
+
+    scripted = torch.jit.script(lqr)
+    for expected, tensor in zip(lqr(policy, single), scripted(policy, single)):
+        assert torch.allclose(expected, tensor)
+
+
+def test_expected_cost(lqr, solution, x0):
+    policy, _ = solution
+    _, _, costs = lqr(policy, x0)
+    Sigma0 = torch.zeros(BATCH_SIZE, STATE_SIZE, STATE_SIZE)
+    assert torch.allclose(
+        lqr.expected_cost(policy, x0, Sigma0), costs.sum(0), rtol=1e-4, atol=1e-3
+    )
+
+    Sigma0 = torch.eye(STATE_SIZE).expand(BATCH_SIZE, -1, -1)
+    generator = torch.Generator().manual_seed(1)
+    samples = x0 + torch.randn((100000,) + x0.shape, generator=generator)
+    _, _, costs = lqr(policy, samples)
+    expected = lqr.expected_cost(policy, x0, Sigma0)
+    assert torch.allclose(expected, costs.sum(0).mean(0), rtol=2e-2, atol=1e-1)
+
+
+@pytest.mark.parametrize("noise", (0.0, 0.1))
+def test_policy_gradient_at_optimum(lqr, solution, x0, noise):
+    policy, _ = solution
+    Sigma0 = torch.eye(STATE_SIZE).expand(BATCH_SIZE, -1, -1)
+    Sigma_u = noise * torch.eye(ACTION_SIZE).expand(BATCH_SIZE, -1, -1)
+
+    K_grad, k_grad = lqr.policy_gradient(policy, x0, Sigma0, Sigma_u)
+    assert K_grad.shape == policy[0].shape
+    assert k_grad.shape == policy[1].shape
+    assert torch.allclose(K_grad, torch.zeros_like(K_grad), atol=1e-3)
+    assert torch.allclose(k_grad, torch.zeros_like(k_grad), atol=1e-3)
+
+
+def test_policy_gradient(lqr, solution, x0):
+    (K, k), _ = solution
+    K, k = K + 0.1 * torch.randn_like(K), k + 0.1 * torch.randn_like(k)
+    Sigma0 = torch.eye(STATE_SIZE).expand(BATCH_SIZE, -1, -1)
+    K_grad, k_grad = lqr.policy_gradient((K, k), x0, Sigma0)
+
+    K_dir, k_dir = torch.randn_like(K), torch.randn_like(k)
+    eps = 1e-2
+    cost_plus = lqr.expected_cost((K + eps * K_dir, k + eps * k_dir), x0, Sigma0)
+    cost_minus = lqr.expected_cost((K - eps * K_dir, k - eps * k_dir), x0, Sigma0)
+    finite_diff = (cost_plus - cost_minus) / (2 * eps)
+    directional = (K_grad * K_dir).sum([0, 2, 3]) + (k_grad * k_dir).sum([0, 2])
+    assert torch.allclose(finite_diff, directional, rtol=1e-2, atol=1e-2)
+
+
+def test_script(lqr, solution, x0):
+    scripted = torch.jit.script(lqr)
+    for expected, tensor in zip(sum(solution, ()), sum(scripted.backward(HORIZON), ())):
+        assert torch.allclose(expected, tensor)
+
+    policy, _ = solution
+    for expected, tensor in zip(lqr(policy, x0), scripted(policy, x0)):
+        assert torch.allclose(expected, tensor)
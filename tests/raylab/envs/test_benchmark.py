@@ -0,0 +1,33 @@
+import pytest
+
+from raylab.envs.benchmark import profile_env
+from raylab.envs.benchmark import time_call
+from raylab.envs.benchmark import WRAPPER_STAGES
+
+
+@pytest.fixture(params="Navigation MountainCarContinuous-v0".split())
+def env_id(request):
+    return request.param
+
+
+def test_profile_env(env_id):
+    report = profile_env(
+        env_id, num_steps=20, horizon=10, batch_sizes=(1, 8), repeats=2
+    )
+
+    assert report["env_id"] == env_id
+    assert report["steps"] == 20
+    assert report["resets"] >= 1
+    assert report["steps_per_sec"] > 0
+    assert [w["wrapper"] for w in report["wrappers"]] == [w for w, _ in WRAPPER_STAGES]
+    for key in "reward_fn termination_fn".split():
+        assert [r["batch_size"] for r in report[key]] == [1, 8]
+        assert all(r["samples_per_sec"] > 0 for r in report[key])
+
+
+def test_time_call():
+    calls = []
+    p50, p99 = time_call(lambda: calls.append(None), iterations=5, warmup=2)
+
+    assert len(calls) == 7
+    assert 0 < p50 <= p99
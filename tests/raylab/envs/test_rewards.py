@@ -48,3 +48,21 @@ def test_reproduce_rewards(env_reward):
     rew_ = reward_fn(obs, action, new_obs)
     assert rew.shape == rew_.shape
     assert torch.allclose(rew, rew_, rtol=1e-4, atol=1e-5)
+
+
+def test_script_parity(env_reward):
+    env, reward_fn = env_reward
+    scripted = torch.jit.script(reward_fn)
+
+    batch_size = 10
+    obs, act, new_obs = (
+        torch.as_tensor(
+            np.stack([space.sample() for _ in range(batch_size)]), dtype=torch.float32
+        )
+        for space in (env.observation_space, env.action_space, env.observation_space)
+    )
+
+    rew = reward_fn(obs, act, new_obs)
+    rew_ = scripted(obs, act, new_obs)
+    assert rew.shape == rew_.shape == (batch_size,)
+    assert torch.allclose(rew, rew_)
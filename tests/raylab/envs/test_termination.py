@@ -48,3 +48,22 @@ def test_reproduce_terminations(env_termination):
 
     done_ = termination_fn(obs, action, new_obs)
     assert (~(done ^ done_)).all()
+
+
+def test_script_parity(env_termination):
+    env, termination_fn, _ = env_termination
+    scripted = torch.jit.script(termination_fn)
+
+    batch_size = 10
+    obs, act, new_obs = (
+        torch.as_tensor(
+            np.stack([space.sample() for _ in range(batch_size)]), dtype=torch.float32
+        )
+        for space in (env.observation_space, env.action_space, env.observation_space)
+    )
+
+    done = termination_fn(obs, act, new_obs)
+    done_ = scripted(obs, act, new_obs)
+    assert done.shape == done_.shape == (batch_size,)
+    assert done_.dtype == torch.bool
+    assert (done == done_).all()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from ray.rllib.env.vector_env import VectorEnv
+
+from raylab.envs import get_env_creator
+
+
+NUM_ENVS = 4
+
+
+@pytest.fixture(params="Navigation Reservoir HVAC".split())
+def domain(request):
+    return request.param
+
+
+@pytest.fixture
+def env(domain):
+    return get_env_creator("Vector" + domain)({"num_envs": NUM_ENVS})
+
+
+def test_vector_env_interaction_loop(env):
+    assert isinstance(env, VectorEnv)
+    assert env.num_envs == NUM_ENVS
+
+    obs = env.vector_reset()
+    assert len(obs) == NUM_ENVS
+    assert all(o in env.observation_space for o in obs)
+
+    horizon = env.get_unwrapped()[0]._horizon
+    for _ in range(horizon):
+        actions = [env.action_space.sample() for _ in range(NUM_ENVS)]
+        new_obs, rews, dones, infos = env.vector_step(actions)
+        assert len(new_obs) == NUM_ENVS
+        assert all(o in env.observation_space for o in new_obs)
+        assert all(np.isscalar(r) for r in rews)
+        assert all(isinstance(d, bool) for d in dones)
+        assert all(isinstance(i, dict) for i in infos)
+
+        for idx, done in enumerate(dones):
+            if done:
+                obs = env.reset_at(idx)
+                assert obs in env.observation_space
+                assert obs[-1] == 0.0
+
+
+def test_independent_transitions(env):
+    env.vector_reset()
+    state = env.state.clone()
+    state[:] = state[0]
+    env.state = state
+
+    actions = [env.action_space.sample()] * NUM_ENVS
+    new_obs, _, _, _ = env.vector_step(actions)
+    assert not all(np.allclose(o, new_obs[0]) for o in new_obs[1:])
+
+
+def test_unsupported_time_limit(domain):
+    with pytest.raises(ValueError):
+        get_env_creator("Vector" + domain)({"max_episode_steps": 10})
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+import torch
+from ray.rllib.env.vector_env import VectorEnv
+
+import raylab.envs.wrappers as wrappers
+import raylab.envs.wrappers.vector as vector
+from raylab.envs import get_env_creator
+from raylab.envs.wrappers.mixins import RNGMixin
+
+NUM_ENVS = 4
+WRAPPERS = {
+    "CorrelatedIrrelevant": (
+        wrappers.CorrelatedIrrelevant,
+        vector.VectorCorrelatedIrrelevant,
+        {"size": 2},
+    ),
+    "GaussianRandomWalks": (
+        wrappers.GaussianRandomWalks,
+        vector.VectorGaussianRandomWalks,
+        {"size": 2},
+    ),
+    "LinearRedundant": (wrappers.LinearRedundant, vector.VectorLinearRedundant, {}),
+    "NonlinearRedundant": (
+        wrappers.NonlinearRedundant,
+        vector.VectorNonlinearRedundant,
+        {},
+    ),
+    "RandomIrrelevant": (
+        wrappers.RandomIrrelevant,
+        vector.VectorRandomIrrelevant,
+        {"size": 2},
+    ),
+}
+
+
+@pytest.fixture(params=WRAPPERS.values(), ids=WRAPPERS.keys())
+def wrapper_spec(request):
+    return request.param
+
+
+@pytest.fixture
+def wrapped(wrapper_spec):
+    _, vector_cls, kwargs = wrapper_spec
+    env = get_env_creator("VectorNavigation")({"num_envs": NUM_ENVS})
+    return vector_cls(env, **kwargs)
+
+
+def test_interaction(wrapped):
+    wrapped.seed(42)
+    obs = wrapped.vector_reset()
+    assert len(obs) == NUM_ENVS
+    assert all(o in wrapped.observation_space for o in obs)
+
+    for _ in range(3):
+        actions = [wrapped.action_space.sample() for _ in range(NUM_ENVS)]
+        new_obs, rewards, dones, infos = wrapped.vector_step(actions)
+        assert len(new_obs) == len(rewards) == len(dones) == len(infos) == NUM_ENVS
+        assert all(o in wrapped.observation_space for o in new_obs)
+
+        obs_t, act_t, new_obs_t = (
+            torch.as_tensor(np.stack(x)) for x in (obs, actions, new_obs)
+        )
+        rew_t = wrapped.reward_fn(obs_t, act_t, new_obs_t)
+        assert np.allclose(rewards, rew_t.numpy())
+        done_t = wrapped.termination_fn(obs_t, act_t, new_obs_t)
+        assert dones == done_t.tolist()
+        obs = new_obs
+
+    assert wrapped.reset_at(0) in wrapped.observation_space
+
+
+def test_single_env_parity(wrapper_spec):
+    gym_cls, vector_cls, kwargs = wrapper_spec
+    env_creator = get_env_creator("Pendulum-v0")
+    vector_base = env_creator({})
+    wrapped = gym_cls(env_creator({}), **kwargs)
+    vector_wrapped = vector_cls(
+        VectorEnv.wrap(existing_envs=[vector_base], num_envs=1), **kwargs
+    )
+
+    # Gym wrappers also seed the base environment
+    seeds = wrapped.seed(42)
+    vector_base.seed(42)
+    vector_seeds = vector_wrapped.seed(42)
+    if isinstance(vector_wrapped, RNGMixin):
+        assert seeds[-1] == vector_seeds[-1]
+
+    assert np.allclose(wrapped.reset(), vector_wrapped.vector_reset()[0])
+    for _ in range(5):
+        action = wrapped.action_space.sample()
+        obs, rew, _, _ = wrapped.step(action)
+        vector_obs, vector_rew, _, _ = vector_wrapped.vector_step([action])
+        assert np.allclose(obs, vector_obs[0])
+        assert np.allclose(rew, vector_rew[0])
+
+    assert np.allclose(wrapped.reset(), vector_wrapped.reset_at(0))
+
+
+def test_observation_is_abstract():
+    env = get_env_creator("VectorNavigation")({"num_envs": NUM_ENVS})
+    with pytest.raises(TypeError):
+        vector.VectorObservationWrapper(env)
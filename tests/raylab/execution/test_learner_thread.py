@@ -0,0 +1,86 @@
+import math
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from ray.rllib import SampleBatch
+
+from raylab.execution.learner_thread import ReplayLearnerThread
+from raylab.execution.learner_thread import StoreToLearnerThread
+
+
+class SlowPolicy:
+    # pylint:disable=missing-class-docstring,missing-function-docstring
+    def __init__(self):
+        self.config = {"improvement_steps": 1, "batch_size": 1}
+        self.weights = np.zeros(2)
+
+    def add_to_buffer(self, samples):
+        pass
+
+    def learn_on_replay(self):
+        # Updates the weights in two steps, like an optimizer over parameters
+        self.weights[0] += 1
+        time.sleep(1e-3)
+        self.weights[1] += 1
+        return {}
+
+    def get_weights(self):
+        # Shares memory with the policy's weights, like TorchPolicy on CPU
+        return self.weights
+
+    def set_weights(self, weights):
+        self.weights[:] = weights
+
+
+@pytest.fixture
+def actor():
+    return SlowPolicy()
+
+
+@pytest.fixture
+def learner_thread():
+    thread = ReplayLearnerThread(
+        SlowPolicy(), replay_ratio=1.0, learning_starts=0, max_lag=math.inf
+    )
+    thread.start()
+    thread.add_samples(SampleBatch({SampleBatch.REWARDS: np.zeros(10 ** 6)}))
+    yield thread
+    thread.stop()
+    thread.join()
+
+
+@pytest.fixture
+def feed(actor, learner_thread):
+    workers = SimpleNamespace(
+        local_worker=lambda: SimpleNamespace(get_policy=lambda: actor)
+    )
+    feed = StoreToLearnerThread(
+        workers, replay_ratio=1.0, learning_starts=0, sync_interval=1, max_lag=1.0
+    )
+    feed.learner_thread = learner_thread
+    return feed
+
+
+def test_sync_while_learning(feed, actor, learner_thread):
+    for _ in range(200):
+        feed.sync_weights()
+        assert actor.weights[0] == actor.weights[1]
+        time.sleep(1e-4)
+    assert learner_thread.learn_calls > 0
+    learner_thread.raise_if_failed()
+
+
+def test_restore_while_learning(feed, actor, learner_thread):
+    for idx in range(200):
+        actor.weights[:] = -idx
+        feed.restore_learner()
+        time.sleep(1e-4)
+    learner_thread.raise_if_failed()
+
+    # Restoring in the middle of an update would leave the weights out of step
+    learner_thread.stop()
+    learner_thread.join()
+    learner = learner_thread.policy
+    assert learner.weights[0] == learner.weights[1]
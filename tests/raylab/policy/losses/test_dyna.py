@@ -27,9 +27,18 @@ def model_samples():
     return 2
 
 
+@pytest.fixture(params=(False, True), ids=("SingleModel", "FullEnsemble"))
+def full_ensemble(request):
+    return request.param
+
+
 @pytest.fixture
-def dyna_loss(critics, actor, models, target_critic):
-    return DynaQLearning(critics, actor, models, target_critic)
+def dyna_loss(critics, actor, models, target_critic, model_samples, full_ensemble):
+    # pylint:disable=too-many-arguments
+    loss_fn = DynaQLearning(critics, actor, models, target_critic)
+    loss_fn.model_samples = model_samples
+    loss_fn.full_ensemble = full_ensemble
+    return loss_fn
 
 
 def test_dyna_cdq(dyna_loss, reward_fn, termination_fn, batch, critics):
@@ -45,3 +54,13 @@ def test_dyna_cdq(dyna_loss, reward_fn, termination_fn, batch, critics):
 
     loss.backward()
     assert all([p.grad is not None for p in critics.parameters()])
+
+
+def test_ensemble_transition(dyna_loss, models, model_samples, obs, act):
+    # pylint:disable=too-many-arguments
+    next_obs, dist_params = dyna_loss.ensemble_transition(obs, act)
+
+    assert next_obs.shape == (len(models) * model_samples,) + obs.shape
+    assert all(v.shape[0] == len(models) for v in dist_params.values())
+    if model_samples > 1:
+        assert not torch.allclose(next_obs[0], next_obs[1])
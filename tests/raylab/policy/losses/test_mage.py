@@ -164,3 +164,39 @@ def test_grad_loss_gradient_propagation(loss_fn, obs, action):
         )
     )
     assert all(p.grad is None for p in parameters)
+
+
+def test_split_gradient(loss_fn, batch, critics):
+    def loss_and_grads(split):
+        loss_fn.split_gradient = split
+        loss_fn.seed(42)
+        torch.manual_seed(42)
+        critics.zero_grad()
+        loss, info = loss_fn(batch)
+        loss.backward()
+        return loss, info, [p.grad.clone() for p in critics.parameters()]
+
+    loss, info, grads = loss_and_grads(True)
+    expected, expected_info, expected_grads = loss_and_grads(False)
+
+    assert torch.allclose(loss, expected, rtol=1e-5)
+    for key in "loss(MAGE) loss(TD)".split():
+        assert info[key] == pytest.approx(expected_info[key], rel=1e-5)
+    for grad, expected_grad in zip(grads, expected_grads):
+        assert torch.allclose(grad, expected_grad, rtol=1e-4, atol=1e-6)
+
+
+def test_delta_and_gradient(loss_fn, critics, obs, action, next_obs):
+    action.requires_grad_(True)
+    torch.manual_seed(42)
+    delta, action_gradient = loss_fn.temporal_diff_error_and_gradient(
+        obs, action, next_obs
+    )
+    assert delta.shape == obs.shape[:-1] + (len(critics),)
+    assert action_gradient.shape == action.shape
+
+    torch.manual_seed(42)
+    expected = loss_fn.temporal_diff_error(obs, action, next_obs)
+    (expected_gradient,) = torch.autograd.grad(expected.sum(), action)
+    assert torch.allclose(delta, expected)
+    assert torch.allclose(action_gradient, expected_gradient, atol=1e-6)
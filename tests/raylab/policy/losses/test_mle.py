@@ -2,7 +2,9 @@ import pytest
 import torch
 
 from raylab.policy.losses import MaximumLikelihood
+from raylab.policy.losses.mle import VectorizedLosses
 from raylab.policy.modules.model import SME
+from raylab.policy.modules.model import VectorizedSME
 
 
 @pytest.fixture
@@ -38,3 +40,16 @@ def test_compile(loss_fn, batch):
 
     assert torch.is_tensor(loss)
     loss.sum().backward()
+
+
+def test_vectorized(loss_fn, models, batch):
+    vectorized = MaximumLikelihood(VectorizedSME(list(models)))
+    assert isinstance(vectorized.loss_fns, VectorizedLosses)
+
+    loss, info = vectorized(batch)
+    expected, expected_info = loss_fn(batch)
+    assert torch.allclose(loss, expected, atol=1e-5)
+    assert info.keys() == expected_info.keys()
+
+    loss.backward()
+    assert all(p.grad is not None for p in models.parameters())
@@ -4,6 +4,8 @@ from ray.rllib import SampleBatch
 
 from raylab.policy.losses.svg import OneStepSVG
 from raylab.policy.losses.svg import ReproduceRewards
+from raylab.policy.losses.svg import TrajectorySVG
+from raylab.policy.postprocessing import time_major_episodes
 
 
 @pytest.fixture
@@ -100,3 +102,37 @@ def test_propagates_gradients(repr_rewards, consistent_batch, actor):
     rew.sum().backward()
 
     assert all(p.grad is not None for p in actor.parameters())
+
+
+@pytest.fixture
+def trajectory_loss(model, actor, critic, reward_fn):
+    loss = TrajectorySVG(model, actor, critic)
+    loss.set_reward_fn(reward_fn)
+    return loss
+
+
+def test_trajectory_svg(trajectory_loss, repr_rewards, batch, actor):
+    lengths = [100, 64, 92]
+    eps_id = torch.cat([torch.full((n,), i) for i, n in enumerate(lengths)])
+    batch[SampleBatch.EPS_ID] = eps_id
+    batch[SampleBatch.DONES] = torch.zeros_like(batch[SampleBatch.DONES])
+    episodes, mask = time_major_episodes(batch, trajectory_loss.batch_keys[:-1])
+    episodes[trajectory_loss.MASK] = mask
+
+    loss, info = trajectory_loss(episodes)
+    assert loss.shape == ()
+    assert info["loss(actor)"] == loss.item()
+
+    expected = 0
+    for idx in range(len(lengths)):
+        episode = {k: batch[k][eps_id == idx] for k in trajectory_loss.batch_keys[:-1]}
+        _, _, rewards = repr_rewards(
+            episode[SampleBatch.ACTIONS],
+            episode[SampleBatch.NEXT_OBS],
+            episode[SampleBatch.CUR_OBS][0],
+        )
+        expected += rewards.sum() / len(lengths)
+    assert torch.allclose(loss, -expected, atol=1e-4)
+
+    loss.backward()
+    assert all(p.grad is not None for p in actor.parameters())
@@ -101,6 +101,14 @@ def test_set_termination_from_config(policy, mocker):
     assert done.shape == obs.shape[:-1]
 
 
+@pytest.mark.parametrize("fn_type", ("reward", "termination"))
+def test_set_from_config_compile(policy_cls, fn_type):
+    policy = policy_cls({"env": "MockEnv", "env_config": {}, "compile": True})
+    getattr(policy, f"set_{fn_type}_from_config")()
+
+    assert isinstance(getattr(policy, f"{fn_type}_fn"), torch.jit.ScriptModule)
+
+
 def test_set_reward_from_callable(policy, reward_fn, mocker):
     hook = mocker.spy(EnvFnMixin, "_set_reward_hook")
     policy.set_reward_from_callable(reward_fn)
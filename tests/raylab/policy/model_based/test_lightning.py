@@ -233,6 +233,17 @@ def test_model(trainer, models):
     assert not set.symmetric_difference(model_params, optim_params)
 
 
+def test_fit_step(trainer: LightningModelTrainer):
+    spec = trainer.spec.training
+    spec.max_epochs, spec.max_steps = 1, 1
+    pl_model = trainer.pl_model
+
+    pl_trainer = spec.build_trainer(check_val=False)
+    pl_trainer.fit(pl_model, datamodule=trainer.datamodule)
+    assert pl_trainer.global_step == 1
+    assert pl_model.loss_precision == "float32"
+
+
 def test_test(trainer: LightningModelTrainer, holdout_ratio):
     spec: TrainingSpec = trainer.spec
     pl_model: LightningModel = trainer.pl_model
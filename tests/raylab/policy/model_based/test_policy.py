@@ -1,6 +1,7 @@
 import itertools
 
 import pytest
+import torch
 from ray.rllib.evaluation.metrics import get_learner_stats
 
 from raylab.options import configure
@@ -58,3 +59,14 @@ def test_update_interval(policy, model_update_interval, samples):
         assert policy._learn_calls == i
         expected += 1 if (i % model_update_interval == 0 or i == 1) else 0
         assert info["model_epochs"] == expected
+
+
+@pytest.mark.parametrize(
+    "precision,error", (("float16", ValueError), ("bfloat16", RuntimeError))
+)
+def test_precision_checked_on_init(policy_cls, config, monkeypatch, precision, error):
+    # pylint:disable=too-many-arguments
+    monkeypatch.delattr(torch, "autocast", raising=False)
+    config["policy"]["precision"] = precision
+    with pytest.raises(error):
+        policy_cls(config=config)
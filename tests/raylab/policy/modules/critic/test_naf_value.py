@@ -27,3 +27,53 @@ def test_forward(q_value, obs, action):
 
     value.sum().backward()
     assert any([p.grad is not None for p in q_value.parameters()])
+
+
+@pytest.fixture
+def ensembles(action_space, policy_cls, obs_space):
+    from raylab.policy.modules.critic import QValueEnsemble
+    from raylab.policy.modules.critic import VValueEnsemble
+    from raylab.policy.modules.critic.naf_value import NAFQValueEnsemble
+    from raylab.policy.modules.critic.naf_value import NAFVValueEnsemble
+
+    q_values = [
+        NAFQValue(
+            action_space, policy_cls(obs_space, action_space, policy_cls.spec_cls())
+        )
+        for _ in range(2)
+    ]
+    v_values = [q.v_value for q in q_values]
+    return (
+        (QValueEnsemble(q_values), NAFQValueEnsemble(q_values)),
+        (VValueEnsemble(v_values), NAFVValueEnsemble(v_values)),
+    )
+
+
+def test_fused_ensembles(ensembles, obs, action, torch_script):
+    (q_values, fused_q_values), (v_values, fused_v_values) = ensembles
+    if torch_script:
+        fused_q_values = torch.jit.script(fused_q_values)
+        fused_v_values = torch.jit.script(fused_v_values)
+
+    for value, fused in zip(q_values(obs, action), fused_q_values(obs, action)):
+        assert fused.shape == (len(obs),)
+        assert torch.allclose(value, fused, atol=1e-5)
+    for value, fused in zip(v_values(obs), fused_v_values(obs)):
+        assert fused.shape == (len(obs),)
+        assert torch.allclose(value, fused, atol=1e-5)
+
+    sum(fused_q_values(obs, action)).sum().backward()
+    assert all(p.grad is not None for p in q_values[0]._value_linear.parameters())
+
+
+def test_fused_ensemble_features(ensembles, obs, action):
+    (q_values, fused_q_values), _ = ensembles
+    actions = torch.stack([action, torch.randn_like(action)])
+
+    values = fused_q_values.forward_with_features(
+        fused_q_values.encode_obs(obs), actions
+    )
+    expected = q_values.forward_with_features(q_values.encode_obs(obs), actions)
+    for value, fused in zip(expected, values):
+        assert fused.shape == (2, len(obs))
+        assert torch.allclose(value, fused, atol=1e-5)
@@ -44,3 +44,21 @@ def test_script_backprop(q_value_ensemble, obs, action):
     values = critics(obs, action)
     clipped = QValueEnsemble.clipped(values)
     clipped.mean().backward()
+
+
+@pytest.mark.parametrize("torch_script", (False, True), ids=("Eager", "Script"))
+def test_forward_with_features(q_value_ensemble, obs, action, torch_script):
+    critics = torch.jit.script(q_value_ensemble) if torch_script else q_value_ensemble
+    features = critics.encode_obs(obs)
+    assert len(features) == len(critics)
+
+    values = critics.forward_with_features(features, action)
+    for value, expected in zip(values, critics(obs, action)):
+        assert torch.allclose(value, expected)
+
+    # Many actions per observation reuse the same features
+    actions = torch.stack([action, action.flip(0), torch.zeros_like(action)])
+    values = critics.forward_with_features(features, actions)
+    for value, expected in zip(values, critics(obs.expand(3, -1, -1), actions)):
+        assert value.shape == (3, len(obs))
+        assert torch.allclose(value, expected, atol=1e-6)
@@ -2,12 +2,11 @@ import pytest
 import torch
 
 
-@pytest.fixture(scope="module", params=(True, False), ids=lambda x: f"Forked({x})")
+@pytest.fixture(scope="module", params="SME ForkedSME VectorizedSME".split())
 def module_cls(request):
-    from raylab.policy.modules.model.stochastic.ensemble import SME
-    from raylab.policy.modules.model.stochastic.ensemble import ForkedSME
+    from raylab.policy.modules.model.stochastic import ensemble
 
-    return ForkedSME if request.param else SME
+    return getattr(ensemble, request.param)
 
 
 @pytest.fixture(params=(1, 4), ids=lambda x: f"Ensemble({x})")
@@ -131,3 +130,24 @@ def test_deterministic(module, obs, act, rew, expand_foreach_model):
     assert obs1[0].grad_fn is not None
     obs1[0].sum().backward()
     assert any([p.grad is not None for p in module[0].parameters()])
+
+
+def test_vectorized(build_single, ensemble_size, obs, act, next_obs):
+    from raylab.policy.modules.model.stochastic.ensemble import SME
+    from raylab.policy.modules.model.stochastic.ensemble import VectorizedSME
+
+    models = [build_single() for _ in range(ensemble_size)]
+    module, vectorized = SME(models), VectorizedSME(models)
+    assert module.state_dict().keys() == vectorized.state_dict().keys()
+
+    obs, act, next_obs = ([t] * ensemble_size for t in (obs, act, next_obs))
+    params, vec_params = module(obs, act), vectorized(obs, act)
+    for par, vec_par in zip(params, vec_params):
+        assert par.keys() == vec_par.keys()
+        assert all(torch.allclose(par[k], vec_par[k], atol=1e-6) for k in par)
+
+    logp = module.log_prob(next_obs, params)
+    vec_logp = vectorized.log_prob(next_obs, vec_params)
+    assert all(
+        torch.allclose(lgp, vec_lgp, atol=1e-5) for lgp, vec_lgp in zip(logp, vec_logp)
+    )
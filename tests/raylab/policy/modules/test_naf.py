@@ -15,9 +15,14 @@ def double_q(request):
     return request.param
 
 
+@pytest.fixture(params=(True, False), ids=lambda x: f"FusedHeads({x})")
+def fused_heads(request):
+    return request.param
+
+
 @pytest.fixture
-def spec(spec_cls, double_q):
-    return spec_cls(double_q=double_q)
+def spec(spec_cls, double_q, fused_heads):
+    return spec_cls(double_q=double_q, fused_heads=fused_heads)
 
 
 @pytest.fixture
@@ -0,0 +1,45 @@
+import pytest
+import torch
+import torch.nn as nn
+
+from raylab.policy.action_dist import BaseActionDist
+
+
+@pytest.fixture
+def dist_cls():
+    class ActionDist(BaseActionDist):
+        # pylint:disable=abstract-method,missing-function-docstring
+        def sample(self):
+            return self.model.noisy(self.inputs["obs"]), None
+
+        def deterministic_sample(self):
+            return self.model.mean(self.inputs["obs"]), None
+
+        @classmethod
+        def _check_model_compat(cls, *args, **kwargs):
+            pass
+
+    return ActionDist
+
+
+@pytest.fixture
+def model():
+    class Module(nn.Module):
+        # pylint:disable=missing-class-docstring,missing-function-docstring
+        # pylint:disable=abstract-method,no-self-use
+        def mean(self, obs):
+            return obs.sum(dim=-1, keepdim=True)
+
+        def noisy(self, obs):
+            return self.mean(obs) + 1
+
+    return Module()
+
+
+@pytest.mark.parametrize("explore", (True, False), ids=lambda b: f"Explore:{b}")
+def test_default_fast_action(dist_cls, model, explore):
+    obs = torch.randn(1, 3)
+
+    action = dist_cls.fast_action(model, obs, explore)
+    expected = model.noisy(obs) if explore else model.mean(obs)
+    assert torch.allclose(action, expected)
@@ -0,0 +1,50 @@
+import pytest
+import torch
+
+from raylab.policy.export import ExportedPolicy
+
+
+@pytest.fixture(params=(True, False), ids=lambda x: f"Stochastic({x})")
+def actor(request, deterministic_policies, stochastic_policy):
+    if request.param:
+        return stochastic_policy
+    return deterministic_policies[0]
+
+
+@pytest.fixture
+def expected_fn(actor):
+    def func(obs):
+        if hasattr(actor, "deterministic"):
+            return actor.deterministic(obs)[0]
+        return actor(obs)
+
+    return func
+
+
+def test_exported_policy(actor, expected_fn, obs, tmp_path):
+    exported = torch.jit.script(ExportedPolicy(actor))
+    path = str(tmp_path / "policy.pt")
+    torch.jit.save(exported, path)
+    loaded = torch.jit.load(path)
+
+    assert torch.allclose(loaded(obs), expected_fn(obs))
+
+
+def test_standardize(actor, expected_fn, obs):
+    mean, std = obs.mean(dim=0), obs.std(dim=0)
+    exported = torch.jit.script(ExportedPolicy(actor, obs_mean=mean, obs_std=std))
+
+    expected = expected_fn((obs - mean) / (std + 1e-7))
+    assert torch.allclose(exported(obs), expected)
+
+
+def test_time_aware(actor, expected_fn, obs):
+    exported = torch.jit.script(ExportedPolicy(actor, max_episode_steps=200))
+    timestep = torch.randint(200, size=obs.shape[:1])
+
+    raw_obs = obs[..., :-1]
+    expected = expected_fn(torch.cat([raw_obs, (timestep / 200.0)[..., None]], -1))
+    assert torch.allclose(exported(raw_obs, timestep), expected)
+
+    with pytest.raises(Exception):
+        exported(raw_obs)
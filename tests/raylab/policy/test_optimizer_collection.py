@@ -40,3 +40,33 @@ def test_setitem(collection, optimizer):
     assert "param" not in collection
     assert not collection
     assert not list(collection)
+
+
+@pytest.mark.parametrize("precision", ("float64", "float16"))
+def test_invalid_precision(precision):
+    with pytest.raises(ValueError):
+        OptimizerCollection(precision=precision)
+
+
+@pytest.mark.skipif(not hasattr(torch, "autocast"), reason="Requires torch.autocast")
+def test_mixed_precision_optimize():
+    module = nn.Linear(4, 2)
+    collection = OptimizerCollection(precision="bfloat16")
+    collection["module"] = Adam(module.parameters())
+
+    with collection.optimize("module"):
+        out = module(torch.randn(8, 4))
+        assert out.dtype == torch.bfloat16
+        out.float().sum().backward()
+
+    assert all(p.dtype == torch.float32 for p in module.parameters())
+    assert all(p.grad.dtype == torch.float32 for p in module.parameters())
+
+
+@pytest.mark.skipif(not hasattr(torch, "autocast"), reason="Requires torch.autocast")
+def test_mixed_precision_rejects_half_params():
+    module = nn.Linear(4, 2).to(torch.bfloat16)
+    collection = OptimizerCollection(precision="bfloat16")
+
+    with pytest.raises(ValueError):
+        collection["module"] = Adam(module.parameters())
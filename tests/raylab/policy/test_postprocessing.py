@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+from ray.rllib import SampleBatch
+from ray.rllib.evaluation.postprocessing import Postprocessing
+
+from raylab.policy.postprocessing import compute_advantages
+from raylab.policy.postprocessing import discount_cumsum
+from raylab.policy.postprocessing import episode_ends
+from raylab.policy.postprocessing import time_major_episodes
+
+GAMMA = 0.99
+LAMBDA = 0.95
+
+
+@pytest.fixture
+def critic():
+    return nn.Linear(3, 1)
+
+
+@pytest.fixture
+def batch():
+    # Episodes: 0 (truncated), 1 (terminal), 2 (terminal), 3 (truncated)
+    lengths = [5, 3, 1, 4]
+    eps_id = np.concatenate([np.full(n, i) for i, n in enumerate(lengths)])
+    dones = np.zeros_like(eps_id, dtype=np.bool_)
+    dones[np.cumsum(lengths)[[1, 2]] - 1] = True
+    size = len(eps_id)
+    return {
+        SampleBatch.CUR_OBS: torch.randn(size, 3),
+        SampleBatch.NEXT_OBS: torch.randn(size, 3),
+        SampleBatch.REWARDS: torch.randn(size),
+        SampleBatch.DONES: torch.as_tensor(dones),
+        SampleBatch.EPS_ID: torch.as_tensor(eps_id),
+    }
+
+
+def test_discount_cumsum():
+    values, discounts = torch.randn(37, 2), torch.rand(37, 2)
+    expected, acc = torch.empty_like(values), torch.zeros(2)
+    for idx in reversed(range(len(values))):
+        acc = values[idx] + discounts[idx] * acc
+        expected[idx] = acc
+
+    assert torch.allclose(discount_cumsum(values, discounts), expected, atol=1e-6)
+
+
+def test_episode_ends(batch):
+    ends = episode_ends(batch)
+    assert ends.nonzero().flatten().tolist() == [4, 7, 8, 12]
+
+    del batch[SampleBatch.EPS_ID]
+    ends = episode_ends(batch)
+    assert ends.nonzero().flatten().tolist() == [7, 8, 12]
+
+
+def reference_advantages(batch, critic, lambda_):
+    # Per-trajectory computation, as in RLlib's `compute_advantages`
+    advantages = []
+    for eps_id in batch[SampleBatch.EPS_ID].unique():
+        mask = batch[SampleBatch.EPS_ID] == eps_id
+        obs, next_obs, rewards, dones = (
+            batch[k][mask]
+            for k in (
+                SampleBatch.CUR_OBS,
+                SampleBatch.NEXT_OBS,
+                SampleBatch.REWARDS,
+                SampleBatch.DONES,
+            )
+        )
+        last_r = 0.0 if dones[-1] else critic(next_obs[-1]).item()
+        vpred = torch.cat([critic(obs).squeeze(-1), torch.tensor([last_r])])
+        deltas = rewards + GAMMA * vpred[1:] - vpred[:-1]
+        advs, acc = [], 0.0
+        for delta in reversed(deltas.tolist()):
+            acc = delta + GAMMA * lambda_ * acc
+            advs.append(acc)
+        advantages.extend(reversed(advs))
+    return torch.tensor(advantages)
+
+
+@pytest.mark.parametrize("use_gae", (True, False))
+def test_compute_advantages(batch, critic, use_gae):
+    batch = compute_advantages(batch, critic, GAMMA, LAMBDA, use_gae=use_gae)
+
+    values = critic(batch[SampleBatch.CUR_OBS]).squeeze(-1).detach()
+    expected = reference_advantages(batch, critic, LAMBDA if use_gae else 1.0)
+    advantages = batch[Postprocessing.ADVANTAGES]
+    assert torch.allclose(batch[SampleBatch.VF_PREDS], values)
+    assert torch.allclose(advantages, expected, atol=1e-5)
+    assert torch.allclose(batch[Postprocessing.VALUE_TARGETS], advantages + values)
+    assert not any(
+        batch[k].requires_grad
+        for k in (Postprocessing.ADVANTAGES, Postprocessing.VALUE_TARGETS)
+    )
+
+
+def test_time_major_episodes(batch):
+    keys = (SampleBatch.CUR_OBS, SampleBatch.REWARDS)
+    episodes, mask = time_major_episodes(batch, keys)
+
+    assert mask.shape == (5, 4)
+    assert mask.sum(dim=0).tolist() == [5, 3, 1, 4]
+    for key in keys:
+        stacked = episodes[key]
+        assert stacked.shape == (5, 4) + batch[key].shape[1:]
+        # Valid timesteps in batch order
+        assert torch.equal(stacked.transpose(0, 1)[mask.T], batch[key])
+        # Padding repeats the last timestep
+        assert torch.equal(stacked[-1], batch[key][[4, 7, 8, 12]])
@@ -0,0 +1,69 @@
+import subprocess
+import sys
+
+import pytest
+
+AGENT_PACKAGES = "acktr mage mbpo naf sac sop svg td3 trpo".split()
+EAGER_MODULES = tuple(f"raylab.agents.{p}" for p in AGENT_PACKAGES) + (
+    "raylab.envs.vector",
+    "gym_cartpole_swingup",
+    "gym_industrial",
+    "pybullet_envs",
+)
+
+
+def import_times(statement):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+
+@pytest.mark.parametrize(
+    "statement",
+    (
+        "import raylab.cli",
+        "from raylab.envs.registry import ENVS",
+        "from raylab.agents.registry import AGENTS",
+    ),
+)
+def test_no_eager_imports(statement):
+    times = import_times(statement)
+
+    eager = [m for m in times if m.startswith(EAGER_MODULES)]
+    assert not eager
+
+
+def test_cli_import_skips_torch():
+    times = import_times("import raylab.cli")
+    assert "torch" not in times
+
+
+def test_env_lookup():
+    from raylab.envs.registry import ENVS
+
+    assert "Pendulum-v0" in ENVS
+    assert "Navigation" in ENVS
+    assert "NonexistentEnv-v0" not in ENVS
+    assert "Pendulum-v0" not in ENVS.custom_ids()
+
+    env = ENVS["Pendulum-v0"]({"max_episode_steps": 10, "time_aware": True})
+    assert env.observation_space.shape == (4,)
+
+
+def test_agent_lookup():
+    times = import_times(
+        "from raylab.agents.registry import get_agent_cls; get_agent_cls('NAF')"
+    )
+    assert "raylab.agents.naf" in times
+    assert "raylab.agents.sac" not in times
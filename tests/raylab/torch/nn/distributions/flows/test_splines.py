@@ -0,0 +1,59 @@
+import pytest
+import torch
+
+from raylab.torch.nn.distributions.flows.splines import searchsorted
+from raylab.torch.nn.distributions.flows.splines import (
+    unconstrained_rational_quadratic_spline,
+)
+
+TAIL_BOUND = 2.0
+NUM_BINS = 5
+
+
+@pytest.fixture
+def spline_params():
+    # Seed both the parameters and the inputs sampled after them in tests
+    torch.manual_seed(0)
+    shape = (64, 3)
+    return (
+        torch.randn(*shape, NUM_BINS, requires_grad=True),
+        torch.randn(*shape, NUM_BINS, requires_grad=True),
+        torch.randn(*shape, NUM_BINS - 1, requires_grad=True),
+    )
+
+
+@pytest.fixture(params=(False, True), ids=("Eager", "Script"))
+def spline_fn(request):
+    func = unconstrained_rational_quadratic_spline
+    return torch.jit.script(func) if request.param else func
+
+
+def test_searchsorted():
+    bin_locations = torch.tensor([[-1.0, 0.0, 0.5, 1.0]]).expand(7, -1)
+    inputs = torch.tensor([-2.0, -1.0, -0.5, 0.0, 0.7, 1.0, 3.0])
+
+    bin_idx = searchsorted(bin_locations, inputs)
+    assert bin_idx.squeeze(-1).tolist() == [0, 0, 0, 1, 2, 2, 2]
+
+
+def test_spline(spline_fn, spline_params):
+    inputs = torch.randn(64, 3) * TAIL_BOUND
+    inputs.requires_grad_()
+    outside = inputs.abs() > TAIL_BOUND
+    assert outside.any()
+
+    outputs, logabsdet = spline_fn(inputs, *spline_params, False, TAIL_BOUND)
+    assert torch.equal(outputs[outside], inputs[outside])
+    assert torch.equal(logabsdet[outside], torch.zeros_like(logabsdet[outside]))
+
+    # Elementwise transform, so the log-derivative is the log-determinant
+    (grad,) = torch.autograd.grad(outputs.sum(), inputs, retain_graph=True)
+    assert torch.allclose(grad.log(), logabsdet, atol=1e-5)
+
+    (outputs.sum() + logabsdet.sum()).backward()
+    assert all(torch.isfinite(p.grad).all() for p in spline_params)
+
+    # Inverting the quadratic loses precision in float32 for steep bins
+    latent, inv_logabsdet = spline_fn(outputs, *spline_params, True, TAIL_BOUND)
+    assert torch.allclose(latent, inputs, atol=1e-3)
+    assert torch.allclose(inv_logabsdet, -logabsdet, atol=1e-3)
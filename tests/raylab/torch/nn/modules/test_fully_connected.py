@@ -136,6 +136,18 @@ def test_state_action_encoder(sae, obs, act):
     assert all([p.grad is not None for p in sae.parameters()])
 
 
+def test_state_action_encoder_features(sae, obs, act):
+    features = sae.encode_obs(obs)
+    assert torch.allclose(sae.forward_with_features(features, act), sae(obs, act))
+
+    # Broadcast features to many actions per observation
+    acts = torch.randn((5,) + act.shape)
+    out = sae.forward_with_features(features, acts)
+    assert out.shape == (5,) + sae(obs, act).shape
+    expected = sae(obs.expand((5,) + obs.shape), acts)
+    assert torch.allclose(out, expected, atol=1e-6)
+
+
 @pytest.fixture
 def script_sae(obs_dim, act_dim, delay_action, layer_norm):
     return torch.jit.script(
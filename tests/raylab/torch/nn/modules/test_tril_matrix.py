@@ -21,3 +21,18 @@ def test_tril_matrix(in_features, matrix_dim, torch_script):
 
     inputs = torch.randn(1, in_features)
     module(inputs)
+
+
+def test_tril_matrix_entries(in_features, matrix_dim):
+    module = TrilMatrix(in_features, matrix_dim)
+    inputs = torch.randn(5, in_features)
+
+    flat = module.linear_module(inputs)
+    tril = module(inputs)
+    assert tril.shape == (5, matrix_dim, matrix_dim)
+    assert torch.equal(tril, tril.tril())
+
+    rows, cols = torch.tril_indices(matrix_dim, matrix_dim)
+    expected = torch.where(rows == cols, flat ** 2, flat)
+    assert torch.equal(tril[:, rows, cols], expected)
+    assert "flat_indices" not in module.state_dict()
@@ -0,0 +1,143 @@
+import pytest
+import torch
+from gym.spaces import Box
+from gym.spaces import Discrete
+
+from raylab.policy.modules.actor.policy.stochastic import MLPContinuousPolicy
+from raylab.policy.modules.actor.policy.stochastic import MLPDiscretePolicy
+from raylab.torch.optim.hessian_free import batched_line_search
+from raylab.torch.optim.hessian_free import fisher_vector_product
+from raylab.torch.optim.hessian_free import hessian_vector_product
+from raylab.torch.optim.hessian_free import line_search
+from raylab.torch.utils import flat_grad
+
+BATCH_SIZE = 16
+
+
+@pytest.fixture
+def obs_space():
+    return Box(-1, 1, shape=(3,))
+
+
+@pytest.fixture(params=(True, False), ids=lambda x: f"InputDependentScale({x})")
+def continuous_policy(request, obs_space):
+    action_space = Box(-1, 1, shape=(2,))
+    spec = MLPContinuousPolicy.spec_cls(units=(8,), activation="Tanh")
+    return MLPContinuousPolicy(obs_space, action_space, spec, request.param)
+
+
+@pytest.fixture
+def discrete_policy(obs_space):
+    spec = MLPDiscretePolicy.spec_cls(units=(8,), activation="Tanh")
+    return MLPDiscretePolicy(obs_space, Discrete(4), spec)
+
+
+@pytest.fixture
+def obs(obs_space):
+    return torch.randn(BATCH_SIZE, *obs_space.shape)
+
+
+def normal_kl(old, new):
+    # KL divergence is invariant to the policy's squashing transform
+    loc0, scale0, loc, scale = old["loc"], old["scale"], new["loc"], new["scale"]
+    kl_ = (scale / scale0).log() + (scale0 ** 2 + (loc0 - loc) ** 2) / (2 * scale ** 2)
+    return (kl_ - 0.5).sum(-1)
+
+
+def categorical_kl(old, new):
+    return (old["logits"].exp() * (old["logits"] - new["logits"])).sum(-1)
+
+
+def check_fisher_vector_product(policy, obs, kl_fn):
+    params = list(policy.parameters())
+    dist_params = policy(obs)
+    metrics = policy.dist.fisher_metric(dist_params)
+    keys = sorted(metrics.keys())
+    fvp = fisher_vector_product(
+        [dist_params[k] for k in keys],
+        [metrics[k].detach() / len(obs) for k in keys],
+        params,
+    )
+
+    # The Fisher matrix is the Hessian of the KL divergence at the old policy
+    old = {k: v.detach() for k, v in policy(obs).items()}
+    mean_kl = kl_fn(old, policy(obs)).mean()
+    assert flat_grad(mean_kl, params).abs().max() < 1e-6
+
+    for _ in range(3):
+        vec = torch.randn(sum(p.numel() for p in params))
+        expected = hessian_vector_product(kl_fn(old, policy(obs)).mean(), params, vec)
+        assert torch.allclose(fvp(vec), expected, atol=1e-5)
+
+
+def test_continuous_fvp(continuous_policy, obs):
+    check_fisher_vector_product(continuous_policy, obs, normal_kl)
+
+
+def test_discrete_fvp(discrete_policy, obs):
+    check_fisher_vector_product(discrete_policy, obs, categorical_kl)
+
+
+def test_unused_params():
+    used, unused = torch.randn(3, requires_grad=True), torch.randn(
+        2, requires_grad=True
+    )
+    out = used * 2
+    fvp = fisher_vector_product([out], [torch.ones(3)], [used, unused])
+
+    vec = torch.randn(5)
+    prod = fvp(vec)
+    assert torch.allclose(prod[:3], 4 * vec[:3])
+    assert torch.allclose(prod[3:], torch.zeros(2))
+
+
+@pytest.mark.parametrize("chunk_size", (None, 1, 4))
+@pytest.mark.parametrize("accept_ratio", (0.1, 0.5, 2.0))
+@pytest.mark.parametrize("atol", (1e-7, 1e3))
+def test_batched_line_search(accept_ratio, atol, chunk_size):
+    target = torch.randn(5)
+
+    def func(x):
+        return (x - target).pow(2).sum(-1)
+
+    x_0 = torch.zeros(5)
+    grad_0 = 2 * (x_0 - target)
+    d_x = 3 * grad_0
+    expected_improvement = grad_0.dot(d_x).item()
+    kwargs = dict(accept_ratio=accept_ratio, atol=atol)
+
+    x_seq, expected_seq, improvement_seq = line_search(
+        lambda x: func(x).item(), x_0, d_x, expected_improvement, **kwargs
+    )
+    x_bat, expected_bat, improvement_bat = batched_line_search(
+        func, x_0, d_x, expected_improvement, chunk_size=chunk_size, **kwargs
+    )
+    assert torch.allclose(x_seq, x_bat)
+    assert expected_seq == pytest.approx(expected_bat)
+    assert improvement_seq == pytest.approx(improvement_bat, abs=1e-5)
+
+
+def test_batched_line_search_scalar():
+    def func(x):
+        return torch.where(x > 0.5, (x - 1) ** 2, torch.full_like(x, float("inf")))
+
+    x_new, _, improvement = batched_line_search(
+        func, torch.zeros([]), -torch.ones([]) * 2, 1.0, y_0=1.0
+    )
+    assert x_new.shape == ()
+    assert x_new > 0.5
+    assert improvement > 0
+
+
+def test_chunked_line_search_early_exit():
+    sizes = []
+
+    def func(x):
+        sizes.append(len(x))
+        return (x - 1).pow(2).sum(-1)
+
+    # The full step lands on the minimum and should be accepted right away
+    x_0, d_x = torch.zeros(3), -torch.ones(3)
+    x_new, _, _ = batched_line_search(func, x_0, d_x, 3.0, y_0=3.0, chunk_size=1)
+    assert torch.allclose(x_new, torch.ones(3))
+    assert sizes == [1]
@@ -1,12 +1,15 @@
+import copy
+
 import pytest
+import torch
 import torch.nn as nn
 
 
-@pytest.fixture(scope="module")
-def optim_cls():
-    from raylab.torch.optim.kfac import KFAC
+@pytest.fixture(scope="module", params=("KFAC", "EKFAC"))
+def optim_cls(request):
+    from raylab.torch.optim import kfac
 
-    return KFAC
+    return getattr(kfac, request.param)
 
 
 @pytest.fixture
@@ -26,3 +29,36 @@ def test_all_linear_registered(optim, module):
     optim_params = set(p for group in optim.param_groups for p in group["params"])
 
     assert not linear_params.symmetric_difference(optim_params)
+
+
+def optimize(optim, module, inputs):
+    with optim.record_stats():
+        module(inputs).logsumexp(dim=-1).mean().backward()
+    optim.zero_grad()
+    module(inputs).pow(2).mean().backward()
+    optim.step()
+
+
+def test_amortized(optim_cls, module):
+    amortized_module = copy.deepcopy(module)
+    optim = optim_cls(module, eps=1e-3)
+    amortized = optim_cls(amortized_module, eps=1e-3, amortize=True)
+    key = optim_cls._processed_key  # pylint:disable=protected-access
+    inputs = torch.randn(32, 4)
+
+    # First processing is synchronous
+    optimize(optim, module, inputs)
+    optimize(amortized, amortized_module, inputs)
+    for par, other in zip(module.parameters(), amortized_module.parameters()):
+        assert torch.allclose(par, other)
+
+    # Later steps precondition with the last published results
+    weights = [g["params"][0] for g in amortized.param_groups[:-1]]
+    previous = [amortized.state[w][key] for w in weights]
+    optimize(optim, module, inputs)
+    optimize(amortized, amortized_module, inputs)
+    amortized.synchronize()
+    for group, weight, prev in zip(optim.param_groups[:-1], weights, previous):
+        processed = amortized.state[weight][key]
+        assert processed is not prev
+        assert torch.allclose(optim.state[group["params"][0]][key], processed)
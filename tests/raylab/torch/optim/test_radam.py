@@ -0,0 +1,47 @@
+import copy
+import inspect
+
+import pytest
+import torch
+import torch.nn as nn
+
+from raylab.torch.optim import build_optimizer
+from raylab.torch.optim.radam import RAdam
+
+
+@pytest.fixture
+def module():
+    return nn.Sequential(nn.Linear(4, 10), nn.ReLU(), nn.Linear(10, 4))
+
+
+@pytest.mark.parametrize("weight_decay", (0, 1e-2))
+@pytest.mark.parametrize("degenerated_to_sgd", (True, False))
+def test_foreach(module, weight_decay, degenerated_to_sgd):
+    if not hasattr(torch, "_foreach_addcdiv_"):
+        pytest.skip("Requires multi-tensor kernels")
+    other = copy.deepcopy(module)
+    kwargs = dict(weight_decay=weight_decay, degenerated_to_sgd=degenerated_to_sgd)
+    optim = RAdam(module.parameters(), foreach=False, **kwargs)
+    foreach = RAdam(other.parameters(), foreach=True, **kwargs)
+
+    inputs = torch.randn(32, 4)
+    for _ in range(10):
+        for mod, opt in ((module, optim), (other, foreach)):
+            opt.zero_grad()
+            mod(inputs).pow(2).mean().backward()
+            opt.step()
+
+    for par, other_par in zip(module.parameters(), other.parameters()):
+        assert torch.allclose(par, other_par, atol=1e-6)
+
+
+def test_build_optimizer_implementation(module):
+    optim = build_optimizer(module, {"type": "RAdam", "foreach": False})
+    assert not optim.foreach
+
+    if "foreach" in inspect.signature(torch.optim.Adam).parameters:
+        optim = build_optimizer(module, {"type": "Adam", "foreach": True})
+        assert optim.defaults["foreach"]
+
+    with pytest.warns(UserWarning, match="foreach"):
+        build_optimizer(module, {"type": "PlainRAdam", "foreach": True})
@@ -0,0 +1,109 @@
+import pytest
+import torch
+import torch.nn as nn
+from torch.nn.utils import parameters_to_vector
+
+from raylab.torch.utils import batched_module_call
+from raylab.torch.utils import check_precision
+from raylab.torch.utils import tree_index
+from raylab.torch.utils import tree_stack
+from raylab.torch.utils import vmap_module_call
+
+
+class Module(nn.Module):
+    # pylint:disable=missing-class-docstring,missing-function-docstring
+    def __init__(self):
+        super().__init__()
+        self.linear = nn.Linear(3, 4)
+        self.scale = nn.Parameter(torch.ones(4))
+        # Submodule registered under another name, as in policy encoders
+        self.encoder = self.linear
+
+    def forward(self, inputs):  # pylint:disable=arguments-differ
+        return self.linear(inputs).tanh() * self.scale
+
+    def norm(self, inputs, other):
+        return (self(inputs) - other).norm(dim=-1)
+
+
+@pytest.fixture(params=(True, False), ids=("Functional", "Sequential"))
+def functional(request, monkeypatch):
+    if not request.param:
+        monkeypatch.delattr(torch, "func", raising=False)
+    elif not hasattr(torch, "func"):
+        pytest.skip("Requires torch.func")
+    return request.param
+
+
+def test_batched_module_call(functional):
+    # pylint:disable=unused-argument
+    module = Module()
+    original = parameters_to_vector(module.parameters()).clone()
+    flat_params = original + torch.randn(5, original.numel())
+    inputs, other = torch.randn(10, 3), torch.randn(10, 4)
+
+    outputs = batched_module_call(module, flat_params, "norm", inputs, other)
+    assert outputs.shape == (5, 10)
+
+    for vector, output in zip(flat_params, outputs):
+        copy = Module()
+        torch.nn.utils.vector_to_parameters(vector, copy.parameters())
+        assert torch.allclose(output, copy.norm(inputs, other), atol=1e-6)
+    assert torch.equal(parameters_to_vector(module.parameters()), original)
+    assert all(isinstance(p, nn.Parameter) for p in module.encoder.parameters())
+
+
+def test_batched_module_call_batched_args(functional):
+    # pylint:disable=unused-argument
+    module = Module()
+    original = parameters_to_vector(module.parameters()).clone()
+    flat_params = original + torch.randn(5, original.numel())
+    inputs = torch.randn(5, 10, 3)
+
+    outputs = batched_module_call(
+        module, flat_params, "forward", inputs, batched_args=True
+    )
+    assert outputs.shape == (5, 10, 4)
+
+    for vector, inp, output in zip(flat_params, inputs, outputs):
+        copy = Module()
+        torch.nn.utils.vector_to_parameters(vector, copy.parameters())
+        assert torch.allclose(output, copy(inp), atol=1e-6)
+    assert torch.equal(parameters_to_vector(module.parameters()), original)
+
+
+def test_vmap_module_call(functional):
+    # pylint:disable=unused-argument
+    modules = nn.ModuleList([Module() for _ in range(3)])
+    inputs, others = torch.randn(10, 3), torch.randn(3, 10, 4)
+
+    outputs = vmap_module_call(modules, "norm", inputs, others, in_dims=(None, 0))
+    assert len(outputs) == 3
+    for module, other, output in zip(modules, others, outputs):
+        assert torch.allclose(output, module.norm(inputs, other), atol=1e-6)
+
+    sum(outputs).sum().backward()
+    assert all(p.grad is not None for p in modules.parameters())
+
+
+def test_tree_stack():
+    trees = [({"a": torch.randn(2)}, [torch.randn(3, 1)]) for _ in range(4)]
+
+    stacked = tree_stack(trees)
+    assert stacked[0]["a"].shape == (4, 2)
+    assert stacked[1][0].shape == (4, 3, 1)
+    for idx, tree in enumerate(trees):
+        item = tree_index(stacked, idx)
+        assert torch.equal(item[0]["a"], tree[0]["a"])
+        assert torch.equal(item[1][0], tree[1][0])
+
+
+def test_check_precision(monkeypatch):
+    check_precision("float32")
+    with pytest.raises(ValueError):
+        check_precision("float16")
+
+    monkeypatch.delattr(torch, "autocast", raising=False)
+    check_precision("float32")
+    with pytest.raises(RuntimeError, match="autocast"):
+        check_precision("bfloat16")
@@ -1,3 +1,4 @@
+import threading
 from functools import partial
 
 import numpy as np
@@ -138,3 +139,27 @@ def test_getitem(numpy_replay: NumpyReplayBuffer, sample_batch: SampleBatch, idx
     for key in SampleBatch.CUR_OBS, SampleBatch.NEXT_OBS:
         expected = (sample_batch[key][idx] - mean) / (std + 1e-7)
         assert np.allclose(batch[key], expected)
+
+
+def test_concurrent_sample(obs_space, action_space):
+    replay = NumpyReplayBuffer(obs_space, action_space, size=100)
+
+    def batch_with_id(idx: int) -> SampleBatch:
+        batch = fake_batch(obs_space, action_space, batch_size=10)
+        batch[SampleBatch.CUR_OBS][:] = idx
+        batch[SampleBatch.REWARDS][:] = idx
+        return batch
+
+    replay.add(batch_with_id(0))
+
+    def add_batches():
+        for idx in range(1, 1000):
+            replay.add(batch_with_id(idx))
+
+    writer = threading.Thread(target=add_batches)
+    writer.start()
+    while writer.is_alive():
+        samples = replay.sample(32)
+        obs = samples[SampleBatch.CUR_OBS].reshape(32, -1)[:, 0]
+        assert np.allclose(obs, samples[SampleBatch.REWARDS])
+    writer.join()
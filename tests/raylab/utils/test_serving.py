@@ -0,0 +1,91 @@
+import threading
+from typing import Optional
+
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+from torch import Tensor
+
+from raylab.utils.serving import BatchedInferenceServer
+from raylab.utils.serving import is_loopback
+from raylab.utils.serving import serve
+
+
+class DoubleObs(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def forward(self, obs: Tensor, timestep: Optional[Tensor] = None) -> Tensor:
+        self.batch_sizes += [obs.size(0)]
+        if timestep is not None:
+            obs = obs + timestep.unsqueeze(-1)
+        return obs * 2
+
+
+@pytest.fixture
+def policy():
+    return DoubleObs()
+
+
+@pytest.fixture(params=(1, 8), ids=lambda x: f"MaxBatchSize({x})")
+def max_batch_size(request):
+    return request.param
+
+
+def test_compute_action(policy, max_batch_size):
+    with BatchedInferenceServer(policy, max_batch_size=max_batch_size) as server:
+        obs = np.random.randn(3).astype(np.float32)
+        assert np.allclose(server.compute_action(obs), obs * 2)
+        assert np.allclose(server.compute_action(obs, timestep=2), (obs + 2) * 2)
+
+
+def test_concurrent_requests(policy, max_batch_size):
+    server = BatchedInferenceServer(
+        policy, max_batch_size=max_batch_size, max_wait_ms=50
+    )
+    obs = np.random.randn(32, 3).astype(np.float32)
+    futures = [server.submit(o) for o in obs]
+    server.start()
+
+    results = [None] * len(obs)
+
+    def wait(idx):
+        results[idx] = futures[idx].result()
+
+    threads = [threading.Thread(target=wait, args=(i,)) for i in range(len(obs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.stop()
+
+    assert np.allclose(np.stack(results), obs * 2)
+    assert max(policy.batch_sizes) == max_batch_size
+    assert sum(policy.batch_sizes) == len(obs)
+
+
+def test_failed_batch(policy):
+    server = BatchedInferenceServer(policy, max_wait_ms=50)
+    futures = [server.submit(np.zeros(3)), server.submit(np.zeros(4))]
+    with server:
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+        assert np.allclose(server.compute_action(np.ones(3)), 2)
+
+
+@pytest.mark.parametrize(
+    "host,expected",
+    (("localhost", True), ("127.0.0.1", True), ("0.0.0.0", False)),
+)
+def test_is_loopback(host, expected):
+    assert is_loopback(host) == expected
+
+
+def test_serve_requires_authkey(policy):
+    with BatchedInferenceServer(policy) as server:
+        with pytest.raises(ValueError, match="authkey"):
+            serve(server, ("0.0.0.0", 6000))